@@ -0,0 +1,102 @@
+# bench_character_matcher.py
+"""
+Benchmark character name matching against the size of the character list.
+
+Matches a fixed set of synthetic filenames against growing name lists, once with the
+Aho-Corasick matcher and once with the old per-name substring loop. The matcher's
+throughput should stay flat as the list grows, while the loop slows down linearly.
+
+Usage:
+    python benchmarks/bench_character_matcher.py [--files 20000]
+"""
+
+import argparse
+import json
+import os
+import random
+import string
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BASE_DIR, "src"))
+
+from character_matcher import CharacterMatcher  # noqa: E402
+
+DATA_FILE = os.path.join(BASE_DIR, "data", "data.json")
+LIST_SIZES = (100, 500, 2000, 10000, 50000)
+
+
+def load_character_names():
+    """Load the real character names shipped in data/data.json."""
+    with open(DATA_FILE, "r", encoding="utf-8") as f:
+        return json.load(f).get("character_names", [])
+
+
+def synthetic_names(count, real_names, rng):
+    """Pad the real name list with random names until it holds `count` entries."""
+    names = list(real_names[:count])
+    while len(names) < count:
+        length = rng.randint(4, 12)
+        names.append("".join(rng.choice(string.ascii_letters) for _ in range(length)))
+    return names
+
+
+def synthetic_filenames(count, real_names, rng):
+    """Build filenames that look like typical downloads, half of them with a character name."""
+    filenames = []
+    for index in range(count):
+        if index % 2:
+            name = rng.choice(real_names)
+            filenames.append(f"{rng.choice(['', 'hd_', 'fanart '])}{name}_{index:05d}.png")
+        else:
+            filenames.append(f"IMG_{rng.randint(0, 99999):05d}_{index}.jpg")
+    return filenames
+
+
+def naive_match(character_names, filename):
+    """The previous matching loop: first name that is a substring of the filename."""
+    for word in character_names:
+        if word.lower() in filename.lower():
+            return word
+    return None
+
+
+def time_call(func, filenames):
+    start = time.perf_counter()
+    for filename in filenames:
+        func(filename)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--files", type=int, default=20000, help="number of filenames to match")
+    parser.add_argument("--naive-limit", type=int, default=10000,
+                        help="largest list size to run the old substring loop on")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    real_names = load_character_names()
+    filenames = synthetic_filenames(args.files, real_names, rng)
+
+    print(f"{'names':>8} {'build ms':>10} {'matcher files/s':>16} {'naive files/s':>14}")
+    for size in LIST_SIZES:
+        names = synthetic_names(size, real_names, rng)
+
+        start = time.perf_counter()
+        matcher = CharacterMatcher(names)
+        build_time = time.perf_counter() - start
+
+        matcher_time = time_call(lambda f: matcher.match(os.path.splitext(f)[0]), filenames)
+        if size <= args.naive_limit:
+            naive_time = time_call(lambda f: naive_match(names, f), filenames)
+            naive_rate = f"{len(filenames) / naive_time:14,.0f}"
+        else:
+            naive_rate = f"{'skipped':>14}"
+
+        print(f"{size:>8} {build_time * 1000:>10.1f} {len(filenames) / matcher_time:>16,.0f} {naive_rate}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+# benchmark.py
+"""
+Benchmarks for the rename engines, undo and the data store.
+
+Generates synthetic folders of image files named after the character names in
+data/data.json, then times each engine renaming the folder and the undo putting it
+back, plus adding and deleting authors and character names:
+
+    python benchmarks/benchmark.py                      # 1k and 10k files
+    python benchmarks/benchmark.py --sizes 1000 100000 1000000 --workdir /mnt/scratch
+    python benchmarks/benchmark.py --save-baseline      # record this machine's baseline
+
+Results are written as JSON. When a baseline exists, the run fails (exit status 1) if
+any benchmark is slower than its baseline by more than --threshold, so the suite can
+guard against regressions in CI. Baselines are per machine; record one on the machine
+that runs the comparison.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import logging
+import argparse
+import platform
+import tempfile
+
+# Set directory paths at the top of the file so they are accessible globally
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(BASE_DIR, "src")
+DATA_FILE = os.path.join(BASE_DIR, "data", "data.json")
+BENCHMARK_DIR = os.path.join(BASE_DIR, "benchmarks")
+RESULTS_FILE = os.path.join(BENCHMARK_DIR, "results.json")
+BASELINE_FILE = os.path.join(BENCHMARK_DIR, "baseline.json")
+
+sys.path.insert(0, SRC_DIR)
+
+from file_operations import rename_images, rename_images_by_folder_name, rename_images_by_character_name  # noqa: E402
+import undo_journal  # noqa: E402
+from undo_journal import undo_operations  # noqa: E402
+from data_storage import load_data, save_data, get_data_store, add_author, delete_author, add_character_name, delete_character_name  # noqa: E402
+
+DEFAULT_SIZES = [1_000, 10_000]
+DEFAULT_THRESHOLD = 0.25  # Allowed slowdown against the baseline, as a fraction
+DATA_STORE_OPERATIONS = 200  # Names added, then deleted, per data store benchmark
+AUTHOR = "Jangunn"
+EXTENSIONS = [".png", ".jpg", ".jpeg", ".webp", ".gif"]
+
+# Shapes of the file names people actually download, from tidy to messy
+NAME_PATTERNS = [
+    "{char} {n}",
+    "{char}_{n:04d}",
+    "{char} and {other} {n}",
+    "{lower}-fanart-{n}",
+    "{char} by {artist} {n}",
+    "IMG_{n:05d}",  # No character name at all
+    "{upper}_{other}_commission_{n}",
+]
+
+
+class Counter:
+    """Progress callback that counts processed files and errors."""
+
+    def __init__(self):
+        self.processed = 0
+        self.errors = 0
+
+    def __call__(self, status, data=None):
+        if status == "update":
+            self.processed += data
+        elif status == "error":
+            self.errors += 1
+
+
+def generate_folder(folder_path, count, character_names, seed=0):
+    """
+    Create `count` empty image files with realistic names in `folder_path`.
+
+    The same seed always produces the same names, so runs are comparable.
+    """
+    rng = random.Random(seed)
+    os.makedirs(folder_path, exist_ok=True)
+    names = set()
+    for n in range(count):
+        char = rng.choice(character_names)
+        name = rng.choice(NAME_PATTERNS).format(
+            char=char, other=rng.choice(character_names), lower=char.lower(), upper=char.upper(),
+            artist=rng.choice(["Athazel", "Taker", "anon"]), n=n
+        )
+        names.add(name + rng.choice(EXTENSIONS))
+    for name in names:
+        open(os.path.join(folder_path, name), 'wb').close()
+    return len(names)
+
+
+def timed(function, *args, **kwargs):
+    """Run a function once and return (seconds, result)."""
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+class UndoStack:
+    """Stands in for the GUI, which engines hand their undo entries to."""
+
+    def __init__(self):
+        self.undo_stack = []
+
+    def add_undo_entry(self, operation_mode, operations):
+        self.undo_stack.append((operation_mode, operations))
+
+
+def bench_engines(folder_path, character_names, repeat, max_workers):
+    """Time each rename engine and its undo on one generated folder."""
+    engines = [
+        ("rename_images", rename_images, (AUTHOR, None)),
+        ("rename_images_by_folder_name", rename_images_by_folder_name, (AUTHOR, None)),
+        ("rename_images_by_character_name", rename_images_by_character_name, (AUTHOR, None, character_names)),
+    ]
+    results = {}
+    for name, engine, args in engines:
+        for _ in range(repeat):
+            app = UndoStack()
+            elapsed, _ = timed(engine, folder_path, *args, app, progress_callback=Counter(), max_workers=max_workers)
+            results[name] = min(results.get(name, elapsed), elapsed)
+            if not app.undo_stack:
+                raise RuntimeError(f"{name} renamed nothing")
+
+            operation_mode, operations = app.undo_stack.pop()
+            elapsed, errors = timed(undo_operations, operation_mode, operations)
+            if errors:
+                raise RuntimeError(f"Undo of {name} failed: {errors[0]}")
+            results[f"{name}/undo"] = min(results.get(f"{name}/undo", elapsed), elapsed)
+    return results
+
+
+def run_step(step, names, data_file):
+    """Apply a data store function to every name, then write the changes out."""
+    for name in names:
+        step(name, data_file)
+    get_data_store(data_file).flush()
+
+
+def bench_data_store(work_dir, repeat):
+    """Time adding and then deleting authors and character names in a copy of the data file."""
+    data_file = os.path.join(work_dir, "data.json")
+    save_data(data_file, load_data(DATA_FILE))
+    names = [f"Benchmark Name {n}" for n in range(DATA_STORE_OPERATIONS)]
+    steps = [
+        ("data_store/add_author", add_author),
+        ("data_store/delete_author", delete_author),
+        ("data_store/add_character_name", add_character_name),
+        ("data_store/delete_character_name", delete_character_name),
+    ]
+    results = {}
+    for _ in range(repeat):
+        for name, step in steps:
+            elapsed, _ = timed(run_step, step, names, data_file)
+            results[name] = min(results.get(name, elapsed), elapsed)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Compare results against a baseline.
+
+    Returns:
+        list: (benchmark, seconds, baseline seconds) for every benchmark slower than allowed.
+    """
+    regressions = []
+    for name, seconds in results.items():
+        reference = baseline.get(name)
+        if reference and seconds > reference * (1 + threshold):
+            regressions.append((name, seconds, reference))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the AutoName rename engines and data store.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="folder sizes to generate")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per benchmark; the best is kept")
+    parser.add_argument("--workers", type=int, default=4, help="concurrent listings and file operations")
+    parser.add_argument("--workdir", help="where to generate the folders (default: a temporary folder)")
+    parser.add_argument("--output", default=RESULTS_FILE, help="file to write the results to")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="baseline to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown against the baseline, e.g. 0.25 for 25%%")
+    parser.add_argument("--save-baseline", action="store_true", help="save the results as the new baseline")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(format='%(asctime)s - %(levelname)s - %(message)s', level=logging.WARNING)
+    character_names = load_data(DATA_FILE).get("character_names") or ["Alice", "Bob"]
+    work_dir = tempfile.mkdtemp(prefix="autoname-bench-", dir=args.workdir)
+    # Keep the engines' journals out of data/journals, where the GUI would offer them for undo
+    undo_journal.JOURNAL_DIR = os.path.join(work_dir, "journals")
+
+    results = {}
+    try:
+        for size in args.sizes:
+            folder_path = os.path.join(work_dir, f"Benchmark {size}")
+            elapsed, count = timed(generate_folder, folder_path, size, character_names)
+            print(f"Generated {count} files in {elapsed:.1f}s", file=sys.stderr)
+            for name, seconds in bench_engines(folder_path, character_names, args.repeat, args.workers).items():
+                results[f"{name}/{size}"] = seconds
+                print(f"{name}/{size}: {seconds:.3f}s", file=sys.stderr)
+            shutil.rmtree(folder_path)
+        for name, seconds in bench_data_store(work_dir, args.repeat).items():
+            results[name] = seconds
+            print(f"{name}: {seconds:.3f}s", file=sys.stderr)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "workers": args.workers,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=4)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=4)
+        print(f"Saved baseline to {args.baseline}", file=sys.stderr)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline to compare against; run with --save-baseline to record one.", file=sys.stderr)
+        return 0
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f).get("results", {})
+    regressions = compare(results, baseline, args.threshold)
+    for name, seconds, reference in regressions:
+        print(f"REGRESSION {name}: {seconds:.3f}s, baseline {reference:.3f}s", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
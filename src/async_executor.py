@@ -0,0 +1,123 @@
+# async_executor.py
+
+import os
+import sys
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+NETWORK_IN_FLIGHT = 16  # Metadata operations kept in flight on a network share
+
+# Filesystem types whose every metadata call is a network round-trip
+NETWORK_FILESYSTEMS = {
+    "cifs", "smb3", "smbfs", "nfs", "nfs4", "afs", "9p", "ceph", "glusterfs",
+    "fuse.sshfs", "fuse.rclone", "fuse.s3fs", "davfs", "fuse.davfs2",
+}
+
+_mounts = None
+
+
+def _network_mounts():
+    """Read the mount table once and return the mount points of network filesystems."""
+    global _mounts
+    if _mounts is None:
+        _mounts = []
+        try:
+            with open("/proc/self/mounts", 'r', encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    fields = line.split()
+                    if len(fields) >= 3 and fields[2] in NETWORK_FILESYSTEMS:
+                        _mounts.append(fields[1].replace("\\040", " "))
+        except OSError:
+            pass  # No /proc (macOS, BSD): only UNC paths are recognized there
+    return _mounts
+
+
+def is_network_path(path):
+    """
+    Check whether a path lives on a network share (SMB, NFS, sshfs, ...).
+
+    Args:
+        path (str): A file or folder path.
+
+    Returns:
+        bool: True for UNC paths, mapped network drives on Windows, and paths under a
+            network mount on Linux.
+    """
+    path = os.path.abspath(path)
+    if sys.platform == "win32":
+        if path.startswith("\\\\"):
+            return True
+        import ctypes
+        DRIVE_REMOTE = 4
+        drive = os.path.splitdrive(path)[0] + "\\"
+        return ctypes.windll.kernel32.GetDriveTypeW(drive) == DRIVE_REMOTE
+    return any(path == mount or path.startswith(mount.rstrip("/") + "/") for mount in _network_mounts())
+
+
+def is_network_plan(planned):
+    """Check once per job whether any folder of a plan is on a network share."""
+    folders = {os.path.dirname(path) for entry in planned for path in entry}
+    return any(is_network_path(folder) for folder in folders)
+
+
+def _dependencies(planned):
+    """
+    Find, for each entry, the earlier entries it has to wait for.
+
+    An entry waits for the last earlier entry that touched either of its paths, so a
+    rename onto a name freed earlier in the plan only runs once that name is free, and
+    entries that share no name run side by side.
+    """
+    last_user = {}
+    dependencies = []
+    for index, (old_file, new_file) in enumerate(planned):
+        waits_for = {last_user[path] for path in (old_file, new_file) if path in last_user}
+        dependencies.append(waits_for)
+        last_user[old_file] = index
+        last_user[new_file] = index
+    return dependencies
+
+
+async def _execute(planned, run_entry, in_flight):
+    import asyncio
+    loop = asyncio.get_running_loop()
+    dependencies = _dependencies(planned)
+    finished = [asyncio.Event() for _ in planned]
+    results = [None] * len(planned)
+    slots = asyncio.Semaphore(in_flight)
+
+    with ThreadPoolExecutor(max_workers=in_flight, thread_name_prefix="net-op") as pool:
+        async def run(index):
+            for earlier in dependencies[index]:
+                await finished[earlier].wait()
+            async with slots:
+                results[index] = await loop.run_in_executor(pool, run_entry, *planned[index])
+            finished[index].set()
+
+        await asyncio.gather(*(run(index) for index in range(len(planned))))
+    return results
+
+
+def execute_pipelined(planned, run_entry, in_flight=NETWORK_IN_FLIGHT):
+    """
+    Run planned file operations with up to `in_flight` of them waiting on the network at once.
+
+    On a network share each `lexists`, `rename` or `link` is a round-trip, so running
+    them one after another leaves the job bound by latency. Here an event loop hands
+    the blocking calls to a thread pool and keeps the pool full, while entries that
+    depend on a name used by an earlier entry still wait for it (see `_dependencies`).
+
+    Args:
+        planned (list): (old_file, new_file) pairs in planned order.
+        run_entry (callable): Performs one entry as run_entry(old_file, new_file) and
+            returns its result; it must not raise.
+        in_flight (int): Maximum number of operations in flight.
+
+    Returns:
+        list: The result of each entry, in planned order.
+    """
+    if not planned:
+        return []
+    import asyncio  # Only network jobs need it; importing it eagerly doubled CLI startup
+    logging.debug(f"Running {len(planned)} operation(s) with {in_flight} in flight")
+    return asyncio.run(_execute(planned, run_entry, max(1, in_flight)))
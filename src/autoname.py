@@ -0,0 +1,252 @@
+# autoname.py
+"""
+Headless command-line entry point for AutoName.
+
+Runs the same engines as the GUI without Tk, so batch jobs can run from cron or CI:
+
+    python src/autoname.py rename --mode character --author Jangunn DIR...
+    python src/autoname.py rename --mode mask --mask "[char] [num]" --dry-run --export-plan plan.jsonl DIR
+    python src/autoname.py apply plan.jsonl
+
+(or `python -m autoname ...` from the src folder). Jobs are journaled like GUI jobs,
+so they show up in the GUI's undo history. Heavy modules are imported only by the
+command that needs them: PIL only for masks with image dimensions, Tk never.
+"""
+
+import os
+import sys
+import logging
+import argparse
+
+# Set directory paths at the top of the file so they are accessible globally
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONFIG_FILE = os.path.join(BASE_DIR, "config", "config.ini")
+
+MODES = ["author", "folder", "character", "mask"]
+OPERATION_MODES = ["Rename", "Copy", "Move", "Hardlink", "Clone"]
+
+
+class CliProgress:
+    """Progress callback that counts processed files and errors; errors reach stderr through logging."""
+
+    def __init__(self, quiet=False):
+        self.quiet = quiet
+        self.errors = 0
+        self.processed = 0
+        self.plan = None
+        self.profile = None
+
+    def __call__(self, status, data=None):
+        if status == "update":
+            self.processed += data
+        elif status == "error":
+            self.errors += 1
+        elif status == "skipped" and not self.quiet:
+            print(data, file=sys.stderr)
+        elif status == "review":
+            print(f"{len(data)} file(s) matched no character name and were left unchanged", file=sys.stderr)
+            if not self.quiet:
+                for folder, filename in data.entries:
+                    suggestions = data.suggestions.get((folder, filename))
+                    if suggestions:
+                        print(f"  {os.path.join(folder, filename)}: maybe {', '.join(suggestions)}", file=sys.stderr)
+        elif status == "plan":
+            self.plan = data
+        elif status == "profile":
+            self.profile = data
+
+
+def read_settings():
+    """Read the GUI's settings from config.ini."""
+    import configparser
+
+    config = configparser.ConfigParser()
+    config.read(CONFIG_FILE)
+    return config['DEFAULT']
+
+
+def last_author():
+    """Read the author last used in the GUI from config.ini."""
+    return read_settings().get('LastAuthor', '').strip()
+
+
+def load_registry(data_file=None):
+    """
+    Return the character names and aliases the GUI uses.
+
+    The registry is opened with the DataBackend configured in config.ini (json or
+    sqlite), as the GUI does; `data_file` overrides it with a specific data file.
+    """
+    if data_file:
+        from data_storage import load_data
+        data = load_data(data_file)
+    else:
+        from data_storage import open_registry
+        data = open_registry(read_settings().get('DataBackend', 'json')).snapshot()
+    return data.get('character_names', []), data.get('aliases', {}).get('character_names', {})
+
+
+def print_plan(plan):
+    """Print a dry-run plan as tab-separated old and new paths."""
+    for old_file, new_file in plan.entries:
+        print(f"{old_file}\t{new_file}")
+
+
+def run_rename(args):
+    """Plan and run a rename job for each folder given on the command line."""
+    from file_operations import rename_images, rename_images_by_folder_name, rename_images_by_character_name, rename_images_by_mask
+
+    author_name = args.author if args.author is not None else last_author()
+    if args.mode in ["author", "folder"] and not author_name:
+        print("error: --author is required for this mode", file=sys.stderr)
+        return 2
+    if args.mode == "mask":
+        from rename_mask import compile_mask, MaskError
+        if not args.mask:
+            print("error: --mask is required for mask mode", file=sys.stderr)
+            return 2
+        try:
+            compile_mask(args.mask)
+        except MaskError as e:
+            print(f"error: {e}", file=sys.stderr)
+            return 2
+    if args.operation != "Rename" and not args.destination:
+        print(f"error: --destination is required for {args.operation}", file=sys.stderr)
+        return 2
+    if args.export_plan and len(args.folders) > 1:
+        print("error: --export-plan takes a single folder", file=sys.stderr)
+        return 2
+
+    character_names = []
+    character_aliases = {}
+    if args.mode in ["character", "mask"]:
+        character_names, character_aliases = load_registry(args.data)
+
+    status = 0
+    for folder_path in args.folders:
+        if not os.path.isdir(folder_path):
+            print(f"error: '{folder_path}' is not a folder", file=sys.stderr)
+            status = 1
+            continue
+
+        folder_path = os.path.abspath(folder_path)
+        progress = CliProgress(args.quiet)
+        options = dict(
+            operation_mode=args.operation,
+            destination_folder=os.path.abspath(args.destination) if args.destination else None,
+            progress_callback=progress,
+            max_workers=args.workers,
+            recursive=args.recursive,
+            streaming=args.streaming,
+            dry_run=args.dry_run or bool(args.export_plan),
+        )
+        if args.mode == "author":
+            rename_images(folder_path, author_name, None, None, **options)
+        elif args.mode == "folder":
+            rename_images_by_folder_name(folder_path, author_name, None, None, **options)
+        elif args.mode == "character":
+            rename_images_by_character_name(folder_path, author_name, None, character_names, None,
+                                            character_aliases=character_aliases, **options)
+        else:
+            rename_images_by_mask(folder_path, args.mask, author_name, None, character_names, None,
+                                  character_aliases=character_aliases, **options)
+
+        if progress.plan is not None:
+            if args.export_plan:
+                from rename_plan import save_plan
+                save_plan(progress.plan, args.export_plan)
+                if not args.quiet:
+                    print(f"{folder_path}: exported a plan of {len(progress.plan)} file(s) to {args.export_plan}")
+            else:
+                print_plan(progress.plan)
+        elif not args.quiet:
+            print(f"{folder_path}: {progress.processed} file(s) processed, {progress.errors} error(s)")
+        if progress.profile and args.timings:
+            print(f"{folder_path}: {progress.profile}", file=sys.stderr)
+        if progress.errors:
+            status = 1
+    return status
+
+
+def run_apply(args):
+    """Apply an exported plan file without planning again."""
+    from rename_plan import load_plan, apply_plan, StalePlanError
+
+    try:
+        plan = load_plan(args.plan, args.folder, args.destination)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"error: could not load '{args.plan}': {e}", file=sys.stderr)
+        return 2
+
+    progress = CliProgress(args.quiet)
+    try:
+        apply_plan(plan, progress, args.workers)
+    except StalePlanError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    if not args.quiet:
+        print(f"{plan.folder_path}: {progress.processed} file(s) processed, {progress.errors} error(s)")
+    if progress.profile and args.timings:
+        print(f"{plan.folder_path}: {progress.profile}", file=sys.stderr)
+    return 1 if progress.errors else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="autoname", description="Rename image files in bulk without the GUI.")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log every file operation to stderr")
+    parser.add_argument("-q", "--quiet", action="store_true", help="only print errors")
+    parser.add_argument("--timings", action="store_true", help="print the time spent in each phase of a job")
+    parser.add_argument("--profile", action="store_true", help="run each job under cProfile; stats go to logs/profiles")
+    parser.add_argument("--trace", action="store_true",
+                        help="save a Chrome trace of each job's threads to logs/profiles (open in Perfetto)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rename = commands.add_parser("rename", help="plan and run a rename job on one or more folders")
+    rename.add_argument("folders", nargs="+", metavar="DIR", help="folders to process")
+    rename.add_argument("--mode", choices=MODES, default="author",
+                        help="author: append 'by AUTHOR'; folder: name files after their folder; "
+                             "character: name files after the character they mention; mask: use --mask")
+    rename.add_argument("--author", help="author name (defaults to the author last used in the GUI)")
+    rename.add_argument("--mask", help="rename mask, e.g. \"[char]{ by [author]} [num]\"")
+    rename.add_argument("--operation", choices=OPERATION_MODES, default="Rename", help="what to do with each file")
+    rename.add_argument("--destination", help="destination folder for Copy, Move, Hardlink and Clone")
+    rename.add_argument("--recursive", action="store_true", help="include subfolders")
+    rename.add_argument("--streaming", action="store_true", help="bounded-memory mode for huge folders")
+    rename.add_argument("--workers", type=int, default=4, help="concurrent listings and file operations")
+    rename.add_argument("--in-flight", type=int, help="operations kept in flight on network shares (default 16)")
+    rename.add_argument("--dry-run", action="store_true", help="print the plan instead of applying it")
+    rename.add_argument("--export-plan", metavar="FILE", help="save the plan to FILE instead of applying it")
+    rename.add_argument("--data", help="data file holding the character names, .json or .db "
+                                       "(defaults to the registry the GUI uses)")
+    rename.set_defaults(func=run_rename)
+
+    apply = commands.add_parser("apply", help="apply a plan file exported with --export-plan")
+    apply.add_argument("plan", help="the plan file")
+    apply.add_argument("--folder", help="apply to this folder instead of the one the plan was made for")
+    apply.add_argument("--destination", help="write into this destination instead of the recorded one")
+    apply.add_argument("--workers", type=int, default=4, help="concurrent file operations")
+    apply.add_argument("--in-flight", type=int, help="operations kept in flight on network shares (default 16)")
+    apply.set_defaults(func=run_apply)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        level=logging.DEBUG if args.verbose else logging.WARNING
+    )
+    if getattr(args, "workers", 1) < 1:
+        args.workers = 1
+    if args.profile or args.trace:
+        import job_profile
+        job_profile.PROFILE_JOBS = args.profile
+        job_profile.TRACE_JOBS = args.trace
+    if getattr(args, "in_flight", None):
+        import async_executor
+        async_executor.NETWORK_IN_FLIGHT = max(1, args.in_flight)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
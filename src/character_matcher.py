@@ -0,0 +1,175 @@
+# character_matcher.py
+
+import threading
+import unicodedata
+from name_keys import build_entries, fold_text
+
+
+def _is_boundary(text, left, right):
+    """
+    Check whether the position between text[left] and text[right] separates two tokens.
+
+    A boundary is the start or end of the text, any non-alphanumeric character,
+    a letter/digit transition ("Tifa01") or a lower-to-upper case transition ("TifaLockhart").
+    """
+    if left < 0 or right >= len(text):
+        return True
+    a, b = text[left], text[right]
+    if not a.isalnum() or not b.isalnum():
+        return True
+    if a.isdigit() != b.isdigit():
+        return True
+    return a.islower() and b.isupper()
+
+
+class CharacterMatcher:
+    """
+    Aho-Corasick automaton over a list of character names and their aliases.
+
+    The automaton is built once for a name list and finds every name contained in a
+    filename in a single pass over the filename, independent of how many names there are.
+    Names and filenames are compared by their folded form (see name_keys.fold_text), so
+    case, NFD accents and fullwidth letters do not matter, and an alias matches as the
+    name it belongs to.
+    """
+
+    def __init__(self, character_names, aliases=None):
+        """
+        Compile the character names into the automaton.
+
+        Args:
+            character_names (list): Character names; the first spelling of a name wins
+                when several entries only differ by case or normalization.
+            aliases (dict): Alias -> character name.
+        """
+        self.names = []        # Pattern id -> canonical character name
+        self._lengths = []     # Pattern id -> length of the folded pattern
+        self._goto = [{}]      # Node -> {char: node}
+        self._fail = [0]       # Node -> failure link
+        self._output = [[]]    # Node -> pattern ids ending at this node (including via failure links)
+
+        self.entries = build_entries(character_names, aliases)
+        seen = set()
+        for entry in self.entries:
+            for key in entry.keys:
+                if key not in seen:
+                    seen.add(key)
+                    self._add_pattern(key, entry.name)
+        self._build_failure_links()
+
+    def __len__(self):
+        return len(self.names)
+
+    def _add_pattern(self, key, name):
+        node = 0
+        for char in key:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = next_node
+        self._output[node].append(len(self.names))
+        self.names.append(name)
+        self._lengths.append(len(key))
+
+    def _build_failure_links(self):
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._output[child].extend(self._output[self._fail[child]])
+
+    def find_all(self, text):
+        """
+        Find every character name occurring in the text.
+
+        Args:
+            text (str): Text to scan, usually a filename without its extension.
+
+        Returns:
+            list: (start, end, pattern id) tuples for each occurrence in the folded
+                text, in scan order.
+        """
+        return self._scan(fold_text(text))
+
+    def _scan(self, folded):
+        goto, fail, output, lengths = self._goto, self._fail, self._output, self._lengths
+        matches = []
+        node = 0
+        for position, char in enumerate(folded):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for pattern_id in output[node]:
+                matches.append((position + 1 - lengths[pattern_id], position + 1, pattern_id))
+        return matches
+
+    def match(self, filename):
+        """
+        Find the character name that best matches a filename.
+
+        Prefers the longest name that sits on token boundaries, so "Anna_01" picks "Anna"
+        over "Ann" and "Canada" does not pick "Ada" when a whole-token name is present.
+        If no name sits on token boundaries, the longest plain substring match is used.
+
+        Args:
+            filename (str): The filename (or stem) to match.
+
+        Returns:
+            str: The matched character name, or None if no name occurs in the filename.
+        """
+        folded = fold_text(filename)  # Once per filename, not once per name
+        # Boundary checks look at case, which is only reliable if folding kept the length
+        if filename.isascii():
+            text = filename
+        else:
+            text = unicodedata.normalize("NFKC", filename)
+            if len(text) != len(folded):
+                text = folded
+        best = None
+        best_bounded = None
+        for start, end, pattern_id in self._scan(folded):
+            candidate = (end - start, -start, pattern_id)
+            if best is None or candidate[:2] > best[:2]:
+                best = candidate
+            if _is_boundary(text, start - 1, start) and _is_boundary(text, end - 1, end):
+                if best_bounded is None or candidate[:2] > best_bounded[:2]:
+                    best_bounded = candidate
+        chosen = best_bounded or best
+        return self.names[chosen[2]] if chosen else None
+
+
+_matcher_lock = threading.Lock()
+_cached_key = None
+_cached_matcher = None
+
+
+def get_character_matcher(character_names, aliases=None):
+    """
+    Return a compiled matcher for the character names, rebuilding it only when the list changes.
+
+    Args:
+        character_names (list): The current character names.
+        aliases (dict): Alias -> character name.
+
+    Returns:
+        CharacterMatcher: The cached matcher for this list.
+    """
+    global _cached_key, _cached_matcher
+    key = (tuple(character_names), tuple(sorted((aliases or {}).items())))
+    with _matcher_lock:
+        if _cached_matcher is None or key != _cached_key:
+            _cached_matcher = CharacterMatcher(key[0], dict(key[1]))
+            _cached_key = key
+        return _cached_matcher
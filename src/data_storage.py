@@ -1,6 +1,11 @@
 import os
 import json
+import time
+import atexit
 import logging
+import threading
+from sqlite_store import SqliteDataStore, is_sqlite_file
+from name_keys import match_key
 
 # Set directory paths at the top of the file so they are accessible globally
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -16,23 +21,34 @@ os.makedirs(LOGS_DIR, exist_ok=True)
 # File paths
 CONFIG_FILE = os.path.join(CONFIG_DIR, "config.ini")
 DATA_FILE = os.path.join(DATA_DIR, "data.json")
+SQLITE_FILE = os.path.join(DATA_DIR, "data.db")
 LOG_FILE = os.path.join(LOGS_DIR, "app.log")
 
-def load_data(filename=DATA_FILE):
-    """
-    Load data from a JSON file.
+FLUSH_DELAY = 1.0  # Quiet seconds after the last change before changes are written together
+MAX_FLUSH_DELAY = 5.0  # Longest a change may wait while changes keep coming
 
-    Args:
-        filename (str): Path to the JSON file.
+_EMPTY_DATA = {"authors": [], "character_names": []}
 
-    Returns:
-        dict: A dictionary containing the data.
+
+def _write_atomically(filename, data):
     """
+    Write the data to a temporary file and rename it over the data file.
+
+    Readers and crashes see either the old file or the new one, never a half-written one.
+    """
+    temp_file = f"{filename}.tmp"
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=4)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_file, filename)
+
+
+def _read_data(filename):
     if not os.path.exists(filename):
         # Create an empty JSON file if it doesn't exist
         logging.info(f"{filename} does not exist. Creating a new file.")
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump({"authors": [], "character_names": []}, f, indent=4)
+        _write_atomically(filename, _EMPTY_DATA)
 
     try:
         with open(filename, 'r', encoding='utf-8') as f:
@@ -44,9 +60,261 @@ def load_data(filename=DATA_FILE):
         logging.error(f"Error loading data from {filename}: {e}")
         return {"authors": [], "character_names": []}
 
+
+class DataStore:
+    """
+    The authors and character names of a data file, held in memory.
+
+    The file is read once. Changes are made in memory and written back behind the
+    caller's back, debounced: they are written once no change has been made for
+    `flush_delay` seconds, as one atomic replace of the file, so a burst of edits is
+    one write. A burst that never pauses is still written every `max_flush_delay`
+    seconds. `flush()` writes pending changes at once; they are also written when the
+    program exits.
+    """
+
+    def __init__(self, filename=DATA_FILE, flush_delay=FLUSH_DELAY, max_flush_delay=MAX_FLUSH_DELAY):
+        """
+        Args:
+            filename (str): Path to the JSON data file.
+            flush_delay (float): Seconds without changes to wait before writing them.
+            max_flush_delay (float): Longest a change waits while changes keep coming.
+        """
+        self.filename = filename
+        self.flush_delay = flush_delay
+        self.max_flush_delay = max(flush_delay, max_flush_delay)
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._data = _read_data(filename)
+        self._data.setdefault('authors', [])
+        self._data.setdefault('character_names', [])
+        self._dirty = False
+        self._timer = None
+        self._first_change = None  # When the unwritten changes began
+        self._last_change = None
+        atexit.register(self.flush)
+
+    @property
+    def authors(self):
+        with self._lock:
+            return list(self._data['authors'])
+
+    @property
+    def character_names(self):
+        with self._lock:
+            return list(self._data['character_names'])
+
+    def snapshot(self):
+        """Return a copy of the data, as `load_data` would."""
+        with self._lock:
+            return json.loads(json.dumps(self._data))
+
+    def add(self, key, name):
+        """
+        Add a name to a list ('authors' or 'character_names').
+
+        Returns:
+            bool: True if added, False if it was already there.
+        """
+        with self._lock:
+            names = self._data.setdefault(key, [])
+            if name in names:
+                return False
+            names.append(name)
+            self._changed()
+            return True
+
+    def add_many(self, key, new_names):
+        """Add several names with a single change; returns the names that were new."""
+        with self._lock:
+            names = self._data.setdefault(key, [])
+            added = [name for name in dict.fromkeys(new_names) if name not in names]
+            if added:
+                names.extend(added)
+                self._changed()
+            return added
+
+    def remove(self, key, name):
+        """
+        Remove a name, and its aliases, from a list ('authors' or 'character_names').
+
+        Returns:
+            bool: True if removed, False if it was not there.
+        """
+        with self._lock:
+            names = self._data.get(key, [])
+            if name not in names:
+                return False
+            names.remove(name)
+            aliases = self._data.get('aliases', {}).get(key, {})
+            for alias in [alias for alias, target in aliases.items() if target == name]:
+                del aliases[alias]
+            self._changed()
+            return True
+
+    def aliases(self, key=None):
+        """Return {kind: {alias: name}} for every alias, or {alias: name} for one kind."""
+        with self._lock:
+            aliases = {kind: dict(entries) for kind, entries in self._data.get('aliases', {}).items()}
+        return aliases.get(key, {}) if key else aliases
+
+    def add_alias(self, key, name, alias):
+        """
+        Make `alias` resolve to the existing name `name`.
+
+        Returns:
+            bool: True if added; False if `name` does not exist or the alias is taken.
+        """
+        with self._lock:
+            if name not in self._data.get(key, []):
+                return False
+            aliases = self._data.setdefault('aliases', {}).setdefault(key, {})
+            if match_key(alias) in {match_key(existing) for existing in aliases}:
+                return False
+            aliases[alias] = name
+            self._changed()
+            return True
+
+    def remove_alias(self, key, alias):
+        """Remove an alias; returns True if it existed."""
+        with self._lock:
+            aliases = self._data.get('aliases', {}).get(key, {})
+            folded = match_key(alias)
+            for existing in aliases:
+                if match_key(existing) == folded:
+                    del aliases[existing]
+                    self._changed()
+                    return True
+            return False
+
+    def replace(self, data):
+        """Replace all the data, e.g. with what `save_data` was given."""
+        with self._lock:
+            self._data = json.loads(json.dumps(data))
+            self._changed()
+
+    def _changed(self):
+        self._dirty = True
+        self._last_change = time.monotonic()
+        if self._first_change is None:
+            self._first_change = self._last_change
+        if self._timer is None:
+            self._start_timer(self.flush_delay)
+
+    def _start_timer(self, delay):
+        self._timer = threading.Timer(delay, self._timer_fired)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _timer_fired(self):
+        """Write the changes, or wait again if more came in since the timer started."""
+        with self._lock:
+            if self._timer is not threading.current_thread() or not self._dirty:
+                return  # Flushed meanwhile
+            due = min(self._last_change + self.flush_delay, self._first_change + self.max_flush_delay)
+            remaining = due - time.monotonic()
+            if remaining > 0:
+                self._start_timer(remaining)  # One timer per wait, not one per change
+                return
+        self.flush()
+
+    def flush(self):
+        """Write pending changes now, atomically."""
+        with self._write_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._dirty:
+                    return
+                data = json.loads(json.dumps(self._data))
+                self._dirty = False
+                self._first_change = None
+            try:
+                _write_atomically(self.filename, data)
+                logging.info(f"Data saved to {self.filename}")
+            except Exception as e:
+                logging.error(f"Error saving data to {self.filename}: {e}")
+                with self._lock:
+                    self._dirty = True  # Try again with the next change or at exit
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_data_store(filename=DATA_FILE):
+    """
+    Return the shared store of a data file, opening it the first time.
+
+    Files ending in .db, .sqlite or .sqlite3 get an SqliteDataStore, others a DataStore.
+    """
+    key = os.path.abspath(filename)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            if is_sqlite_file(filename):
+                store = SqliteDataStore(filename)
+            else:
+                store = DataStore(filename)
+            _stores[key] = store
+        return store
+
+
+def open_registry(backend="json", json_file=DATA_FILE, sqlite_file=SQLITE_FILE):
+    """
+    Open the author and character registry with the configured backend.
+
+    The first time the SQLite backend is used, the names in the JSON file are imported
+    into it; the JSON file is left as it was.
+
+    Args:
+        backend (str): "json" or "sqlite".
+        json_file (str): The JSON data file.
+        sqlite_file (str): The SQLite registry.
+
+    Returns:
+        DataStore or SqliteDataStore: The shared store.
+    """
+    if backend.strip().lower() != "sqlite":
+        return get_data_store(json_file)
+    store = get_data_store(sqlite_file)
+    if os.path.exists(json_file):
+        try:
+            store.migrate_from_json(json_file)
+        except (OSError, ValueError) as e:
+            logging.error(f"Could not migrate {json_file} to {sqlite_file}: {e}")
+    return store
+
+
+def _open_store(filename):
+    with _stores_lock:
+        return _stores.get(os.path.abspath(filename))
+
+
+def load_data(filename=DATA_FILE):
+    """
+    Load data from a JSON file.
+
+    If the file has a DataStore, its in-memory state is returned, including changes
+    not written yet.
+
+    Args:
+        filename (str): Path to the JSON file.
+
+    Returns:
+        dict: A dictionary containing the data.
+    """
+    store = _open_store(filename)
+    if store is None and is_sqlite_file(filename):
+        store = get_data_store(filename)
+    if store is not None:
+        return store.snapshot()
+    return _read_data(filename)
+
 def save_data(filename=DATA_FILE, data=None):
     """
-    Save data to a JSON file.
+    Save data to a JSON file, atomically.
 
     Args:
         filename (str): Path to the JSON file.
@@ -55,9 +323,15 @@ def save_data(filename=DATA_FILE, data=None):
     if data is None:
         data = {"authors": [], "character_names": []}
 
+    store = _open_store(filename)
+    if store is None and is_sqlite_file(filename):
+        store = get_data_store(filename)
+    if store is not None:
+        store.replace(data)
+        store.flush()
+        return
     try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4)
+        _write_atomically(filename, data)
         logging.info(f"Data saved to {filename}")
     except Exception as e:
         logging.error(f"Error saving data to {filename}: {e}")
@@ -73,12 +347,7 @@ def add_author(author_name, data_file=DATA_FILE):
     Returns:
         bool: True if added successfully, False otherwise.
     """
-    data = load_data(data_file)
-    if 'authors' not in data:
-        data['authors'] = []
-    if author_name not in data['authors']:
-        data['authors'].append(author_name)
-        save_data(data_file, data)
+    if get_data_store(data_file).add('authors', author_name):
         logging.info(f"Added new author: {author_name}")
         return True
     else:
@@ -96,12 +365,7 @@ def add_character_name(character_name, data_file=DATA_FILE):
     Returns:
         bool: True if added successfully, False otherwise.
     """
-    data = load_data(data_file)
-    if 'character_names' not in data:
-        data['character_names'] = []
-    if character_name not in data['character_names']:
-        data['character_names'].append(character_name)
-        save_data(data_file, data)
+    if get_data_store(data_file).add('character_names', character_name):
         logging.info(f"Added new character name: {character_name}")
         return True
     else:
@@ -119,10 +383,7 @@ def delete_author(author_name, data_file=DATA_FILE):
     Returns:
         bool: True if deleted successfully, False otherwise.
     """
-    data = load_data(data_file)
-    if 'authors' in data and author_name in data['authors']:
-        data['authors'].remove(author_name)
-        save_data(data_file, data)
+    if get_data_store(data_file).remove('authors', author_name):
         logging.info(f"Deleted author: {author_name}")
         return True
     else:
@@ -140,12 +401,46 @@ def delete_character_name(character_name, data_file=DATA_FILE):
     Returns:
         bool: True if deleted successfully, False otherwise.
     """
-    data = load_data(data_file)
-    if 'character_names' in data and character_name in data['character_names']:
-        data['character_names'].remove(character_name)
-        save_data(data_file, data)
+    if get_data_store(data_file).remove('character_names', character_name):
         logging.info(f"Deleted character name: {character_name}")
         return True
     else:
         logging.info(f"Character name '{character_name}' does not exist.")
         return False
+
+def add_character_alias(character_name, alias, data_file=DATA_FILE):
+    """
+    Make an alias match as an existing character name, e.g. "Aeris" for "Aerith".
+
+    Args:
+        character_name (str): The character name the alias belongs to.
+        alias (str): The other spelling.
+        data_file (str): The path to the data file.
+
+    Returns:
+        bool: True if added successfully, False otherwise.
+    """
+    if get_data_store(data_file).add_alias('character_names', character_name, alias):
+        logging.info(f"Added alias '{alias}' for character name: {character_name}")
+        return True
+    else:
+        logging.info(f"Could not add alias '{alias}' for character name '{character_name}'.")
+        return False
+
+def delete_character_alias(alias, data_file=DATA_FILE):
+    """
+    Delete a character name alias.
+
+    Args:
+        alias (str): The alias to delete.
+        data_file (str): The path to the data file.
+
+    Returns:
+        bool: True if deleted successfully, False otherwise.
+    """
+    if get_data_store(data_file).remove_alias('character_names', alias):
+        logging.info(f"Deleted character alias: {alias}")
+        return True
+    else:
+        logging.info(f"Character alias '{alias}' does not exist.")
+        return False
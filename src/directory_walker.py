@@ -0,0 +1,81 @@
+# directory_walker.py
+
+import os
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from streaming import scan_folder_sorted
+
+
+def list_folder(folder_path):
+    """
+    List a folder with a single `os.scandir` pass.
+
+    Args:
+        folder_path (str): The folder to list.
+
+    Returns:
+        tuple: (sorted file names, sorted subfolder paths). Symlinked folders are not followed.
+    """
+    files = []
+    subfolders = []
+    with os.scandir(folder_path) as entries:
+        for entry in entries:
+            try:
+                if entry.is_file():
+                    files.append(entry.name)
+                elif entry.is_dir(follow_symlinks=False):
+                    subfolders.append(entry.path)
+            except OSError:
+                continue
+    return sorted(files), sorted(subfolders)
+
+
+def _list_for_walk(folder_path, streaming):
+    """List a folder as (file count, subfolders, sorted file names or iterator)."""
+    if streaming:
+        return scan_folder_sorted(folder_path)
+    files, subfolders = list_folder(folder_path)
+    return len(files), subfolders, files
+
+
+def walk_folders(folder_path, recursive=False, max_workers=4, exclude=(), streaming=False):
+    """
+    Yield the files of a folder and, when recursive, of all its subfolders.
+
+    Subfolders are listed concurrently on a thread pool and each listing is yielded as
+    soon as it is ready, so work on one folder can start while others are still listed.
+
+    Args:
+        folder_path (str): The folder to start from.
+        recursive (bool): Whether to descend into subfolders.
+        max_workers (int): Maximum number of concurrent listings.
+        exclude (iterable): Folders to skip, e.g. a destination inside the source tree.
+        streaming (bool): List with an external merge sort and yield the file names as an
+            iterator, so huge folders are never held in memory as a whole.
+
+    Yields:
+        tuple: (folder path, file count, sorted file names).
+    """
+    if not recursive:
+        count, _, files = _list_for_walk(folder_path, streaming)
+        yield folder_path, count, files
+        return
+
+    excluded = {os.path.normcase(os.path.abspath(path)) for path in exclude if path}
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="walk") as pool:
+        pending = {pool.submit(_list_for_walk, folder_path, streaming): folder_path}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                folder = pending.pop(future)
+                try:
+                    count, subfolders, files = future.result()
+                except OSError as e:
+                    if folder == folder_path:
+                        raise
+                    logging.error(f"Error accessing {folder}: {e}")
+                    continue
+                for subfolder in subfolders:
+                    if os.path.normcase(os.path.abspath(subfolder)) not in excluded:
+                        pending[pool.submit(_list_for_walk, subfolder, streaming)] = subfolder
+                yield folder, count, files
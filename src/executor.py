@@ -0,0 +1,186 @@
+# executor.py
+
+import os
+import errno
+import shutil
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from move_engine import is_same_device, move_across_devices, execute_cross_device_moves
+import async_executor
+from job_profile import NULL_TIMER
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+PAST_TENSE = {"Rename": "Renamed", "Copy": "Copied", "Move": "Moved", "Hardlink": "Linked", "Clone": "Cloned"}
+
+# Modes that write new files into a destination folder
+DESTINATION_MODES = ["Copy", "Move", "Hardlink", "Clone"]
+
+# Modes that leave the source file untouched; undo only removes the new file
+NON_DESTRUCTIVE_MODES = ["Copy", "Hardlink", "Clone"]
+
+FICLONE = 0x40049409  # Linux ioctl that shares a file's extents (btrfs, xfs)
+_CLONE_UNSUPPORTED = {errno.EOPNOTSUPP, errno.ENOTTY, errno.EXDEV, errno.EINVAL, errno.ENOSYS, errno.EBADF}
+
+
+def clone_file(old_file, new_file):
+    """
+    Create a copy-on-write clone of a file, falling back to a hardlink, then a full copy.
+
+    Args:
+        old_file (str): The source file.
+        new_file (str): The clone to create; it must not exist yet.
+
+    Returns:
+        str: How the file was created: "reflink", "hardlink", or "copy".
+    """
+    if fcntl is not None:
+        try:
+            with open(old_file, 'rb') as src, open(new_file, 'xb') as dst:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            shutil.copystat(old_file, new_file)
+            return "reflink"
+        except OSError as e:
+            if e.errno == errno.EEXIST:
+                raise
+            if os.path.exists(new_file):
+                os.remove(new_file)
+            if e.errno not in _CLONE_UNSUPPORTED:
+                raise
+
+    try:
+        os.link(old_file, new_file)
+        return "hardlink"
+    except OSError as e:
+        if e.errno == errno.EEXIST:
+            raise
+    shutil.copy2(old_file, new_file)
+    return "copy"
+
+
+def perform_operation(operation_mode, old_file, new_file):
+    """
+    Perform a single rename, copy, move, hardlink, or clone.
+
+    Args:
+        operation_mode (str): The operation mode (Rename, Copy, Move, Hardlink, Clone).
+        old_file (str): The source file.
+        new_file (str): The target file.
+
+    Returns:
+        tuple: The (new_file, original_file) undo entry; original_file is None for copies and links.
+    """
+    # The name index already settled clashes in memory, so this only confirms the final name
+    if os.path.lexists(new_file):
+        raise FileExistsError(f"'{new_file}' already exists")
+
+    if operation_mode == "Rename":
+        os.rename(old_file, new_file)
+        return (new_file, old_file)
+    elif operation_mode == "Copy":
+        shutil.copy2(old_file, new_file)
+        return (new_file, None)  # None indicates original file is unchanged
+    elif operation_mode == "Move":
+        try:
+            os.rename(old_file, new_file)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            move_across_devices(old_file, new_file)
+        return (new_file, old_file)
+    elif operation_mode == "Hardlink":
+        os.link(old_file, new_file)
+        return (new_file, None)
+    elif operation_mode == "Clone":
+        method = clone_file(old_file, new_file)
+        if method != "reflink":
+            logging.debug(f"Reflink not supported for '{old_file}', used {method} instead")
+        return (new_file, None)
+    raise ValueError(f"Unknown operation mode: {operation_mode}")
+
+
+def _run_planned(operation_mode, old_file, new_file, progress_callback, timer=NULL_TIMER):
+    try:
+        with timer.phase("file operations"):
+            operation = perform_operation(operation_mode, old_file, new_file)
+        with timer.phase("logging"):
+            logging.debug(f"{PAST_TENSE[operation_mode]} '{old_file}' to '{new_file}'")
+    except Exception as e:
+        logging.error(f"Error during {operation_mode.lower()} '{old_file}' to '{new_file}': {e}")
+        if progress_callback:
+            progress_callback("error", f"Error renaming '{os.path.basename(old_file)}': {e}")
+        return None
+
+    if progress_callback:
+        progress_callback("update", 1)
+    return operation
+
+
+def can_run_in_parallel(planned, operation_mode):
+    """
+    Check whether a plan may be executed out of order.
+
+    Only destination modes writing into other folders qualify: a rename inside the
+    source folder may reuse a name freed by an earlier entry, so it has to run in
+    planned order.
+    """
+    if operation_mode not in DESTINATION_MODES:
+        return False
+    source_dirs = {os.path.dirname(old_file) for old_file, _ in planned}
+    target_dirs = {os.path.dirname(new_file) for _, new_file in planned}
+    return source_dirs.isdisjoint(target_dirs)
+
+
+def is_cross_device_move(planned):
+    """Check once per job whether a Move plan crosses devices, comparing each folder pair's st_dev."""
+    folder_pairs = {(os.path.dirname(old_file), os.path.dirname(new_file)) for old_file, new_file in planned}
+    return not all(is_same_device(source, target) for source, target in folder_pairs)
+
+
+def execute_operations(planned, operation_mode, progress_callback=None, max_workers=1, timer=NULL_TIMER):
+    """
+    Execute a planned list of file operations.
+
+    Plans writing into a destination folder run on a bounded worker pool when
+    `max_workers` is above 1. Plans touching a network share are pipelined instead,
+    keeping up to `async_executor.NETWORK_IN_FLIGHT` operations in flight whatever the
+    mode, since there each call waits on a round-trip. Moves on the same device are
+    plain renames; moves across devices go through the batched, durable move engine.
+    Per-file errors are logged and reported through `progress_callback` without
+    stopping the other files.
+
+    Args:
+        planned (list): (old_file, new_file) pairs in planned order.
+        operation_mode (str): The operation mode (Rename, Copy, Move, Hardlink, Clone).
+        progress_callback (callable): Receives "update" and "error" notifications.
+        max_workers (int): Maximum number of concurrent file operations.
+        timer (PhaseTimer): Times the file operations and their logging.
+
+    Returns:
+        list: Undo entries of the successful operations, in planned order.
+    """
+    if operation_mode == "Move" and planned and is_cross_device_move(planned):
+        with timer.phase("file operations"):
+            return execute_cross_device_moves(planned, progress_callback, max_workers)
+
+    if len(planned) > 1 and async_executor.is_network_plan(planned):
+        results = async_executor.execute_pipelined(
+            planned,
+            lambda old_file, new_file: _run_planned(operation_mode, old_file, new_file, progress_callback, timer),
+            max(max_workers, async_executor.NETWORK_IN_FLIGHT)
+        )
+    elif max_workers > 1 and len(planned) > 1 and can_run_in_parallel(planned, operation_mode):
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="file-op") as pool:
+            results = list(pool.map(
+                lambda entry: _run_planned(operation_mode, entry[0], entry[1], progress_callback, timer),
+                planned
+            ))
+    else:
+        results = [
+            _run_planned(operation_mode, old_file, new_file, progress_callback, timer)
+            for old_file, new_file in planned
+        ]
+    return [operation for operation in results if operation]
@@ -1,34 +1,200 @@
 # file_operations.py
 
 import os
-import shutil
 import logging
-import tkinter as tk
-from tkinter import messagebox, simpledialog
-from data_storage import save_data, load_data  # Ensure load_data is also imported if used
-from PIL import Image, ImageTk
-import defusedxml.ElementTree as ET  # Ensure defusedxml is installed
+from datetime import datetime
+from itertools import islice
+from character_matcher import get_character_matcher
+from fuzzy_index import get_fuzzy_index
+from name_index import NameIndex, ProbingNameIndex
+from executor import execute_operations, DESTINATION_MODES, PAST_TENSE
+from directory_walker import walk_folders
+from streaming import CoalescedProgress, STREAM_CHUNK_SIZE
+from undo_journal import JobJournal, run_journaled_plan, CHECKPOINT_INTERVAL
+from rename_mask import compile_mask
+from rename_plan import RenamePlan
+from job_profile import profiled_job
+
+MAX_LISTED_SKIPPED_FILES = 100  # Skipped files named in the summary of a streaming job
+
+
+def build_name_index(folder_path, operation_mode="Rename", destination_folder=None, streaming=False):
+    """
+    List the folder new files will be written to, once per job.
 
+    Args:
+        folder_path (str): The folder being processed.
+        operation_mode (str): The operation mode (Rename, Copy, Move, Hardlink, Clone).
+        destination_folder (str): The destination folder for the destination modes.
+        streaming (bool): Use the bounded-memory index that probes the disk instead.
 
-def rename_images(folder_path, author_name, status_label, app, operation_mode="Rename", destination_folder=None, progress_callback=None):
+    Returns:
+        NameIndex: The collision index for the target folder.
     """
-    Rename, copy, or move images and save the original filenames for undo functionality.
+    index_class = ProbingNameIndex if streaming else NameIndex
+    if operation_mode in DESTINATION_MODES and destination_folder:
+        return index_class(destination_folder)
+    return index_class(folder_path)
+
+
+def run_folder_jobs(folder_path, plan_folder, operation_mode="Rename", destination_folder=None, progress_callback=None, max_workers=1, recursive=False, streaming=False, journal=None, listings=None, dry_run=False, control=None):
+    """
+    Plan and execute a rename job for a folder and, when recursive, each of its subfolders.
+
+    Subfolders are listed concurrently and each folder's job starts as soon as its
+    listing is ready. Numbering stays per folder; in the destination modes the
+    subfolder structure is mirrored under the destination folder.
+
+    In streaming mode, listings are sorted externally, files are planned and executed
+    in chunks and progress is reported in batches, so memory use stays flat however
+    many files a folder holds.
+
+    Every job is recorded in an on-disk JobJournal: planned entries are written ahead
+    of running them and completed entries are group-committed, so the job can be
+    undone after a restart and recovered after a crash. Destination-mode jobs plan
+    every folder first and then run the recorded plan in checkpointed chunks; other
+    jobs checkpoint each chunk as they run it. Either way an interrupted job resumes
+    from its last checkpoint.
+
+    Args:
+        folder_path (str): The folder to process.
+        plan_folder (callable): Called with (folder, files, name_index); yields
+            (old_file, new_file) pairs in the order they should run.
+        operation_mode (str): The operation mode (Rename, Copy, Move, Hardlink, Clone).
+        destination_folder (str): The destination folder for the destination modes.
+        progress_callback (callable): Receives progress notifications.
+        max_workers (int): Maximum number of concurrent listings and file operations.
+        recursive (bool): Whether to process subfolders too.
+        streaming (bool): Whether to run in bounded-memory streaming mode.
+        journal (JobJournal): Journal to record the job in; a new one is created if omitted.
+        listings (iterable): (folder, file count, file names) tuples to process instead of
+            walking `folder_path`, e.g. the files left for review by an earlier pass.
+        dry_run (bool): Only plan the job, without writing anything to disk.
+        control (JobControl): Checked between folders and chunks, so a queued job can be
+            paused or cancelled; work done before stopping stays journaled and undoable,
+            and the rest is offered for resume on the next start.
+
+    The time spent listing, matching, probing for free names, journaling, running the
+    file operations and logging them is added up per phase; the summary is logged and
+    sent as a "profile" notification before the job's result is handed back.
+
+    Returns:
+        JobJournal: The job's journal, which iterates over the undo entries of all
+            successful operations in planned order. A dry run returns the RenamePlan
+            instead, ready for `rename_plan.apply_plan`.
     """
+    with profiled_job(f"{operation_mode.lower()}-{os.path.basename(folder_path)}") as timer:
+        result = _run_folder_jobs(folder_path, plan_folder, operation_mode, destination_folder, progress_callback, max_workers, recursive, streaming, journal, listings, dry_run, control, timer)
+    # One summary line per job; each file is only logged in verbose mode
+    if dry_run:
+        logging.info(f"Planned {operation_mode.lower()} of {len(result)} file(s) in '{folder_path}'")
+    else:
+        logging.info(f"{PAST_TENSE[operation_mode]} {len(result)} file(s) in '{folder_path}'")
+    if progress_callback and timer.totals:
+        progress_callback("profile", timer.summary())
+    return result
+
+
+def _run_folder_jobs(folder_path, plan_folder, operation_mode, destination_folder, progress_callback, max_workers, recursive, streaming, journal, listings, dry_run, control, timer):
+    uses_destination = operation_mode in DESTINATION_MODES and destination_folder
+    if dry_run:
+        streaming = False  # The whole plan is kept for the preview anyway
+        plan = RenamePlan(operation_mode, folder_path, destination_folder)
+    fixed_plan = bool(uses_destination) and not streaming
+    if journal is None and not dry_run:
+        journal = JobJournal.create(operation_mode, folder_path, destination_folder, fixed_plan)
+    if streaming and progress_callback:
+        progress_callback = CoalescedProgress(progress_callback)
+    started = False
+
+    def stop_requested():
+        return control is not None and control.should_stop()
+
+    def run_planned(planned):
+        if dry_run:
+            plan.extend(planned)
+            return
+        with timer.phase("journal"):
+            start = journal.record_planned(planned)
+        if fixed_plan:
+            return  # Runs from the journal once every folder is planned
+        for offset in range(0, len(planned), CHECKPOINT_INTERVAL):
+            if offset and stop_requested():
+                return
+            chunk = planned[offset:offset + CHECKPOINT_INTERVAL]
+            indexes = range(start + offset, start + offset + len(chunk))
+            with timer.phase("journal"):
+                # Bounds what a restart has to check on disk to this chunk
+                journal.record_checkpoint(indexes.start, indexes.stop)
+            operations = execute_operations(chunk, operation_mode, progress_callback, max_workers, timer)
+            with timer.phase("journal"):
+                journal.record_done(indexes, chunk, operations)
+
+    if listings is None:
+        listings = walk_folders(folder_path, recursive, max_workers, [destination_folder], streaming)
+
     try:
-        files = sorted([
-            f for f in os.listdir(folder_path)
-            if os.path.isfile(os.path.join(folder_path, f))
-        ])
+        for folder, file_count, files in timer.timed_iter("listing", listings):
+            if stop_requested():
+                break
+            if progress_callback:
+                progress_callback("total" if started else "start", file_count)
+            started = True
+            if dry_run:
+                plan.record_folder(folder)
+            if not file_count:
+                continue
 
-        total_files = len(files)
-        if progress_callback:
-            progress_callback("start", total_files)
-        
-        skipped_files = []
-        operations = []  # List to keep track of operations
+            target_folder = None
+            if uses_destination:
+                target_folder = os.path.normpath(os.path.join(destination_folder, os.path.relpath(folder, folder_path)))
+                if not dry_run:
+                    os.makedirs(target_folder, exist_ok=True)
+            with timer.phase("listing"):
+                name_index = build_name_index(folder, operation_mode, target_folder, streaming)
+            name_index.allocate = timer.timed("collision probing", name_index.allocate)
+            frees_source_names = name_index.folder_path == folder and operation_mode in ["Rename", "Move"]
+
+            planned = []  # (old_file, new_file) pairs, in the order they will run
+            for old_file, new_file in timer.timed_iter("matching", plan_folder(folder, files, name_index)):
+                planned.append((old_file, new_file))
+                if frees_source_names:
+                    name_index.release(os.path.basename(old_file))  # The source name is free once this entry has run
+                if streaming and len(planned) >= STREAM_CHUNK_SIZE:
+                    run_planned(planned)
+                    name_index.flush()
+                    planned = []
+                    if stop_requested():
+                        break
+
+            run_planned(planned)
+
+        if dry_run:
+            return plan
+        if fixed_plan and journal.planned_count and not stop_requested():
+            journal.record_plan_complete()
+            run_journaled_plan(journal, progress_callback, max_workers, control=control, timer=timer)
+    finally:
+        if journal is not None:
+            # A job stopped by cancelling it or closing the window stays resumable
+            journal.finish(cancelled=control is not None and control.cancelled)
+        if streaming and progress_callback:
+            progress_callback.flush()
+
+    return journal
+
+
+def rename_images(folder_path, author_name, status_label, app, operation_mode="Rename", destination_folder=None, progress_callback=None, max_workers=1, recursive=False, streaming=False, dry_run=False, control=None):
+    """
+    Rename, copy, or move images and save the original filenames for undo functionality.
+    """
+    skipped_files = []
+    skipped_count = 0
 
-        for index, filename in enumerate(files, start=1):
-            old_file = os.path.join(folder_path, filename)
+    def plan_folder(folder, files, name_index):
+        nonlocal skipped_count
+        for filename in files:
+            old_file = os.path.join(folder, filename)
 
             # Split the filename into name and extension
             name_part, ext_part = os.path.splitext(filename)
@@ -38,62 +204,25 @@ def rename_images(folder_path, author_name, status_label, app, operation_mode="R
             author_marker = f"by {author_name}"
             if author_marker.lower() in name_part.lower():
                 # Skip renaming this file
-                logging.info(f"Skipping '{filename}' as it already contains 'by {author_name}'")
-                skipped_files.append(filename)
+                logging.debug(f"Skipping '{filename}' as it already contains 'by {author_name}'")
+                skipped_count += 1
+                if not streaming or len(skipped_files) < MAX_LISTED_SKIPPED_FILES:
+                    skipped_files.append(filename)
                 if progress_callback:
                     progress_callback("update", 1)
                 continue
 
             base_new_name = f"{name_part} by {author_name}"
-            new_name = f"{base_new_name}{ext_part}"
 
-            # Determine the new file path
-            if operation_mode in ["Copy", "Move"] and destination_folder:
-                new_file = os.path.join(destination_folder, new_name)
-            else:
-                new_file = os.path.join(folder_path, new_name)
-
-            # Handle duplicate filenames
-            counter = 1
-            while os.path.exists(new_file):
-                new_name = f"{base_new_name} {counter}{ext_part}"
-                if operation_mode in ["Copy", "Move"] and destination_folder:
-                    new_file = os.path.join(destination_folder, new_name)
-                else:
-                    new_file = os.path.join(folder_path, new_name)
-                counter += 1
-
-            # Perform the selected operation
-            try:
-                if operation_mode == "Rename":
-                    os.rename(old_file, new_file)
-                    operations.append((new_file, old_file))
-                    logging.info(f"Renamed '{old_file}' to '{new_file}'")
-                elif operation_mode == "Copy":
-                    shutil.copy2(old_file, new_file)
-                    operations.append((new_file, None))  # None indicates original file is unchanged
-                    logging.info(f"Copied '{old_file}' to '{new_file}'")
-                elif operation_mode == "Move":
-                    shutil.move(old_file, new_file)
-                    operations.append((new_file, old_file))
-                    logging.info(f"Moved '{old_file}' to '{new_file}'")
-                else:
-                    logging.error(f"Unknown operation mode: {operation_mode}")
-                    continue
-            except Exception as e:
-                logging.error(f"Error during {operation_mode.lower()} '{old_file}' to '{new_file}': {e}")
-                if progress_callback:
-                    progress_callback("error", f"Error renaming '{filename}': {e}")
-                continue
+            # Determine the new file path, numbering it if the name is taken
+            yield old_file, name_index.allocate(f"{base_new_name} ", ext_part, first_name=f"{base_new_name}{ext_part}", confirm=False)
 
-            # Update progress
-            if progress_callback:
-                progress_callback("update", 1)
+    try:
+        operations = run_folder_jobs(folder_path, plan_folder, operation_mode, destination_folder, progress_callback, max_workers, recursive, streaming, dry_run=dry_run, control=control)
 
         # Save the operations to the app's undo stack
-        if operations:
-            app.undo_stack.append((operation_mode, operations))
-            app.update_undo_button_state()  # Enable the undo button
+        if operations and app is not None and not dry_run:
+            app.add_undo_entry(operation_mode, operations)  # Enables the undo button
 
         # Provide feedback on skipped files
         if skipped_files:
@@ -101,261 +230,291 @@ def rename_images(folder_path, author_name, status_label, app, operation_mode="R
                 "The following files were skipped as they already contain the author name:\n"
                 + "\n".join(skipped_files)
             )
+            if skipped_count > len(skipped_files):
+                skipped_message += f"\n...and {skipped_count - len(skipped_files)} more"
             logging.info(skipped_message)
             if progress_callback:
                 progress_callback("skipped", skipped_message)
 
         if progress_callback:
-            progress_callback("done")
+            if dry_run:
+                progress_callback("plan", operations)  # Shown as a preview; applied with apply_plan
+            else:
+                progress_callback("done")
 
     except Exception as e:
         logging.error(f"Error during {operation_mode.lower()}: {e}")
         if progress_callback:
             progress_callback("error", f"An error occurred: {e}")
 
-def rename_images_by_folder_name(folder_path, author_name, status_label, app, operation_mode="Rename", destination_folder=None, progress_callback=None):
+def rename_images_by_folder_name(folder_path, author_name, status_label, app, operation_mode="Rename", destination_folder=None, progress_callback=None, max_workers=1, recursive=False, streaming=False, dry_run=False, control=None):
     """
     Rename, copy, or move images by prefixing the folder name and appending the author name.
     """
-    try:
-        folder_name = os.path.basename(folder_path)
-        files = sorted([
-            f for f in os.listdir(folder_path)
-            if os.path.isfile(os.path.join(folder_path, f))
-        ])
-
-        total_files = len(files)
-        if progress_callback:
-            progress_callback("start", total_files)
-
-        operations = []  # List to keep track of operations
-
+    def plan_folder(folder, files, name_index):
+        folder_name = os.path.basename(folder)
         for index, filename in enumerate(files, start=1):
-            old_file = os.path.join(folder_path, filename)
+            old_file = os.path.join(folder, filename)
 
             # Split the filename into name and extension
             name_part, ext_part = os.path.splitext(filename)
             ext_part = ext_part.lower()
 
-            new_name = f"{folder_name} by {author_name} {index}{ext_part}"
+            base_new_name = f"{folder_name} by {author_name} {index}"
+
+            # Determine the new file path, adding a suffix if the name is taken
+            yield old_file, name_index.allocate(f"{base_new_name}_", ext_part, first_name=f"{base_new_name}{ext_part}", confirm=False)
 
-            # Determine the new file path
-            if operation_mode in ["Copy", "Move"] and destination_folder:
-                new_file = os.path.join(destination_folder, new_name)
+    try:
+        operations = run_folder_jobs(folder_path, plan_folder, operation_mode, destination_folder, progress_callback, max_workers, recursive, streaming, dry_run=dry_run, control=control)
+
+        # Save the operations to the app's undo stack
+        if operations and app is not None and not dry_run:
+            app.add_undo_entry(operation_mode, operations)  # Enables the undo button
+
+        if progress_callback:
+            if dry_run:
+                progress_callback("plan", operations)  # Shown as a preview; applied with apply_plan
             else:
-                new_file = os.path.join(folder_path, new_name)
-
-            # Handle duplicate filenames
-            counter = 1
-            while os.path.exists(new_file):
-                new_name = f"{folder_name} by {author_name} {index}_{counter}{ext_part}"
-                if operation_mode in ["Copy", "Move"] and destination_folder:
-                    new_file = os.path.join(destination_folder, new_name)
-                else:
-                    new_file = os.path.join(folder_path, new_name)
-                counter += 1
-
-            # Perform the selected operation
-            try:
-                if operation_mode == "Rename":
-                    os.rename(old_file, new_file)
-                    operations.append((new_file, old_file))
-                    logging.info(f"Renamed '{old_file}' to '{new_file}'")
-                elif operation_mode == "Copy":
-                    shutil.copy2(old_file, new_file)
-                    operations.append((new_file, None))  # None indicates original file is unchanged
-                    logging.info(f"Copied '{old_file}' to '{new_file}'")
-                elif operation_mode == "Move":
-                    shutil.move(old_file, new_file)
-                    operations.append((new_file, old_file))
-                    logging.info(f"Moved '{old_file}' to '{new_file}'")
-                else:
-                    logging.error(f"Unknown operation mode: {operation_mode}")
-                    continue
-            except Exception as e:
-                logging.error(f"Error during {operation_mode.lower()} '{old_file}' to '{new_file}': {e}")
+                progress_callback("done")
+
+    except Exception as e:
+        logging.error(f"Error during {operation_mode.lower()} by folder name: {e}")
+        if progress_callback:
+            progress_callback("error", f"An error occurred: {e}")
+
+class ReviewQueue:
+    """
+    Files a character-name job could not match, kept for the user to resolve in one batch.
+
+    Attributes:
+        folder_path (str): The folder the job was started on.
+        author_name (str): The author name used by the job.
+        operation_mode (str): The job's operation mode.
+        destination_folder (str): The job's destination folder, if any.
+        entries (list): (folder, filename) pairs in the order they were found.
+        suggestions (dict): (folder, filename) -> likely character names, best first.
+    """
+
+    def __init__(self, folder_path, author_name, operation_mode="Rename", destination_folder=None):
+        self.folder_path = folder_path
+        self.author_name = author_name
+        self.operation_mode = operation_mode
+        self.destination_folder = destination_folder
+        self.entries = []
+        self.suggestions = {}
+
+    def add(self, folder, filename, suggestions=()):
+        self.entries.append((folder, filename))
+        if suggestions:
+            self.suggestions[(folder, filename)] = list(suggestions)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def listings(self, assignments):
+        """
+        Group the assigned entries by folder for a second pass.
+
+        Args:
+            assignments (dict): Maps (folder, filename) to the chosen character name.
+
+        Returns:
+            list: (folder, file count, sorted file names) tuples for `run_folder_jobs`.
+        """
+        by_folder = {}
+        for folder, filename in self.entries:
+            if assignments.get((folder, filename)):
+                by_folder.setdefault(folder, []).append(filename)
+        return [(folder, len(files), sorted(files)) for folder, files in by_folder.items()]
+
+
+def rename_images_by_character_name(folder_path, author_name, status_label, character_names, app, operation_mode="Rename", destination_folder=None, progress_callback=None, max_workers=1, recursive=False, streaming=False, dry_run=False, control=None, character_aliases=None):
+    """
+    Rename, copy, or move images by matching character names and adding the author name.
+
+    Files that match no character are not prompted for one at a time. They are put on a
+    ReviewQueue that is handed to the progress callback as a "review" notification once
+    the matched files are done, so the user can resolve them in one batch and run
+    `rename_reviewed_files` as a second pass. Each queued file comes with the
+    character names it most resembles (see fuzzy_index.FuzzyIndex), e.g. "Tifa" for
+    "Tifaa_01". Aliases in `character_aliases` (alias -> character name) are matched
+    as the name they belong to.
+    """
+    author_part = f' by {author_name}' if author_name else ''
+    review_queue = ReviewQueue(folder_path, author_name, operation_mode, destination_folder)
+
+    def plan_folder(folder, files, name_index):
+        matcher = get_character_matcher(character_names, character_aliases)
+        suggester = None  # Built the first time a file matches no name
+
+        for filename in files:
+            old_file = os.path.join(folder, filename)
+            name_part, extension = os.path.splitext(filename)
+            matched_word = matcher.match(name_part)  # Preserves original capitalization
+
+            if not matched_word:
+                # Leave the file for the user to review once the job is done
+                logging.debug(f"No character name found in '{filename}'. Queued for review.")
+                if suggester is None:
+                    suggester = get_fuzzy_index(character_names, character_aliases)
+                review_queue.add(folder, filename, suggester.suggest(name_part))
                 if progress_callback:
-                    progress_callback("error", f"Error renaming '{filename}': {e}")
+                    progress_callback("update", 1)
                 continue
 
-            # Update progress
-            if progress_callback:
-                progress_callback("update", 1)
+            # Always append a number to the filename, using the next free one
+            yield old_file, name_index.allocate(f'{matched_word}{author_part} ', extension, confirm=False)
+
+    try:
+        operations = run_folder_jobs(folder_path, plan_folder, operation_mode, destination_folder, progress_callback, max_workers, recursive, streaming, dry_run=dry_run, control=control)
 
         # Save the operations to the app's undo stack
-        if operations:
-            app.undo_stack.append((operation_mode, operations))
-            app.update_undo_button_state()  # Enable the undo button
+        if operations and app is not None and not dry_run:
+            app.add_undo_entry(operation_mode, operations)  # Enables the undo button
 
         if progress_callback:
-            progress_callback("done")
+            if dry_run:
+                # Unmatched files are reviewed once the plan is applied, so their names
+                # are chosen against the files it creates
+                operations.review_queue = review_queue or None
+                progress_callback("plan", operations)
+            else:
+                progress_callback("done")
+                if review_queue:
+                    progress_callback("review", review_queue)
 
     except Exception as e:
-        logging.error(f"Error during {operation_mode.lower()} by folder name: {e}")
+        logging.error(f"Error during {operation_mode.lower()} by character name: {e}")
         if progress_callback:
             progress_callback("error", f"An error occurred: {e}")
 
-def rename_images_by_character_name(folder_path, author_name, status_label, character_names, app, operation_mode="Rename", destination_folder=None, progress_callback=None):
+
+def rename_reviewed_files(review_queue, assignments, app, progress_callback=None, max_workers=1, dry_run=False, control=None):
     """
-    Rename, copy, or move images by matching character names and adding the author name.
+    Rename, copy, or move the files resolved in a review, as a second pass of their job.
+
+    Args:
+        review_queue (ReviewQueue): The files the first pass could not match.
+        assignments (dict): Maps (folder, filename) to the chosen character name;
+            unassigned files are left untouched.
+        app: The application, for its undo stack; None when run headless.
+        progress_callback (callable): Receives progress notifications.
+        max_workers (int): Maximum number of concurrent file operations.
     """
+    author_name = review_queue.author_name
+    author_part = f' by {author_name}' if author_name else ''
+    operation_mode = review_queue.operation_mode
+
+    def plan_folder(folder, files, name_index):
+        for filename in files:
+            _, extension = os.path.splitext(filename)
+            character_name = assignments[(folder, filename)]
+            yield os.path.join(folder, filename), name_index.allocate(f'{character_name}{author_part} ', extension, confirm=False)
+
     try:
-        files = sorted([
-            f for f in os.listdir(folder_path)
-            if os.path.isfile(os.path.join(folder_path, f))
-        ])
+        operations = run_folder_jobs(
+            review_queue.folder_path, plan_folder, operation_mode, review_queue.destination_folder,
+            progress_callback, max_workers, listings=review_queue.listings(assignments), dry_run=dry_run, control=control
+        )
+
+        if operations and app is not None and not dry_run:
+            app.add_undo_entry(operation_mode, operations)
 
-        total_files = len(files)
         if progress_callback:
-            progress_callback("start", total_files)
+            if dry_run:
+                progress_callback("plan", operations)  # Shown as a preview; applied with apply_plan
+            else:
+                progress_callback("done")
 
-        operations = []  # List to keep track of operations
+    except Exception as e:
+        logging.error(f"Error during {operation_mode.lower()} of reviewed files: {e}")
+        if progress_callback:
+            progress_callback("error", f"An error occurred: {e}")
 
-        for index, filename in enumerate(files, start=1):
-            old_file = os.path.join(folder_path, filename)
-            matched = False
-            matched_word = ""
-
-            for word in character_names:
-                if word.lower() in filename.lower():
-                    matched_word = word  # Preserve original capitalization
-                    extension = os.path.splitext(filename)[1]
-                    author_part = f' by {author_name}' if author_name else ''
-                    
-                    # Always append a number to the filename
-                    counter = 1
-                    base_new_filename = f'{matched_word}{author_part} {counter}{extension}'
-
-                    # Determine the new file path
-                    if operation_mode in ["Copy", "Move"] and destination_folder:
-                        new_file = os.path.join(destination_folder, base_new_filename)
-                    else:
-                        new_file = os.path.join(folder_path, base_new_filename)
-
-                    # Handle duplicate filenames
-                    while os.path.exists(new_file):
-                        counter += 1
-                        base_new_filename = f'{matched_word}{author_part} {counter}{extension}'
-                        if operation_mode in ["Copy", "Move"] and destination_folder:
-                            new_file = os.path.join(destination_folder, base_new_filename)
-                        else:
-                            new_file = os.path.join(folder_path, base_new_filename)
-
-                    # Perform the selected operation
-                    try:
-                        if operation_mode == "Rename":
-                            os.rename(old_file, new_file)
-                            operations.append((new_file, old_file))
-                            logging.info(f"Renamed '{old_file}' to '{new_file}'")
-                        elif operation_mode == "Copy":
-                            shutil.copy2(old_file, new_file)
-                            operations.append((new_file, None))
-                            logging.info(f"Copied '{old_file}' to '{new_file}'")
-                        elif operation_mode == "Move":
-                            shutil.move(old_file, new_file)
-                            operations.append((new_file, old_file))
-                            logging.info(f"Moved '{old_file}' to '{new_file}'")
-                        else:
-                            logging.error(f"Unknown operation mode: {operation_mode}")
-                            continue
-                    except Exception as e:
-                        logging.error(f"Error during {operation_mode.lower()} '{old_file}' to '{new_file}': {e}")
-                        if progress_callback:
-                            progress_callback("error", f"Error renaming '{filename}': {e}")
-                        continue
-
-                    matched = True
-                    break  # Exit the character_names loop
-
-            if not matched:
-                # Prompt the user to add a new character name
-                response = messagebox.askyesno(
-                    "Add Character Name",
-                    f"No character name found in '{filename}'. Do you want to add a new character name?"
-                )
-                if response:
-                    # Suggest a default value from the filename
-                    default_name = os.path.splitext(filename)[0].strip()
-                    new_character_name = simpledialog.askstring(
-                        "New Character Name",
-                        f"Enter the new character name for '{filename}':",
-                        initialvalue=default_name,
-                        parent=app
-                    )
-                    if new_character_name:
-                        # Add the new character name to the list
-                        character_names.append(new_character_name)
-                        character_names = sorted(character_names)
-                        app.character_name_combo['values'] = character_names
-                        app.data['character_names'] = character_names
-                        save_data(app.DATA_FILE, app.data)
-                        logging.info(f"Added new character name: {new_character_name}")
-                    else:
-                        logging.info(f"No character name provided for '{filename}'. Skipping file.")
-                        if progress_callback:
-                            progress_callback("update", 1)
-                        continue
-
-                    # Proceed to rename the file with the new character name
-                    extension = os.path.splitext(filename)[1]
-                    author_part = f' by {author_name}' if author_name else ''
-                    
-                    # Always append a number to the filename
-                    counter = 1
-                    base_new_filename = f'{new_character_name}{author_part} {counter}{extension}'
-
-                    # Determine the new file path
-                    if operation_mode in ["Copy", "Move"] and destination_folder:
-                        new_file = os.path.join(destination_folder, base_new_filename)
-                    else:
-                        new_file = os.path.join(folder_path, base_new_filename)
-
-                    # Handle duplicate filenames
-                    while os.path.exists(new_file):
-                        counter += 1
-                        base_new_filename = f'{new_character_name}{author_part} {counter}{extension}'
-                        if operation_mode in ["Copy", "Move"] and destination_folder:
-                            new_file = os.path.join(destination_folder, base_new_filename)
-                        else:
-                            new_file = os.path.join(folder_path, base_new_filename)
-
-                    # Perform the selected operation
-                    try:
-                        if operation_mode == "Rename":
-                            os.rename(old_file, new_file)
-                            operations.append((new_file, old_file))
-                            logging.info(f"Renamed '{old_file}' to '{new_file}'")
-                        elif operation_mode == "Copy":
-                            shutil.copy2(old_file, new_file)
-                            operations.append((new_file, None))
-                            logging.info(f"Copied '{old_file}' to '{new_file}'")
-                        elif operation_mode == "Move":
-                            shutil.move(old_file, new_file)
-                            operations.append((new_file, old_file))
-                            logging.info(f"Moved '{old_file}' to '{new_file}'")
-                        else:
-                            logging.error(f"Unknown operation mode: {operation_mode}")
-                            continue
-                    except Exception as e:
-                        logging.error(f"Error during {operation_mode.lower()} '{old_file}' to '{new_file}': {e}")
-                        if progress_callback:
-                            progress_callback("error", f"Error renaming '{filename}': {e}")
-                        continue
-
-            # Update progress
-            if progress_callback:
-                progress_callback("update", 1)
 
-        # Save the operations to the app's undo stack
-        if operations:
-            app.undo_stack.append((operation_mode, operations))
-            app.update_undo_button_state()  # Enable the undo button
+def image_dimensions(file_path):
+    """Return an image's (width, height) from its header, or (None, None) if it is not an image."""
+    from PIL import Image  # Only loaded when a mask asks for image dimensions
+
+    try:
+        with Image.open(file_path) as image:
+            return image.size
+    except Exception:
+        return None, None
+
+
+def rename_images_by_mask(folder_path, mask, author_name, status_label, character_names, app, operation_mode="Rename", destination_folder=None, progress_callback=None, max_workers=1, recursive=False, streaming=False, dry_run=False, control=None, character_aliases=None):
+    """
+    Rename, copy, or move images following a user-defined rename mask.
+
+    The mask is compiled once (see rename_mask.CompiledMask) and rendered in bulk for
+    each chunk of planned files. Metadata is only read for the fields the mask uses.
+    Files for which a required field is empty, e.g. no character name matched, are skipped.
+    """
+    compiled = compile_mask(mask)
+    skipped_count = 0
+
+    def plan_folder(folder, files, name_index):
+        nonlocal skipped_count
+        matcher = get_character_matcher(character_names, character_aliases) if "char" in compiled.fields else None
+        folder_name = os.path.basename(folder)
+        files = iter(files)
+
+        while True:
+            chunk = list(islice(files, STREAM_CHUNK_SIZE))
+            if not chunk:
+                break
+
+            rows = []
+            for filename in chunk:
+                old_file = os.path.join(folder, filename)
+                name_part = os.path.splitext(filename)[0]
+                values = {"author": author_name, "folder": folder_name, "name": name_part}
+                if matcher:
+                    values["char"] = matcher.match(name_part)
+                if "date" in compiled.fields:
+                    values["date"] = datetime.fromtimestamp(os.stat(old_file).st_mtime)
+                if "width" in compiled.fields or "height" in compiled.fields:
+                    values["width"], values["height"] = image_dimensions(old_file)
+                rows.append(values)
+
+            for filename, rendered in zip(chunk, compiled.render_all(rows)):
+                if rendered is None or not (compiled.has_counter or rendered[0].strip()):
+                    logging.debug(f"Skipping '{filename}': the mask has fields this file has no value for")
+                    skipped_count += 1
+                    if progress_callback:
+                        progress_callback("update", 1)
+                    continue
+
+                prefix, suffix = rendered
+                extension = os.path.splitext(filename)[1].lower()
+                if compiled.has_counter:
+                    new_file = name_index.allocate(prefix, f"{suffix}{extension}", confirm=False)
+                else:
+                    new_file = name_index.allocate(f"{prefix} ", extension, first_name=f"{prefix}{extension}", confirm=False)
+                yield os.path.join(folder, filename), new_file
+
+    try:
+        operations = run_folder_jobs(folder_path, plan_folder, operation_mode, destination_folder, progress_callback, max_workers, recursive, streaming, dry_run=dry_run, control=control)
+
+        if operations and app is not None and not dry_run:
+            app.add_undo_entry(operation_mode, operations)
+
+        if skipped_count:
+            skipped_message = f"{skipped_count} file(s) were skipped because the mask '{mask}' needs values they do not have."
+            logging.info(skipped_message)
+            if progress_callback:
+                progress_callback("skipped", skipped_message)
 
         if progress_callback:
-            progress_callback("done")
+            if dry_run:
+                progress_callback("plan", operations)  # Shown as a preview; applied with apply_plan
+            else:
+                progress_callback("done")
 
     except Exception as e:
-        logging.error(f"Error during {operation_mode.lower()} by character name: {e}")
+        logging.error(f"Error during {operation_mode.lower()} by mask: {e}")
         if progress_callback:
             progress_callback("error", f"An error occurred: {e}")
 
@@ -371,6 +530,8 @@ def prompt_author_choice(folder_name, preselected_author):
     Returns:
         str: The chosen author name, or None if canceled.
     """
+    from tkinter import messagebox, simpledialog
+
     options = [
         f"Use '{preselected_author}' (preselected author)",
         f"Use a word from the folder name '{folder_name}'"
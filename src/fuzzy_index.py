@@ -0,0 +1,121 @@
+# fuzzy_index.py
+
+import re
+import threading
+from name_keys import build_entries, fold_text
+
+SUGGESTIONS = 5  # Suggestions offered per unmatched file
+MIN_SCORE = 0.45  # Lowest similarity (0-1) worth suggesting
+MAX_WINDOW_WORDS = 3  # Longest run of filename words compared with a name
+MAX_WORDS = 12  # Filename words looked at; the rest is usually noise
+MIN_LENGTH = 3  # Shorter names and words ("V", "2B", "v2") are too short to match approximately
+
+_WORD = re.compile(r"[^\W\d_]+")  # Letters only; digits, separators and punctuation split words
+
+
+def _trigrams(key):
+    """The distinct 3-grams of a key padded with a space at both ends."""
+    padded = f" {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class FuzzyIndex:
+    """
+    Approximate-match index suggesting character names for filenames that matched none.
+
+    Every name and alias is split into 3-grams, and an inverted index maps each 3-gram
+    to the names containing it. A filename is folded once and cut into runs of up to
+    MAX_WINDOW_WORDS words; each run is scored against the names sharing its 3-grams
+    by the Dice coefficient, 2 * shared / (grams in run + grams in name). Typos
+    ("Tifaa") and partial names ("aerith_gains") still share most 3-grams with the
+    name, while only the names sharing a 3-gram are ever looked at.
+    """
+
+    def __init__(self, character_names, aliases=None):
+        """
+        Args:
+            character_names (list): Character names.
+            aliases (dict): Alias -> character name; a matching alias suggests its name.
+        """
+        self.names = []   # Pattern id -> canonical character name
+        self._sizes = []  # Pattern id -> number of 3-grams
+        self._postings = {}  # 3-gram -> pattern ids
+        seen = set()
+        for entry in build_entries(character_names, aliases):
+            for key in entry.keys:
+                if key in seen or len(key) < MIN_LENGTH:
+                    continue
+                seen.add(key)
+                grams = _trigrams(key)
+                pattern_id = len(self.names)
+                self.names.append(entry.name)
+                self._sizes.append(len(grams))
+                for gram in grams:
+                    self._postings.setdefault(gram, []).append(pattern_id)
+
+    def __len__(self):
+        return len(self.names)
+
+    def suggest(self, filename, limit=SUGGESTIONS):
+        """
+        Return the character names most similar to a filename, best first.
+
+        Args:
+            filename (str): The filename stem.
+            limit (int): Maximum number of names returned.
+
+        Returns:
+            list: Character names scoring at least MIN_SCORE.
+        """
+        words = _WORD.findall(fold_text(filename))[:MAX_WORDS]
+        postings, sizes = self._postings, self._sizes
+        best = {}  # Pattern id -> best score over the windows
+        for start in range(len(words)):
+            for end in range(start + 1, min(start + MAX_WINDOW_WORDS, len(words)) + 1):
+                window = " ".join(words[start:end])
+                if len(window) < MIN_LENGTH:
+                    continue
+                grams = _trigrams(window)
+                shared = {}
+                for gram in grams:
+                    for pattern_id in postings.get(gram, ()):
+                        shared[pattern_id] = shared.get(pattern_id, 0) + 1
+                size = len(grams)
+                for pattern_id, count in shared.items():
+                    score = 2 * count / (size + sizes[pattern_id])
+                    if score >= MIN_SCORE and score > best.get(pattern_id, 0):
+                        best[pattern_id] = score
+
+        suggestions = []
+        for pattern_id in sorted(best, key=lambda pattern_id: (-best[pattern_id], self.names[pattern_id])):
+            name = self.names[pattern_id]
+            if name not in suggestions:
+                suggestions.append(name)
+                if len(suggestions) >= limit:
+                    break
+        return suggestions
+
+
+_index_lock = threading.Lock()
+_cached_key = None
+_cached_index = None
+
+
+def get_fuzzy_index(character_names, aliases=None):
+    """
+    Return a fuzzy index for the character names, rebuilding it only when the list changes.
+
+    Args:
+        character_names (list): The current character names.
+        aliases (dict): Alias -> character name.
+
+    Returns:
+        FuzzyIndex: The cached index for this list.
+    """
+    global _cached_key, _cached_index
+    key = (tuple(character_names), tuple(sorted((aliases or {}).items())))
+    with _index_lock:
+        if _cached_index is None or key != _cached_key:
+            _cached_index = FuzzyIndex(key[0], dict(key[1]))
+            _cached_key = key
+        return _cached_index
@@ -7,15 +7,28 @@ import tkinter as tk
 from tkinter import filedialog, messagebox, ttk, simpledialog
 import logging
 import configparser
-from file_operations import rename_images, rename_images_by_folder_name, rename_images_by_character_name, prompt_author_choice
-from data_storage import load_data, save_data, add_author, delete_author, add_character_name, delete_character_name
-from logging.handlers import QueueHandler
+from file_operations import rename_images, rename_images_by_folder_name, rename_images_by_character_name, rename_images_by_mask, rename_reviewed_files, prompt_author_choice
+from rename_mask import compile_mask, MaskError, DEFAULT_RENAME_MASK
+from rename_plan import apply_plan, save_plan, load_plan
+from virtual_table import VirtualTable
+from job_queue import JobQueue, folder_devices
+from executor import DESTINATION_MODES
+import async_executor
+import job_profile
+from log_setup import setup_logging, read_logging_options
+from undo_journal import load_undo_history, replay_interrupted_job, roll_back_interrupted_job, undo_operations
+from data_storage import open_registry
+from name_filter import NameFilter
 import queue
 from PIL import Image, ImageTk, UnidentifiedImageError
-import shutil 
 import threading
+import time
 
 
+UI_FRAME_MS = 100  # Shortest time between two redraws of progress and logs
+MAX_LOG_LINES = 5000  # Lines kept in the log window
+TYPE_AHEAD_DELAY_MS = 150  # Pause in typing before a name combobox is filtered
+
 SUPPORTED_IMAGE_EXTENSIONS = (
     '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff', '.webp', '.ico', '.svg', '.heic'
 )
@@ -36,20 +49,8 @@ CONFIG_FILE = os.path.join(CONFIG_DIR, "config.ini")
 DATA_FILE = os.path.join(DATA_DIR, "data.json")
 LOG_FILE = os.path.join(LOGS_DIR, "app.log")
 
-# Configure the root logger
-log_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-root_logger = logging.getLogger()
-root_logger.setLevel(logging.DEBUG)
-
-# Remove any existing handlers
-if root_logger.hasHandlers():
-    root_logger.handlers.clear()
-
-# FileHandler for writing logs to a file
-file_handler = logging.FileHandler(LOG_FILE, mode='a')
-file_handler.setFormatter(log_formatter)
-file_handler.setLevel(logging.DEBUG)
-root_logger.addHandler(file_handler)
+# Configure the root logger: a background writer to a rotating log file
+setup_logging(LOG_FILE, **read_logging_options(CONFIG_FILE))
 
 # Now you can log messages
 logging.info("Application started. Logging setup complete.")
@@ -63,8 +64,8 @@ class App(tk.Tk):
         self.title("Image Renamer")
         self.geometry("1400x600")
 
-        # Undo operations
-        self.undo_stack = []  # Stack to keep track of undo operations
+        # Undo operations, restored from the job journals of earlier sessions
+        self.undo_stack, interrupted_jobs = load_undo_history()
 
         # Flag to track preview pane visibility
         self.preview_visible = False
@@ -76,19 +77,54 @@ class App(tk.Tk):
             self.config['DEFAULT'] = {
                 'DataFile': DATA_FILE,
                 'LogFile': LOG_FILE,
-                'LastAuthor': ''
+                'LastAuthor': '',
+                'MaxWorkers': '4',
+                'RenameMask': DEFAULT_RENAME_MASK,
+                'MaxJobs': '2',
+                'JobsPerDevice': '1',
+                'NetworkInFlight': '16',
+                'ProfileJobs': 'False',
+                'TraceJobs': 'False',
+                'VerboseLogging': 'False',
+                'LogMaxBytes': '5242880',
+                'LogBackupCount': '5',
+                'LogRotateWhen': '',
+                'DataBackend': 'json'
             }
             with open(CONFIG_FILE, 'w') as configfile:
                 self.config.write(configfile)
         else:
             self.config.read(CONFIG_FILE)
 
-        # Load data from JSON file
+        # Number of concurrent file operations for Copy and Move jobs
+        self.max_workers = max(1, self.config['DEFAULT'].getint('MaxWorkers', 4))
+
+        # Operations kept in flight on network shares, where each one waits on a round-trip
+        async_executor.NETWORK_IN_FLIGHT = max(1, self.config['DEFAULT'].getint('NetworkInFlight', 16))
+
+        # Profile each job with cProfile and/or save a Chrome trace of it to logs/profiles
+        job_profile.PROFILE_JOBS = self.config['DEFAULT'].getboolean('ProfileJobs', False)
+        job_profile.TRACE_JOBS = self.config['DEFAULT'].getboolean('TraceJobs', False)
+        self.last_profile = None
+
+        # Folder jobs share MaxJobs workers, with at most JobsPerDevice of them on one disk
+        self.job_queue = JobQueue(
+            self.update_progress,
+            self.config['DEFAULT'].getint('MaxJobs', 2),
+            self.config['DEFAULT'].getint('JobsPerDevice', 1)
+        )
+        self.job_queue_window = None
+        self.job_queue_after_id = None
+
+        # Load the author and character registry (JSON, or SQLite with DataBackend = sqlite)
         self.DATA_FILE = DATA_FILE
         self.LOG_FILE = LOG_FILE
-        self.data = load_data(DATA_FILE)
-        self.authors = self.data.get('authors', [])
-        self.character_names = self.data.get('character_names', [])
+        self.data_store = open_registry(self.config['DEFAULT'].get('DataBackend', 'json'))
+        self.authors = self.data_store.authors
+        self.character_names = self.data_store.character_names
+        # Type-ahead indexes behind the author and character name comboboxes
+        self.author_filter = NameFilter(self.authors)
+        self.character_filter = NameFilter(self.character_names)
 
         # **Load icons BEFORE creating the main frame**
         self.load_icons()
@@ -102,12 +138,21 @@ class App(tk.Tk):
         self.create_log_window()
         self.create_preview_pane()  # Ensure this is called after create_main_frame
         self.create_undo_button()
+
+        # Workers add processed files to a shared counter and raise a flag; the main thread
+        # checks it once per frame, so no worker ever calls into Tk
+        self.ui_lock = threading.Lock()
+        self.ui_update_requested = False
+        self.pending_processed = 0
+        self.job_started_at = time.monotonic()
+        self.polling = True  # Frames are drawn until the app closes
+
         self.setup_logging()
         self.create_toggle_preview_button()
 
-        # Initialize a queue for progress updates
+        # Notifications from workers are handled on the main thread, one frame at a time
         self.progress_queue = queue.Queue()
-        self.after(100, self.process_progress_queue)
+        self.after(UI_FRAME_MS, self.poll_ui_updates)
 
         # Confirm image_label existence
         if hasattr(self, 'image_label'):
@@ -121,6 +166,10 @@ class App(tk.Tk):
         # Bind the window close event
         self.protocol("WM_DELETE_WINDOW", self.on_closing)
 
+        # Offer to finish or roll back jobs that were interrupted by a crash
+        if interrupted_jobs:
+            self.after(0, self.recover_interrupted_jobs, interrupted_jobs)
+
         self.operation_mode = tk.StringVar(value="Rename")  # Default operation mode
         self.create_operation_mode_selector()
 
@@ -167,8 +216,9 @@ class App(tk.Tk):
         self.author_label = tk.Label(self.right_frame, text="Author Name")
         self.author_label.pack(pady=10)
 
-        self.author_combo = ttk.Combobox(self.right_frame, values=self.authors)
+        self.author_combo = ttk.Combobox(self.right_frame, values=self.author_filter.search(''))
         self.author_combo.pack(pady=5)
+        self.bind_type_ahead(self.author_combo, self.author_filter)
         self.author_combo.focus()
 
         self.author_entry = tk.Entry(self.right_frame)
@@ -194,8 +244,9 @@ class App(tk.Tk):
         self.character_name_label = tk.Label(self.right_frame, text="Character Name")
         self.character_name_label.pack(pady=10)
 
-        self.character_name_combo = ttk.Combobox(self.right_frame, values=self.character_names)
+        self.character_name_combo = ttk.Combobox(self.right_frame, values=self.character_filter.search(''))
         self.character_name_combo.pack(pady=5)
+        self.bind_type_ahead(self.character_name_combo, self.character_filter)
         self.character_name_combo.focus()
 
         self.character_name_entry = tk.Entry(self.right_frame)
@@ -267,6 +318,16 @@ class App(tk.Tk):
         self.context_menu.add_command(label="Rename Images", command=self.context_rename_images)
         self.context_menu.add_command(label="Rename Images by Folder Name", command=self.context_rename_images_by_folder_name)
         self.context_menu.add_command(label="Rename Images by Character Name", command=self.context_rename_images_by_character_name)
+        self.context_menu.add_command(label="Rename Images by Mask...", command=self.context_rename_images_by_mask)
+        self.context_menu.add_command(label="Apply Plan File...", command=self.context_apply_plan_file)
+        self.context_menu.add_command(label="Job Queue...", command=self.show_job_queue)
+        self.context_menu.add_separator()
+        self.recursive_mode = tk.BooleanVar(value=False)
+        self.context_menu.add_checkbutton(label="Include Subfolders", variable=self.recursive_mode)
+        self.streaming_mode = tk.BooleanVar(value=False)
+        self.context_menu.add_checkbutton(label="Low-Memory Streaming (huge folders)", variable=self.streaming_mode)
+        self.preview_mode = tk.BooleanVar(value=False)
+        self.context_menu.add_checkbutton(label="Preview Before Applying", variable=self.preview_mode)
 
     def create_status_bar(self):
         """Create the status bar at the bottom of the application."""
@@ -316,7 +377,7 @@ class App(tk.Tk):
             logging.error("Failed to create image_label.")
 
     def create_operation_mode_selector(self):
-        """Create operation mode selector (Rename, Copy, Move)."""
+        """Create operation mode selector (Rename, Copy, Move, Hardlink, Clone)."""
         self.operation_frame = tk.Frame(self.right_frame)
         self.operation_frame.pack(pady=10)
 
@@ -338,12 +399,27 @@ class App(tk.Tk):
         )
         self.move_radio.pack(side=tk.LEFT)
 
+        self.hardlink_radio = tk.Radiobutton(
+            self.operation_frame, text="Hardlink", variable=self.operation_mode, value="Hardlink"
+        )
+        self.hardlink_radio.pack(side=tk.LEFT)
+
+        self.clone_radio = tk.Radiobutton(
+            self.operation_frame, text="Clone", variable=self.operation_mode, value="Clone"
+        )
+        self.clone_radio.pack(side=tk.LEFT)
+
     def create_undo_button(self):
         """Create the Undo button and place it in the status bar."""
         self.undo_button = tk.Button(self.status_frame, text="Undo", command=self.undo_last_action)
         self.undo_button.pack(side=tk.RIGHT, padx=5)
         self.update_undo_button_state()  # Set initial state
 
+    def add_undo_entry(self, operation_mode, operations):
+        """Push a finished job onto the undo stack; safe from any thread."""
+        self.progress_queue.put(("undo", (operation_mode, operations)))
+        self.request_ui_update()
+
     def update_undo_button_state(self):
         """Enable or disable the Undo button based on the undo stack."""
         if self.undo_stack:
@@ -358,49 +434,27 @@ class App(tk.Tk):
             action_type, name = last_action
             if action_type == 'author':
                 self.authors.append(name)
-                self.authors = sorted(self.authors)
-                self.author_combo['values'] = self.authors
-                self.data['authors'] = self.authors
-                save_data(self.DATA_FILE, self.data)
+                self.author_filter.add(name)
+                self.filter_combo(self.author_combo, self.author_filter)
+                self.data_store.add('authors', name)
                 logging.info(f"Restored author: {name}")
                 messagebox.showinfo("Undo Successful", f"Author '{name}' has been restored.")
             elif action_type == 'character':
                 self.character_names.append(name)
-                self.character_names = sorted(self.character_names)
-                self.character_name_combo['values'] = self.character_names
-                self.data['character_names'] = self.character_names
-                save_data(self.DATA_FILE, self.data)
+                self.character_filter.add(name)
+                self.filter_combo(self.character_name_combo, self.character_filter)
+                self.data_store.add('character_names', name)
                 logging.info(f"Restored character name: {name}")
                 messagebox.showinfo("Undo Successful", f"Character '{name}' has been restored.")
         else:
             messagebox.showinfo("Nothing to Undo", "There is no deletion to undo.")
 
     def undo_last_action(self):
-        """Undo the last renaming, copying, or moving operation."""
+        """Undo the last renaming, copying, moving, linking, or cloning operation."""
         if self.undo_stack:
             last_operation = self.undo_stack.pop()
             operation_mode, operations = last_operation
-            errors = []
-
-            for new_file, original_file in reversed(operations):
-                try:
-                    if operation_mode == "Rename":
-                        if original_file and os.path.exists(new_file):
-                            os.rename(new_file, original_file)
-                            logging.info(f"Reverted '{new_file}' to '{original_file}'")
-                    elif operation_mode == "Copy":
-                        if os.path.exists(new_file):
-                            os.remove(new_file)
-                            logging.info(f"Removed copied file '{new_file}'")
-                    elif operation_mode == "Move":
-                        if original_file and os.path.exists(new_file):
-                            shutil.move(new_file, original_file)
-                            logging.info(f"Moved '{new_file}' back to '{original_file}'")
-                    else:
-                        logging.error(f"Unknown operation mode: {operation_mode}")
-                except Exception as e:
-                    errors.append(f"Error undoing '{new_file}': {e}")
-                    logging.error(f"Error undoing '{new_file}': {e}")
+            errors = undo_operations(operation_mode, operations)
 
             if errors:
                 messagebox.showerror("Undo Errors", "\n".join(errors), parent=self)
@@ -410,6 +464,60 @@ class App(tk.Tk):
         else:
             messagebox.showinfo("No Action to Undo", "There is no action to undo.", parent=self)
 
+    def recover_interrupted_jobs(self, journals):
+        """Ask the user whether to finish or roll back each interrupted job, and queue the choice."""
+        for journal in journals:
+            how = "was cancelled" if journal.cancelled else "was interrupted"
+            response = messagebox.askyesnocancel(
+                "Interrupted Job",
+                f"A {journal.operation_mode.lower()} job on '{journal.folder_path}' {how} "
+                f"after {len(journal)} file(s).\n\n"
+                "Yes: finish the remaining files\n"
+                "No: roll back the files already processed\n"
+                "Cancel: decide later",
+                parent=self
+            )
+            if response is None:
+                logging.info(f"Left interrupted job {journal.job_id} for later.")
+                continue
+            # Resuming or rolling back can take as long as the job itself, so it is queued like one
+            action = "Finish" if response else "Roll back"
+            run = self.run_resume_interrupted_job if response else self.run_roll_back_interrupted_job
+            self.submit_job(
+                f"{action} interrupted {journal.operation_mode.lower()}: {journal.folder_path}",
+                journal.folder_path, journal.destination_folder, run, journal
+            )
+
+    def run_resume_interrupted_job(self, journal, control=None, progress_callback=None):
+        """Resume an interrupted job from its last checkpoint in a separate thread."""
+        progress_callback = progress_callback or self.update_progress
+        try:
+            errors = replay_interrupted_job(journal, progress_callback, self.max_workers, control)
+            if journal.finished:
+                self.add_undo_entry(journal.operation_mode, journal)
+                logging.info(f"Finished interrupted job {journal.job_id}.")
+            if errors:
+                progress_callback("error", "\n".join(errors))
+            else:
+                progress_callback("done")
+        except Exception as e:
+            logging.error(f"Error resuming interrupted job {journal.job_id}: {e}")
+            progress_callback("error", f"An error occurred: {e}")
+
+    def run_roll_back_interrupted_job(self, journal, control=None, progress_callback=None):
+        """Roll back the files an interrupted job already processed, in a separate thread."""
+        progress_callback = progress_callback or self.update_progress
+        try:
+            errors = roll_back_interrupted_job(journal)
+            logging.info(f"Rolled back interrupted job {journal.job_id}.")
+            if errors:
+                progress_callback("error", "\n".join(errors))
+            else:
+                progress_callback("done")
+        except Exception as e:
+            logging.error(f"Error rolling back interrupted job {journal.job_id}: {e}")
+            progress_callback("error", f"An error occurred: {e}")
+
     def on_tree_select(self, event):
         """Handle the event when a tree item is selected."""
         try:
@@ -535,8 +643,8 @@ class App(tk.Tk):
         # Create a queue to hold log records
         self.log_queue = queue.Queue()
 
-        # Create a handler that writes to the queue
-        queue_handler = QueueHandler(self.log_queue)
+        # Create a handler that writes to the queue and asks the main thread for a frame
+        queue_handler = TextQueueHandler(self.log_queue, self.request_ui_update)
         queue_handler.setLevel(logging.DEBUG)
         root_logger = logging.getLogger()
         root_logger.addHandler(queue_handler)
@@ -544,16 +652,16 @@ class App(tk.Tk):
         # Create a formatter for log messages in the GUI
         self.gui_log_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
 
-        # Initialize the polling flag
-        self.polling = True    
-        # Start polling the queue
-        self.poll_log_queue()
+        self.request_ui_update()  # Show what was logged during startup
 
     def append_log_message(self, msg):
-        """Append a log message to the log text widget."""
+        """Append one or more log lines to the log text widget, keeping the last MAX_LOG_LINES."""
         try:
             self.log_text.configure(state='normal')
             self.log_text.insert(tk.END, msg + '\n')
+            excess = int(self.log_text.index('end-1c').split('.')[0]) - MAX_LOG_LINES
+            if excess > 0:
+                self.log_text.delete('1.0', f'{excess + 1}.0')
             self.log_text.configure(state='disabled')
             # Auto-scroll to the end
             self.log_text.yview(tk.END)
@@ -564,25 +672,77 @@ class App(tk.Tk):
         """Format the log record for display."""
         return self.gui_log_formatter.format(record)
 
-    def poll_log_queue(self):
-        """Check for new log messages in the queue and display them."""
-        if self.polling:
-            while not self.log_queue.empty():
-                record = self.log_queue.get()
-                msg = self.gui_log_formatter.format(record)
-                self.append_log_message(msg)
-            # Store the after ID
-            self.after_id = self.after(100, self.poll_log_queue)
+    def flush_log_queue(self):
+        """Show the queued log records, inserted into the log window in one batch."""
+        lines = []
+        while True:
+            try:
+                record = self.log_queue.get_nowait()
+            except queue.Empty:
+                break
+            lines.append(self.gui_log_formatter.format(record))
+        if lines:
+            self.append_log_message("\n".join(lines[-MAX_LOG_LINES:]))
+
+    def request_ui_update(self):
+        """
+        Ask the main thread to draw a frame of progress and logs; safe from any thread.
+
+        Only a flag is set, under a lock and without touching Tk, so a worker never
+        waits for the main thread. Workers reporting every file cost one redraw per frame.
+        """
+        with self.ui_lock:
+            self.ui_update_requested = True
+
+    def poll_ui_updates(self):
+        """Draw a frame if one was requested since the last; runs every UI_FRAME_MS on the main thread."""
+        if not self.polling:
+            return
+        with self.ui_lock:
+            requested, self.ui_update_requested = self.ui_update_requested, False
+        try:
+            if requested:
+                self.process_progress_queue()
+                self.flush_log_queue()
+        finally:
+            self.after(UI_FRAME_MS, self.poll_ui_updates)
+
+    def bind_type_ahead(self, combo, name_filter):
+        """
+        Filter a combobox's dropdown to the names matching what is typed in it.
+
+        The filter runs once typing pauses for TYPE_AHEAD_DELAY_MS, so a fast typist
+        does not pay for a search per key.
+        """
+        pending = {}
+
+        def on_key(event):
+            if event.keysym in ("Up", "Down", "Return", "Escape", "Tab"):
+                return  # Moving through or picking from the dropdown
+            if pending.get("after_id"):
+                self.after_cancel(pending["after_id"])
+            pending["after_id"] = self.after(TYPE_AHEAD_DELAY_MS, run_filter)
+
+        def run_filter():
+            pending["after_id"] = None
+            if combo.winfo_exists():
+                self.filter_combo(combo, name_filter)
+
+        combo.bind("<KeyRelease>", on_key, add="+")
+
+    def filter_combo(self, combo, name_filter):
+        """Show the names matching the combobox's text in its dropdown."""
+        combo['values'] = name_filter.search(combo.get())
 
     def add_author(self):
         """Add a new author to the list."""
         author_name = self.author_entry.get().strip()
-        if author_name and author_name not in self.authors:
-            success = add_author(author_name, self.DATA_FILE)
+        if author_name and author_name not in self.author_filter:
+            success = self.data_store.add('authors', author_name)
             if success:
                 self.authors.append(author_name)
-                self.authors = sorted(self.authors)
-                self.author_combo['values'] = self.authors
+                self.author_filter.add(author_name)
+                self.filter_combo(self.author_combo, self.author_filter)
                 logging.info(f"Added author: {author_name}")
                 messagebox.showinfo("Author Added", f"Author '{author_name}' has been added.")
             else:
@@ -594,12 +754,12 @@ class App(tk.Tk):
     def add_character_name(self):
         """Add a new character name to the list."""
         character_name = self.character_name_entry.get().strip()
-        if character_name and character_name not in self.character_names:
-            success = add_character_name(character_name, self.DATA_FILE)
+        if character_name and character_name not in self.character_filter:
+            success = self.data_store.add('character_names', character_name)
             if success:
                 self.character_names.append(character_name)
-                self.character_names = sorted(self.character_names)
-                self.character_name_combo['values'] = self.character_names
+                self.character_filter.add(character_name)
+                self.filter_combo(self.character_name_combo, self.character_filter)
                 logging.info(f"Added character name: {character_name}")
                 messagebox.showinfo("Character Added", f"Character '{character_name}' has been added.")
             else:
@@ -611,14 +771,14 @@ class App(tk.Tk):
     def delete_author(self):
         """Delete the selected author from the list."""
         author_name = self.author_combo.get().strip()
-        if author_name and author_name in self.authors:
-            success = delete_author(author_name, self.DATA_FILE)
+        if author_name and author_name in self.author_filter:
+            success = self.data_store.remove('authors', author_name)
             if success:
                 self.undo_stack.append(('author', author_name))
                 self.authors.remove(author_name)
-                self.authors = sorted(self.authors)
-                self.author_combo['values'] = self.authors
+                self.author_filter.remove(author_name)
                 self.author_combo.set('')
+                self.filter_combo(self.author_combo, self.author_filter)
                 logging.info(f"Deleted author: {author_name}")
                 messagebox.showinfo("Author Deleted", f"Author '{author_name}' has been deleted.")
             else:
@@ -630,14 +790,14 @@ class App(tk.Tk):
     def delete_character_name(self):
         """Delete the selected character name from the list."""
         character_name = self.character_name_combo.get().strip()
-        if character_name and character_name in self.character_names:
-            success = delete_character_name(character_name, self.DATA_FILE)
+        if character_name and character_name in self.character_filter:
+            success = self.data_store.remove('character_names', character_name)
             if success:
                 self.undo_stack.append(('character', character_name))
                 self.character_names.remove(character_name)
-                self.character_names = sorted(self.character_names)
-                self.character_name_combo['values'] = self.character_names
+                self.character_filter.remove(character_name)
                 self.character_name_combo.set('')
+                self.filter_combo(self.character_name_combo, self.character_filter)
                 logging.info(f"Deleted character name: {character_name}")
                 messagebox.showinfo("Character Name Deleted", f"Character '{character_name}' has been deleted.")
             else:
@@ -654,7 +814,7 @@ class App(tk.Tk):
         """
         author_name = self.author_combo.get()
         if author_name:
-            if author_name not in self.authors:
+            if author_name not in self.author_filter:
                 # Prompt the user to confirm adding the new author
                 response = messagebox.askyesno(
                     "Add Author",
@@ -662,9 +822,9 @@ class App(tk.Tk):
                 )
                 if response:
                     self.authors.append(author_name)
-                    self.author_combo['values'] = self.authors
-                    self.data['authors'] = self.authors
-                    save_data(self.DATA_FILE, self.data)
+                    self.author_filter.add(author_name)
+                    self.filter_combo(self.author_combo, self.author_filter)
+                    self.data_store.add('authors', author_name)
                     logging.info(f"Added new author: {author_name}")
                     self.save_last_author(author_name)
                 else:
@@ -692,12 +852,12 @@ class App(tk.Tk):
         try:
             author_name = self.config['DEFAULT'].get('LastAuthor', '').strip()
             if author_name:
-                if author_name not in self.authors:
+                if author_name not in self.author_filter:
                     self.authors.append(author_name)
-                    self.author_combo['values'] = self.authors
-                    self.data['authors'] = self.authors
-                    save_data(self.DATA_FILE, self.data)
+                    self.author_filter.add(author_name)
+                    self.data_store.add('authors', author_name)
                 self.author_combo.set(author_name)
+                self.filter_combo(self.author_combo, self.author_filter)
                 logging.info(f"Loaded last author from config: {author_name}")
         except Exception as e:
             logging.error(f"Error loading last author from config: {e}")
@@ -746,36 +906,75 @@ class App(tk.Tk):
                 except (PermissionError, FileNotFoundError, OSError) as e:
                     logging.error(f"Error accessing {abspath}: {e}")
 
-    def prompt_author_name_and_rename(self, folder_path, by_folder_name=False):
+    def prompt_author_name_and_rename(self, folder_paths, by_folder_name=False):
         """
-        Prompt for author name and perform renaming or copying/moving.
+        Prompt for author name and queue a renaming or copying/moving job per folder.
+
+        The author is chosen per folder, since a word from the folder name differs
+        from one folder to the next.
         """
-        folder_name = os.path.basename(folder_path)
         preselected_author = self.get_author_name()
 
-        # Ask user to choose how to set the author
-        chosen_author = prompt_author_choice(folder_name, preselected_author)
-        if not chosen_author:
-            return  # User canceled the operation
+        # Ask user to choose how to set the author of each folder
+        chosen_authors = []
+        for folder_path in folder_paths:
+            chosen_author = prompt_author_choice(os.path.basename(folder_path), preselected_author)
+            if not chosen_author:
+                return  # User canceled the operation
+            chosen_authors.append(chosen_author)
 
         operation_mode = self.operation_mode.get()
-        destination_folder = None
-
-        if operation_mode in ["Copy", "Move"]:
-            destination_folder = filedialog.askdirectory(title="Select Destination Folder", parent=self)
-            if not destination_folder:
-                messagebox.showwarning("No Destination", "Operation canceled. No destination folder selected.", parent=self)
-                return
-
-        # Start the file renaming process in a separate thread
-        thread = threading.Thread(
-            target=self.run_rename_images_by_folder_name if by_folder_name else self.run_rename_images,
-            args=(folder_path, chosen_author, operation_mode, destination_folder)
-        )
-        thread.start()
+        destination_folder = self.ask_destination_folder(operation_mode)
+        if destination_folder is False:
+            return
 
+        action = "Rename by folder name" if by_folder_name else "Rename"
+        for folder_path, chosen_author in zip(folder_paths, chosen_authors):
+            self.submit_job(
+                f"{action} ({operation_mode}): {folder_path}", folder_path, destination_folder,
+                self.run_rename_images_by_folder_name if by_folder_name else self.run_rename_images,
+                folder_path, chosen_author, operation_mode, destination_folder,
+                self.recursive_mode.get(), self.streaming_mode.get(), self.preview_mode.get()
+            )
+
+    def ask_destination_folder(self, operation_mode):
+        """Ask for the destination folder of a destination mode; returns None for Rename and False if canceled."""
+        if operation_mode not in DESTINATION_MODES:
+            return None
+        destination_folder = filedialog.askdirectory(title="Select Destination Folder", parent=self)
+        if not destination_folder:
+            messagebox.showwarning("No Destination Selected", "Operation canceled. No destination folder selected.", parent=self)
+            return False
+        return destination_folder
 
-    def run_rename_images(self, folder_path, author_name, operation_mode, destination_folder):
+    def submit_job(self, description, folder_path, destination_folder, run, *args):
+        """
+        Queue a job on the shared job queue.
+
+        Args:
+            description (str): What the job does, shown in the job queue.
+            folder_path (str): The folder the job works on.
+            destination_folder (str): The destination folder, if any; its device counts too.
+            run (callable): One of the run_* methods; called with `args` plus the job's
+                `control` and `progress_callback` keywords.
+        """
+        def target(control, progress_callback):
+            run(*args, control=control, progress_callback=progress_callback)
+
+        self.job_queue.submit(description, folder_path, target, folder_devices(folder_path, destination_folder))
+        if self.job_queue_window is not None:
+            self.refresh_job_queue()
+
+    def selected_folders(self, action_name):
+        """Return the selected directories, warning if there are none."""
+        folders = [self.tree.set(item, "abspath") for item in self.tree.selection()]
+        folders = [folder for folder in folders if os.path.isdir(folder)]
+        if not folders:
+            messagebox.showwarning("No Selection", f"Please select one or more directories to {action_name}.")
+            logging.warning(f"{action_name} invoked without any directory selected.")
+        return folders
+
+    def run_rename_images(self, folder_path, author_name, operation_mode, destination_folder, recursive=False, streaming=False, dry_run=False, control=None, progress_callback=None):
         """Run the rename_images operation in a separate thread."""
         rename_images(
             folder_path,
@@ -784,10 +983,15 @@ class App(tk.Tk):
             self,
             operation_mode,
             destination_folder,
-            progress_callback=self.update_progress
+            progress_callback=progress_callback or self.update_progress,
+            max_workers=self.max_workers,
+            recursive=recursive,
+            streaming=streaming,
+            dry_run=dry_run,
+            control=control
         )
 
-    def run_rename_images_by_folder_name(self, folder_path, author_name, operation_mode, destination_folder):
+    def run_rename_images_by_folder_name(self, folder_path, author_name, operation_mode, destination_folder, recursive=False, streaming=False, dry_run=False, control=None, progress_callback=None):
         """Run the rename_images_by_folder_name operation in a separate thread."""
         rename_images_by_folder_name(
             folder_path,
@@ -796,30 +1000,248 @@ class App(tk.Tk):
             self,
             operation_mode,
             destination_folder,
-            progress_callback=self.update_progress
+            progress_callback=progress_callback or self.update_progress,
+            max_workers=self.max_workers,
+            recursive=recursive,
+            streaming=streaming,
+            dry_run=dry_run,
+            control=control
         )
 
-    def run_rename_images_by_character_name(self, folder_path, author_name, operation_mode, destination_folder):
+    def run_rename_images_by_character_name(self, folder_path, author_name, operation_mode, destination_folder, recursive=False, streaming=False, dry_run=False, control=None, progress_callback=None):
         """Run the rename_images_by_character_name operation in a separate thread."""
         rename_images_by_character_name(
             folder_path,
             author_name,
             self.status_label,
-            self.character_names,
+            list(self.character_names),  # The UI thread may add or delete names during the job
             self,
             operation_mode,
             destination_folder,
-            progress_callback=self.update_progress
+            progress_callback=progress_callback or self.update_progress,
+            max_workers=self.max_workers,
+            recursive=recursive,
+            streaming=streaming,
+            dry_run=dry_run,
+            control=control,
+            character_aliases=self.data_store.aliases('character_names')
+        )
+
+    def review_unmatched_files(self, review_queue):
+        """
+        Let the user assign character names to the files a job could not match, in one batch.
+
+        Assigned files are processed as a second pass in a separate thread; the rest are
+        left untouched.
+        """
+        entries = list(review_queue.entries)
+        assignments = {}
+
+        dialog = tk.Toplevel(self)
+        dialog.title("Review Unmatched Files")
+        dialog.transient(self)
+
+        tk.Label(
+            dialog,
+            text=f"{len(entries)} file(s) matched no character name.\n"
+                 "Select files, choose or type a character name, and click Assign,\n"
+                 "or click Accept Suggestions to give them the name suggested after '?'."
+        ).pack(padx=10, pady=5)
+
+        list_frame = tk.Frame(dialog)
+        list_frame.pack(fill=BOTH, expand=True, padx=10)
+        scrollbar = ttk.Scrollbar(list_frame, orient=VERTICAL)
+        listbox = tk.Listbox(list_frame, selectmode=EXTENDED, width=80, height=20, yscrollcommand=scrollbar.set)
+        scrollbar.config(command=listbox.yview)
+        scrollbar.pack(side=RIGHT, fill=Y)
+        listbox.pack(side=LEFT, fill=BOTH, expand=True)
+
+        def entry_label(entry):
+            folder, filename = entry
+            label = os.path.relpath(os.path.join(folder, filename), review_queue.folder_path)
+            if entry in assignments:
+                label += f"  ->  {assignments[entry]}"
+            elif entry in review_queue.suggestions:
+                label += f"  ?  {review_queue.suggestions[entry][0]}"
+            return label
+
+        listbox.insert(END, *(entry_label(entry) for entry in entries))
+
+        name_combo = ttk.Combobox(dialog, values=self.character_filter.search(''))
+        name_combo.pack(fill=X, padx=10, pady=5)
+        self.bind_type_ahead(name_combo, self.character_filter)
+
+        def on_select(event):
+            # Offer the names suggested for the first selected file at the top of the list,
+            # or its filename if there are none, like the old per-file prompt
+            selection = listbox.curselection()
+            if not selection:
+                return
+            entry = entries[selection[0]]
+            suggestions = review_queue.suggestions.get(entry, [])
+            if suggestions:
+                others = [name for name in self.character_filter.search(name_combo.get()) if name not in suggestions]
+                name_combo['values'] = suggestions + others
+            if not name_combo.get():
+                name_combo.set(suggestions[0] if suggestions else os.path.splitext(entry[1])[0].strip())
+
+        listbox.bind("<<ListboxSelect>>", on_select)
+
+        def assign(character_name):
+            for position in listbox.curselection():
+                entry = entries[position]
+                if character_name:
+                    assignments[entry] = character_name
+                else:
+                    assignments.pop(entry, None)
+                listbox.delete(position)
+                listbox.insert(position, entry_label(entry))
+                listbox.selection_set(position)
+
+        def accept_suggestions():
+            # The selected files, or every file if none is selected, get their best suggestion
+            selection = listbox.curselection()
+            positions = selection or range(len(entries))
+            accepted = 0
+            for position in positions:
+                entry = entries[position]
+                suggestions = review_queue.suggestions.get(entry)
+                if suggestions and entry not in assignments:
+                    assignments[entry] = suggestions[0]
+                    listbox.delete(position)
+                    listbox.insert(position, entry_label(entry))
+                    if selection:
+                        listbox.selection_set(position)
+                    accepted += 1
+            logging.info(f"Accepted the suggested character name for {accepted} file(s).")
+
+        def apply():
+            dialog.destroy()
+            if not assignments:
+                logging.info(f"No character names assigned; left {len(entries)} file(s) unchanged.")
+                return
+
+            new_names = sorted(name for name in set(assignments.values()) if name not in self.character_filter)
+            if new_names:
+                self.character_names.extend(new_names)
+                for name in new_names:
+                    self.character_filter.add(name)
+                self.filter_combo(self.character_name_combo, self.character_filter)
+                self.data_store.add_many('character_names', new_names)  # One write for the whole batch
+                logging.info(f"Added new character names: {', '.join(new_names)}")
+
+            self.submit_job(
+                f"Review pass: {len(assignments)} file(s) in {review_queue.folder_path}",
+                review_queue.folder_path, review_queue.destination_folder,
+                self.run_rename_reviewed_files, review_queue, assignments, self.preview_mode.get()
+            )
+
+        button_frame = tk.Frame(dialog)
+        button_frame.pack(pady=10)
+        tk.Button(button_frame, text="Assign", command=lambda: assign(name_combo.get().strip())).pack(side=LEFT, padx=5)
+        tk.Button(button_frame, text="Clear", command=lambda: assign(None)).pack(side=LEFT, padx=5)
+        tk.Button(button_frame, text="Accept Suggestions", command=accept_suggestions).pack(side=LEFT, padx=5)
+        tk.Button(button_frame, text="Select All", command=lambda: listbox.selection_set(0, END)).pack(side=LEFT, padx=5)
+        tk.Button(button_frame, text="Rename Assigned", command=apply).pack(side=LEFT, padx=5)
+        tk.Button(button_frame, text="Skip All", command=dialog.destroy).pack(side=LEFT, padx=5)
+
+    def run_rename_reviewed_files(self, review_queue, assignments, dry_run=False, control=None, progress_callback=None):
+        """Run the second pass over reviewed files in a separate thread."""
+        rename_reviewed_files(
+            review_queue,
+            assignments,
+            self,
+            progress_callback=progress_callback or self.update_progress,
+            max_workers=self.max_workers,
+            dry_run=dry_run,
+            control=control
         )
 
+    def show_plan_preview(self, plan):
+        """
+        Show a dry-run plan as an old name -> new name table and let the user apply it.
+
+        The table is virtualized, so previews of 100k files open and scroll instantly.
+        Applying runs the computed plan as is, without planning the job again.
+        """
+        self.take_processed()
+        self.progress['value'] = 0
+        if not plan:
+            self.status_label.config(text="Nothing to apply.")
+            messagebox.showinfo("Preview", "No files would be changed.", parent=self)
+            if plan.review_queue:
+                self.review_unmatched_files(plan.review_queue)
+            return
+        self.status_label.config(text=f"Previewing {len(plan)} planned change(s).")
+
+        dialog = tk.Toplevel(self)
+        dialog.title(f"Preview: {plan.operation_mode} {len(plan)} file(s)")
+        dialog.transient(self)
+
+        target_root = plan.destination_folder or plan.folder_path
+
+        def format_row(entry):
+            old_file, new_file = entry
+            return os.path.relpath(old_file, plan.folder_path), os.path.relpath(new_file, target_root)
+
+        table = VirtualTable(dialog, [("Current Name", 350), ("New Name", 350)], plan, format_row)
+        table.pack(fill=BOTH, expand=True, padx=10, pady=10)
+
+        def apply():
+            dialog.destroy()
+            self.submit_job(
+                f"Apply plan: {plan.operation_mode} {len(plan)} file(s) in {plan.folder_path}",
+                plan.folder_path, plan.destination_folder, self.run_apply_plan, plan
+            )
+
+        def export():
+            path = filedialog.asksaveasfilename(
+                title="Export Plan", defaultextension=".jsonl",
+                filetypes=[("AutoName plans", "*.jsonl"), ("All files", "*.*")], parent=dialog
+            )
+            if not path:
+                return
+            try:
+                save_plan(plan, path)
+                logging.info(f"Exported plan of {len(plan)} file(s) to '{path}'")
+            except OSError as e:
+                logging.error(f"Error exporting plan to '{path}': {e}")
+                messagebox.showerror("Export Failed", f"Could not export the plan: {e}", parent=dialog)
+
+        button_frame = tk.Frame(dialog)
+        button_frame.pack(pady=10)
+        tk.Button(button_frame, text="Apply", command=apply).pack(side=LEFT, padx=5)
+        tk.Button(button_frame, text="Export Plan...", command=export).pack(side=LEFT, padx=5)
+        tk.Button(button_frame, text="Cancel", command=dialog.destroy).pack(side=LEFT, padx=5)
+
+    def run_apply_plan(self, plan, control=None, progress_callback=None):
+        """Apply a previewed plan in a separate thread."""
+        progress_callback = progress_callback or self.update_progress
+        try:
+            operations = apply_plan(plan, progress_callback, self.max_workers, control)
+            if operations:
+                self.add_undo_entry(plan.operation_mode, operations)
+            progress_callback("done")
+            if plan.review_queue:
+                progress_callback("review", plan.review_queue)
+        except Exception as e:
+            logging.error(f"Error applying the {plan.operation_mode.lower()} plan: {e}")
+            progress_callback("error", f"An error occurred: {e}")
+
     def update_progress(self, status, data=None):
         """Callback function to update progress."""
         if status == "start":
             total = data
             self.progress_queue.put(("start", total))
+        elif status == "total":
+            # Recursive jobs grow their total as each subfolder listing arrives
+            self.progress_queue.put(("total", data))
         elif status == "update":
-            increment = data
-            self.progress_queue.put(("update", increment))
+            # Added to a shared counter; the status bar reads it once per frame
+            with self.ui_lock:
+                self.pending_processed += data
+            self.request_ui_update()
+            return
         elif status == "skipped":
             skipped_message = data
             self.progress_queue.put(("skipped", skipped_message))
@@ -828,69 +1250,222 @@ class App(tk.Tk):
         elif status == "error":
             error_message = data
             self.progress_queue.put(("error", error_message))
+        elif status == "review":
+            # Unmatched files are resolved on the main thread once the job is done
+            self.progress_queue.put(("review", data))
+        elif status == "plan":
+            # A dry run's plan is previewed on the main thread
+            self.progress_queue.put(("plan", data))
+        elif status == "profile":
+            # Time per phase; shown in the status bar when the job is done
+            self.progress_queue.put(("profile", data))
+        self.request_ui_update()
 
     def show_context_menu(self, event):
         """Show the context menu on right-click."""
         item = self.tree.identify_row(event.y)
         if item:
-            self.tree.selection_set(item)
+            if item not in self.tree.selection():
+                self.tree.selection_set(item)  # Right-clicking inside a selection keeps all of it
             self.context_menu.post(event.x_root, event.y_root)
 
-    def context_rename_images(self):
-        """Context menu action to rename images."""
-        selected_items = self.tree.selection()
-        
-        if not selected_items:
-            messagebox.showwarning("No Selection", "Please select a directory to rename images.")
-            logging.warning("Rename Images action invoked without any selection.")
+    def show_job_queue(self):
+        """Show the queued and running jobs, with controls to pause, cancel and reorder them."""
+        if self.job_queue_window is not None:
+            self.job_queue_window.lift()
             return
-        
-        item = selected_items[0]
-        abspath = self.tree.set(item, "abspath")
-        
-        if os.path.isdir(abspath):
-            logging.info(f"Initiating rename operation on directory: {abspath}")
-            self.prompt_author_name_and_rename(abspath)
-        else:
-            messagebox.showwarning("Invalid Selection", "Selected item is not a directory.")
-            logging.warning(f"Rename Images action invoked on a non-directory item: {abspath}")
 
-    def context_rename_images_by_folder_name(self):
-        """Context menu action to rename images by folder name."""
-        selected_items = self.tree.selection()
-        if not selected_items:
-            messagebox.showwarning("No Selection", "Please select a directory to rename images by folder name.")
-            logging.warning("Rename Images by Folder Name action invoked without any selection.")
+        dialog = tk.Toplevel(self)
+        dialog.title("Job Queue")
+        dialog.transient(self)
+        self.job_queue_window = dialog
+
+        columns = [("job", "Job", 320), ("state", "State", 80), ("progress", "Progress", 100), ("priority", "Priority", 60)]
+        self.job_queue_tree = ttk.Treeview(dialog, columns=[column for column, _, _ in columns], show="headings", height=12)
+        for column, heading, width in columns:
+            self.job_queue_tree.heading(column, text=heading)
+            self.job_queue_tree.column(column, width=width, stretch=column == "job")
+        self.job_queue_tree.pack(fill=BOTH, expand=True, padx=10, pady=10)
+
+        def selected_jobs():
+            return [int(item) for item in self.job_queue_tree.selection()]
+
+        def act(action):
+            for job_id in selected_jobs():
+                action(job_id)
+            self.refresh_job_queue()
+
+        def move(step):
+            jobs = {job.job_id: job for job in self.job_queue.jobs()}
+            act(lambda job_id: self.job_queue.set_priority(job_id, jobs[job_id].priority + step))
+
+        button_frame = tk.Frame(dialog)
+        button_frame.pack(pady=(0, 10))
+        tk.Button(button_frame, text="Pause", command=lambda: act(self.job_queue.pause)).pack(side=LEFT, padx=3)
+        tk.Button(button_frame, text="Resume", command=lambda: act(self.job_queue.resume)).pack(side=LEFT, padx=3)
+        tk.Button(button_frame, text="Cancel Job", command=lambda: act(self.job_queue.cancel)).pack(side=LEFT, padx=3)
+        tk.Button(button_frame, text="Up", command=lambda: move(1)).pack(side=LEFT, padx=3)
+        tk.Button(button_frame, text="Down", command=lambda: move(-1)).pack(side=LEFT, padx=3)
+        tk.Button(button_frame, text="Clear Finished",
+                  command=lambda: (self.job_queue.clear_finished(), self.refresh_job_queue())).pack(side=LEFT, padx=3)
+
+        def close():
+            dialog.after_cancel(self.job_queue_after_id)
+            self.job_queue_window = None
+            dialog.destroy()
+
+        dialog.protocol("WM_DELETE_WINDOW", close)
+        self.refresh_job_queue()
+
+    def refresh_job_queue(self):
+        """Redraw the job queue window; repeats every half second while it is open."""
+        dialog = self.job_queue_window
+        if dialog is None:
             return
+        if self.job_queue_after_id:
+            dialog.after_cancel(self.job_queue_after_id)
+
+        tree = self.job_queue_tree
+        jobs = self.job_queue.jobs()
+        current = {str(job.job_id) for job in jobs}
+        for item in tree.get_children():
+            if item not in current:
+                tree.delete(item)
+        for job in jobs:
+            progress = f"{job.processed}/{job.total}" if job.started else ""
+            values = (job.description, job.state, progress, job.priority)
+            if tree.exists(str(job.job_id)):
+                tree.item(str(job.job_id), values=values)
+            else:
+                tree.insert("", END, iid=str(job.job_id), values=values)
+
+        self.job_queue_after_id = dialog.after(500, self.refresh_job_queue)
+
+    def context_rename_images(self):
+        """Context menu action to rename images in every selected folder."""
+        folders = self.selected_folders("rename images")
+        if folders:
+            logging.info(f"Initiating rename operation on {len(folders)} folder(s)")
+            self.prompt_author_name_and_rename(folders)
+
+    def context_rename_images_by_folder_name(self):
+        """Context menu action to rename images by folder name in every selected folder."""
+        folders = self.selected_folders("rename images by folder name")
+        if folders:
+            logging.info(f"Initiating rename by folder name on {len(folders)} folder(s)")
+            self.prompt_author_name_and_rename(folders, by_folder_name=True)
 
     def context_rename_images_by_character_name(self):
-        """Context menu action to rename images by character names."""
+        """Context menu action to rename images by character names in every selected folder."""
+        folders = self.selected_folders("rename images by character names")
+        if not folders:
+            return
+        author_name = self.get_author_name()
+        if not author_name:
+            return
+        operation_mode = self.operation_mode.get()
+        destination_folder = self.ask_destination_folder(operation_mode)
+        if destination_folder is False:
+            return
+
+        for folder_path in folders:
+            self.submit_job(
+                f"Rename by character name ({operation_mode}): {folder_path}", folder_path, destination_folder,
+                self.run_rename_images_by_character_name,
+                folder_path, author_name, operation_mode, destination_folder,
+                self.recursive_mode.get(), self.streaming_mode.get(), self.preview_mode.get()
+            )
+
+    def context_rename_images_by_mask(self):
+        """Context menu action to rename images following a user-defined rename mask in every selected folder."""
+        folders = self.selected_folders("rename images by mask")
+        if not folders:
+            return
+
+        mask = simpledialog.askstring(
+            "Rename Mask",
+            "Enter a rename mask.\n"
+            "Fields: [char] [author] [folder] [name] [num] [date] [date:%Y-%m] [width] [height]\n"
+            "Text in { } is left out when a field inside it is empty.",
+            initialvalue=self.config['DEFAULT'].get('RenameMask', DEFAULT_RENAME_MASK),
+            parent=self
+        )
+        if not mask:
+            return
+        try:
+            compile_mask(mask)
+        except MaskError as e:
+            messagebox.showerror("Invalid Mask", str(e), parent=self)
+            return
+        self.save_rename_mask(mask)
+
+        author_name = self.author_combo.get().strip()
+        operation_mode = self.operation_mode.get()
+        destination_folder = self.ask_destination_folder(operation_mode)
+        if destination_folder is False:
+            return
+
+        for folder_path in folders:
+            self.submit_job(
+                f"Rename by mask ({operation_mode}): {folder_path}", folder_path, destination_folder,
+                self.run_rename_images_by_mask,
+                folder_path, mask, author_name, operation_mode, destination_folder,
+                self.recursive_mode.get(), self.streaming_mode.get(), self.preview_mode.get()
+            )
+
+    def run_rename_images_by_mask(self, folder_path, mask, author_name, operation_mode, destination_folder, recursive=False, streaming=False, dry_run=False, control=None, progress_callback=None):
+        """Run the rename_images_by_mask operation in a separate thread."""
+        rename_images_by_mask(
+            folder_path,
+            mask,
+            author_name,
+            self.status_label,
+            list(self.character_names),
+            self,
+            operation_mode,
+            destination_folder,
+            progress_callback=progress_callback or self.update_progress,
+            max_workers=self.max_workers,
+            recursive=recursive,
+            streaming=streaming,
+            dry_run=dry_run,
+            control=control,
+            character_aliases=self.data_store.aliases('character_names')
+        )
+
+    def context_apply_plan_file(self):
+        """Context menu action to preview and apply an exported plan file to the selected folder."""
+        path = filedialog.askopenfilename(
+            title="Open Plan File", filetypes=[("AutoName plans", "*.jsonl"), ("All files", "*.*")], parent=self
+        )
+        if not path:
+            return
+
+        # Apply to the selected folder, e.g. a copy of the tree the plan was made for
+        folder_path = None
         selected_items = self.tree.selection()
-        if not selected_items:
-            messagebox.showwarning("No Selection", "Please select a directory to rename images by character names.")
-            logging.warning("Rename Images by Character Name action invoked without any selection.")
+        if selected_items:
+            abspath = self.tree.set(selected_items[0], "abspath")
+            if os.path.isdir(abspath):
+                folder_path = abspath
+
+        try:
+            plan = load_plan(path, folder_path)
+        except (OSError, ValueError, KeyError) as e:
+            logging.error(f"Error loading plan file '{path}': {e}")
+            messagebox.showerror("Invalid Plan", f"Could not load the plan: {e}", parent=self)
             return
+        logging.info(f"Loaded plan of {len(plan)} file(s) from '{path}'")
+        self.show_plan_preview(plan)
 
-        item = selected_items[0]
-        abspath = self.tree.set(item, "abspath")
-        if os.path.isdir(abspath):
-            author_name = self.get_author_name()
-            if author_name:
-                operation_mode = self.operation_mode.get()
-                destination_folder = None
-
-                if operation_mode in ["Copy", "Move"]:
-                    destination_folder = filedialog.askdirectory(title="Select Destination Folder", parent=self)
-                    if not destination_folder:
-                        messagebox.showwarning("No Destination Selected", "Operation canceled. No destination folder selected.", parent=self)
-                        return
-
-                # Start file operation in a new thread
-                thread = threading.Thread(target=self.run_rename_images_by_character_name, args=(abspath, author_name, operation_mode, destination_folder))
-                thread.start()
-        else:
-            messagebox.showwarning("Invalid Selection", "Selected item is not a directory.")
-            logging.warning(f"Rename Images by Character Name action invoked on a non-directory item: {abspath}")
+    def save_rename_mask(self, mask):
+        """Save the last used rename mask to the config file."""
+        try:
+            self.config['DEFAULT']['RenameMask'] = mask.replace('%', '%%')  # Keep date formats out of interpolation
+            with open(CONFIG_FILE, 'w') as configfile:
+                self.config.write(configfile)
+        except Exception as e:
+            logging.error(f"Error saving rename mask to config: {e}")
 
     def load_path(self):
         """Load the path entered in the path entry."""
@@ -954,13 +1529,23 @@ class App(tk.Tk):
         else:
             logging.info("No author selected upon exit. LastAuthor remains unchanged.")
 
-        # Stop the polling loop and cancel pending callbacks
+        # Stop drawing frames
         self.polling = False
-        if hasattr(self, 'after_id'):
-            self.after_cancel(self.after_id)
-            logging.info("Polling loop callback canceled.")
 
-        self.undo_stack.clear()  # Clear undo data
+        # Running jobs stop at their next safe point; what they did stays journaled and undoable.
+        # Events are still processed meanwhile, so the window stays responsive.
+        if self.job_queue_window is not None:
+            self.job_queue_window.destroy()
+            self.job_queue_window = None
+        stopping = threading.Thread(target=self.job_queue.shutdown)
+        stopping.start()
+        while stopping.is_alive():
+            self.update()
+            stopping.join(0.05)
+
+        self.data_store.flush()  # Write any author or character changes still pending
+
+        self.undo_stack.clear()  # Clear in-memory undo data; job journals stay on disk for the next start
 
         logging.info("Application is closing.")
         self.destroy()
@@ -1008,40 +1593,74 @@ class App(tk.Tk):
             self.tree.item(parent, open=True)
             self.open_parent_nodes(parent)
 
+    def take_processed(self):
+        """Move the files processed since the last frame from the shared counter to the progress bar."""
+        with self.ui_lock:
+            processed, self.pending_processed = self.pending_processed, 0
+        if processed:
+            self.progress['value'] += processed
+        return processed
+
+    def progress_text(self):
+        """Describe the running job's progress, with its throughput and time left."""
+        done, total = int(self.progress['value']), int(self.progress['maximum'])
+        text = f"Processing... ({done}/{total})"
+        elapsed = time.monotonic() - self.job_started_at
+        if done and elapsed > 0:
+            rate = done / elapsed
+            text += f", {rate:.0f} files/s"
+            if total > done:
+                remaining = int((total - done) / rate)
+                text += f", about {remaining // 60}:{remaining % 60:02d} left"
+        return text
+
     def process_progress_queue(self):
-        """Process progress updates from the queue."""
-        try:
-            while True:
+        """Handle the notifications queued since the last frame, then show the progress."""
+        while True:
+            try:
                 message = self.progress_queue.get_nowait()
-                if message[0] == "start":
-                    total = message[1]
-                    self.progress['maximum'] = total
-                    self.progress['value'] = 0
-                    self.progress.start(10)  # Start indeterminate progress
-                    self.status_label.config(text="Operation started...")
-                elif message[0] == "update":
-                    increment = message[1]
-                    self.progress['value'] += increment
-                    self.status_label.config(text=f"Processing... ({self.progress['value']}/{self.progress['maximum']})")
-                elif message[0] == "skipped":
-                    skipped_message = message[1]
-                    messagebox.showinfo("Skipped Files", skipped_message)
-                    logging.info(skipped_message)
-                elif message[0] == "done":
-                    self.progress.stop()
-                    self.progress['value'] = 0
+            except queue.Empty:
+                break
+            if message[0] == "start":
+                total = message[1]
+                self.take_processed()  # Belongs to the job before
+                self.progress['maximum'] = total
+                self.progress['value'] = 0
+                self.job_started_at = time.monotonic()
+                self.status_label.config(text="Operation started...")
+            elif message[0] == "total":
+                self.progress['maximum'] += message[1]
+            elif message[0] == "skipped":
+                skipped_message = message[1]
+                messagebox.showinfo("Skipped Files", skipped_message)
+                logging.info(skipped_message)
+            elif message[0] == "done":
+                self.take_processed()
+                self.progress['value'] = 0
+                if self.last_profile:
+                    self.status_label.config(text=f"Operation completed. {self.last_profile}")
+                    self.last_profile = None
+                else:
                     self.status_label.config(text="Operation completed.")
-                    messagebox.showinfo("Success", "Operation completed successfully.")
-                elif message[0] == "error":
-                    error_message = message[1]
-                    self.progress.stop()
-                    self.progress['value'] = 0
-                    self.status_label.config(text="Operation encountered errors.")
-                    messagebox.showerror("Error", error_message)
-        except queue.Empty:
-            pass
-        finally:
-            self.after(100, self.process_progress_queue)
+                messagebox.showinfo("Success", "Operation completed successfully.")
+            elif message[0] == "error":
+                error_message = message[1]
+                self.take_processed()
+                self.progress['value'] = 0
+                self.status_label.config(text="Operation encountered errors.")
+                messagebox.showerror("Error", error_message)
+            elif message[0] == "review":
+                self.review_unmatched_files(message[1])
+            elif message[0] == "plan":
+                self.show_plan_preview(message[1])
+            elif message[0] == "profile":
+                self.last_profile = message[1]
+            elif message[0] == "undo":
+                self.undo_stack.append(message[1])
+                self.update_undo_button_state()
+
+        if self.take_processed():
+            self.status_label.config(text=self.progress_text())
 
     def collapse_all_children(self, node):
         """Recursively collapse all children of a node."""
@@ -1049,15 +1668,18 @@ class App(tk.Tk):
             self.tree.item(child, open=False)
             self.collapse_all_children(child)
 
-class QueueHandler(logging.Handler):
-    """Custom logging handler that uses a queue."""
+class TextQueueHandler(logging.Handler):
+    """Custom logging handler that queues records for the log text widget."""
 
-    def __init__(self, log_queue):
+    def __init__(self, log_queue, wakeup=None):
         super().__init__()
         self.log_queue = log_queue
+        self.wakeup = wakeup
 
     def emit(self, record):
         self.log_queue.put(record)
+        if self.wakeup:
+            self.wakeup()
 
 if __name__ == "__main__":
     app = App()
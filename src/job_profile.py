@@ -0,0 +1,188 @@
+# job_profile.py
+
+import os
+import json
+import time
+import logging
+import threading
+from contextlib import contextmanager, nullcontext
+
+# Set directory paths at the top of the file so they are accessible globally
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROFILE_DIR = os.path.join(BASE_DIR, "logs", "profiles")
+
+# Set from config.ini (ProfileJobs, TraceJobs) or the CLI's --profile and --trace
+PROFILE_JOBS = False  # Run each job under cProfile and save the stats
+TRACE_JOBS = False  # Save a Chrome trace (chrome://tracing, Perfetto) of each job
+
+# Phases in the order they are reported
+PHASES = ["listing", "matching", "collision probing", "journal", "file operations", "logging"]
+
+
+class PhaseTimer:
+    """
+    Adds up the time a job spends in each phase, across all its threads.
+
+    Phases nest: time spent in an inner phase is not counted again in the phase around
+    it, so "matching" is planning time minus the collision probing done while planning.
+    With `trace`, every phase is also recorded as a Chrome trace event on the thread
+    that ran it.
+    """
+
+    def __init__(self, trace=False):
+        self.trace = trace
+        self.totals = {}  # Phase -> [exclusive seconds, calls]
+        self.events = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._origin = time.perf_counter()
+
+    def phase(self, name):
+        """Time the enclosed `with` block as part of phase `name`."""
+        return _Phase(self, name)
+
+    def _record(self, name, start, elapsed, exclusive):
+        with self._lock:
+            total = self.totals.get(name)
+            if total is None:
+                total = self.totals[name] = [0.0, 0]
+            total[0] += exclusive
+            total[1] += 1
+            if self.trace:
+                self.events.append({
+                    "name": name, "ph": "X", "pid": os.getpid(), "tid": threading.get_ident(),
+                    "ts": (start - self._origin) * 1e6, "dur": elapsed * 1e6,
+                })
+
+    def timed(self, name, function):
+        """Wrap a function so every call to it is timed as phase `name`."""
+        def wrapper(*args, **kwargs):
+            with self.phase(name):
+                return function(*args, **kwargs)
+        return wrapper
+
+    def timed_iter(self, name, iterable):
+        """Yield from an iterable, timing each step as phase `name` but not the consumer's work."""
+        iterator = iter(iterable)
+        while True:
+            with self.phase(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def summary(self):
+        """Return the phase totals as one line, e.g. "listing 0.12s, matching 0.40s"."""
+        names = [name for name in PHASES if name in self.totals]
+        names += sorted(name for name in self.totals if name not in PHASES)
+        return ", ".join(f"{name} {self.totals[name][0]:.2f}s" for name in names)
+
+    def write_trace(self, path):
+        """Save the recorded events in the Chrome trace event format."""
+        thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid, "args": {"name": thread_names.get(tid, str(tid))}}
+            for tid in {event["tid"] for event in self.events}
+        ]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": metadata + self.events, "displayTimeUnit": "ms"}, f)
+
+
+class _Phase:
+    """One timed block of a PhaseTimer; a plain class because it runs once per file."""
+
+    __slots__ = ("timer", "name", "start", "stack")
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        local = self.timer._local
+        stack = getattr(local, "stack", None)
+        if stack is None:
+            stack = local.stack = []
+        stack.append(0.0)  # Time spent in nested phases
+        self.stack = stack
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.start
+        nested = self.stack.pop()
+        if self.stack:
+            self.stack[-1] += elapsed
+        self.timer._record(self.name, self.start, elapsed, elapsed - nested)
+        return False
+
+
+class _NullTimer:
+    """Stands in for a PhaseTimer where a caller did not ask for timing."""
+
+    def phase(self, name):
+        return _NULL_PHASE
+
+    def timed(self, name, function):
+        return function
+
+    def timed_iter(self, name, iterable):
+        return iterable
+
+
+_NULL_PHASE = nullcontext()
+NULL_TIMER = _NullTimer()
+
+_profiler_lock = threading.Lock()  # Held by the one job being profiled
+
+
+def _profile_path(job_name, extension):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return os.path.join(PROFILE_DIR, f"{stamp}-{job_name}-{os.urandom(2).hex()}{extension}")
+
+
+@contextmanager
+def profiled_job(job_name):
+    """
+    Time a job's phases and, when switched on, profile and trace it.
+
+    Yields the job's PhaseTimer. When the job ends its phase summary is logged; with
+    PROFILE_JOBS the job's thread runs under cProfile and the stats are saved to
+    logs/profiles as a .prof file (open with `python -m pstats` or snakeviz); with
+    TRACE_JOBS a Chrome trace covering the worker threads is saved next to it.
+
+    Only one profiler can be active at a time (on Python 3.12+ a second one raises),
+    so while a job is being profiled, jobs running next to it are only timed.
+
+    Args:
+        job_name (str): Short name used in the log and the output file names.
+    """
+    timer = PhaseTimer(trace=TRACE_JOBS)
+    profiler = None
+    if PROFILE_JOBS:
+        if _profiler_lock.acquire(blocking=False):
+            import cProfile  # Only loaded when profiling is switched on
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError as e:  # Another profiling tool is active
+                logging.info(f"Not profiling {job_name}: {e}")
+                profiler = None
+                _profiler_lock.release()
+        else:
+            logging.info(f"Not profiling {job_name}: another job is being profiled.")
+    try:
+        yield timer
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            _profiler_lock.release()
+            path = _profile_path(job_name, ".prof")
+            profiler.dump_stats(path)
+            logging.info(f"Saved profile of {job_name} to '{path}'")
+        if TRACE_JOBS:
+            path = _profile_path(job_name, ".trace.json")
+            timer.write_trace(path)
+            logging.info(f"Saved trace of {job_name} to '{path}'")
+        if timer.totals:
+            logging.info(f"Time per phase for {job_name}: {timer.summary()}")
@@ -0,0 +1,273 @@
+# job_queue.py
+
+import os
+import logging
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+MAX_RUNNING_JOBS = 2  # Jobs running at once across all devices
+MAX_JOBS_PER_DEVICE = 1  # Jobs touching the same device at once
+
+QUEUED, RUNNING, PAUSED, CANCELLED, DONE, FAILED = "Queued", "Running", "Paused", "Cancelled", "Done", "Failed"
+
+
+class JobControl:
+    """
+    Lets a running job be paused and cancelled from another thread.
+
+    Jobs call `should_stop()` at safe points, between folders and between chunks of
+    files whose results are already journaled. The call blocks while the job is paused
+    and returns True once it has been cancelled, so the job can wind down cleanly and
+    keep everything it has done undoable.
+    """
+
+    def __init__(self):
+        self.cancelled = False
+        self._running = threading.Event()
+        self._running.set()
+
+    def pause(self):
+        self._running.clear()
+
+    def resume(self):
+        self._running.set()
+
+    @property
+    def paused(self):
+        return not self._running.is_set()
+
+    def cancel(self):
+        self.cancelled = True
+        self._running.set()  # A paused job has to wake up to stop
+
+    def should_stop(self):
+        """Wait while paused; return True if the job should stop."""
+        self._running.wait()
+        return self.cancelled
+
+
+class Job:
+    """
+    A queued job and its progress.
+
+    Attributes:
+        job_id (int): Order of submission, also the tie-breaker between equal priorities.
+        description (str): What the job does, for display.
+        folder_path (str): The folder the job works on.
+        devices (set): `st_dev` of every folder the job reads or writes.
+        priority (int): Higher runs first.
+        state (str): Queued, Running, Paused, Cancelled, Done or Failed.
+        total (int): Files the job has found so far.
+        processed (int): Files the job has processed so far.
+        started (bool): Whether the job has been handed to a worker.
+    """
+
+    def __init__(self, job_id, description, folder_path, devices, target, priority=0):
+        self.job_id = job_id
+        self.description = description
+        self.folder_path = folder_path
+        self.devices = devices
+        self.target = target
+        self.priority = priority
+        self.state = QUEUED
+        self.total = 0
+        self.processed = 0
+        self.started = False
+        self.control = JobControl()
+
+
+def folder_devices(*folders):
+    """Return the `st_dev` of each existing folder given."""
+    devices = set()
+    for folder in folders:
+        if not folder:
+            continue
+        try:
+            devices.add(os.stat(folder).st_dev)
+        except OSError:
+            pass
+    return devices
+
+
+class JobQueue:
+    """
+    Runs queued jobs on a shared worker pool, highest priority first.
+
+    At most `max_running` jobs run at once, and at most `per_device` of them touch the
+    same device, so several jobs on one disk do not fight over its seeks while jobs on
+    different disks run side by side. Queued and running jobs can be paused, resumed,
+    cancelled and reprioritized.
+
+    Progress of all jobs is combined into one stream for `progress_callback`: the first
+    job of a busy period sends "start", later ones "total", and a single "done" is sent
+    once the queue is idle again. Other notifications are passed through.
+    """
+
+    def __init__(self, progress_callback=None, max_running=MAX_RUNNING_JOBS, per_device=MAX_JOBS_PER_DEVICE):
+        self.progress_callback = progress_callback
+        self.max_running = max(1, max_running)
+        self.per_device = max(1, per_device)
+        self._jobs = []
+        self._ids = itertools.count(1)
+        self._lock = threading.RLock()
+        self._device_load = {}
+        self._running = 0
+        self._busy = False
+        self._pool = ThreadPoolExecutor(max_workers=self.max_running, thread_name_prefix="job")
+
+    def submit(self, description, folder_path, target, devices=None, priority=0):
+        """
+        Queue a job.
+
+        Args:
+            description (str): What the job does, for display.
+            folder_path (str): The folder the job works on.
+            target (callable): Called as target(control, progress_callback) on a worker thread.
+            devices (set): Devices the job touches; defaults to the device of `folder_path`.
+            priority (int): Higher runs first.
+
+        Returns:
+            Job: The queued job.
+        """
+        if devices is None:
+            devices = folder_devices(folder_path)
+        with self._lock:
+            job = Job(next(self._ids), description, folder_path, devices, target, priority)
+            self._jobs.append(job)
+            self._dispatch()
+        logging.info(f"Queued job {job.job_id}: {description}")
+        return job
+
+    def jobs(self):
+        """Return all jobs, in the order they were submitted."""
+        with self._lock:
+            return list(self._jobs)
+
+    def _find(self, job_id):
+        for job in self._jobs:
+            if job.job_id == job_id:
+                return job
+        return None
+
+    def pause(self, job_id):
+        with self._lock:
+            job = self._find(job_id)
+            if job and job.state in [QUEUED, RUNNING]:
+                job.control.pause()
+                job.state = PAUSED
+
+    def resume(self, job_id):
+        with self._lock:
+            job = self._find(job_id)
+            if job and job.state == PAUSED:
+                job.control.resume()
+                job.state = RUNNING if job.started else QUEUED
+                self._dispatch()
+
+    def cancel(self, job_id):
+        with self._lock:
+            job = self._find(job_id)
+            if not job or job.state in [CANCELLED, DONE, FAILED]:
+                return
+            job.control.cancel()
+            idle = False
+            if not job.started:
+                job.state = CANCELLED
+                idle = self._became_idle()
+            else:
+                job.state = RUNNING  # Winds down at its next safe point
+        if idle:
+            self._report_done()
+
+    def set_priority(self, job_id, priority):
+        with self._lock:
+            job = self._find(job_id)
+            if job:
+                job.priority = priority
+                self._dispatch()
+
+    def clear_finished(self):
+        """Forget jobs that are no longer queued or running."""
+        with self._lock:
+            self._jobs = [job for job in self._jobs if job.state not in [CANCELLED, DONE, FAILED]]
+
+    def shutdown(self):
+        """Cancel everything and wait for running jobs to reach a safe point."""
+        with self._lock:
+            for job in self._jobs:
+                if job.state in [QUEUED, RUNNING, PAUSED]:
+                    job.control.cancel()
+                    if not job.started:
+                        job.state = CANCELLED
+        self._pool.shutdown(wait=True)
+
+    def _dispatch(self):
+        """Start the highest-priority queued jobs that fit the running and per-device limits."""
+        waiting = sorted((job for job in self._jobs if job.state == QUEUED and not job.control.cancelled),
+                         key=lambda job: (-job.priority, job.job_id))
+        for job in waiting:
+            if self._running >= self.max_running:
+                break
+            if any(self._device_load.get(device, 0) >= self.per_device for device in job.devices):
+                continue
+            for device in job.devices:
+                self._device_load[device] = self._device_load.get(device, 0) + 1
+            self._running += 1
+            job.state = RUNNING
+            job.started = True
+            self._pool.submit(self._run, job)
+
+    def _run(self, job):
+        def progress(status, data=None):
+            self._job_progress(job, status, data)
+
+        try:
+            job.target(job.control, progress)
+            state = CANCELLED if job.control.cancelled else DONE
+        except Exception as e:
+            logging.error(f"Job {job.job_id} failed: {e}")
+            state = FAILED
+        # Only state changes happen under the lock; logging and callbacks may wait on the
+        # GUI, which may itself be waiting for the lock to list the jobs
+        with self._lock:
+            job.state = state
+            for device in job.devices:
+                self._device_load[device] -= 1
+            self._running -= 1
+            self._dispatch()
+            idle = self._became_idle()
+        logging.info(f"Job {job.job_id} {state.lower()}: {job.description}")
+        if idle:
+            self._report_done()
+
+    def _job_progress(self, job, status, data):
+        forward = self.progress_callback
+        with self._lock:
+            if status in ["start", "total"]:
+                job.total += data
+                status = "total" if self._busy else "start"
+                self._busy = True
+            elif status == "update":
+                job.processed += data
+            elif status == "done":
+                return  # Reported once for the whole queue
+        if forward:
+            if data is None:
+                forward(status)
+            else:
+                forward(status, data)
+
+    def _became_idle(self):
+        """Mark the queue idle if nothing is left to run; call with the lock held."""
+        if not self._busy:
+            return False
+        if any(job.state in [QUEUED, RUNNING] or (job.state == PAUSED and job.started) for job in self._jobs):
+            return False
+        self._busy = False
+        return True
+
+    def _report_done(self):
+        """Send the busy period's single "done"; call without the lock."""
+        if self.progress_callback:
+            self.progress_callback("done")
@@ -0,0 +1,117 @@
+# log_setup.py
+
+import queue
+import atexit
+import logging
+import configparser
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+LOG_MAX_BYTES = 5 * 1024 * 1024  # Size at which app.log is rotated
+LOG_BACKUP_COUNT = 5  # Rotated logs kept next to app.log
+
+_listener = None
+
+
+class _BatchedFlush:
+    """Mixin for file handlers that leaves flushing to the listener, once per batch of records."""
+
+    def flush(self):
+        pass  # Called after every record by StreamHandler.emit
+
+    def flush_batch(self):
+        super().flush()
+
+
+class BatchedRotatingFileHandler(_BatchedFlush, RotatingFileHandler):
+    """Rotates by size; flushed once per batch."""
+
+
+class BatchedTimedRotatingFileHandler(_BatchedFlush, TimedRotatingFileHandler):
+    """Rotates at a time interval, e.g. every midnight; flushed once per batch."""
+
+
+class BatchingQueueListener(QueueListener):
+    """
+    Writes queued records on its own thread and flushes the log files only when the
+    queue runs dry, so a burst of records costs one write to disk instead of one each.
+    """
+
+    def dequeue(self, block):
+        if block and self.queue.empty():
+            for handler in self.handlers:
+                flush_batch = getattr(handler, "flush_batch", None)
+                if flush_batch:
+                    flush_batch()
+        return self.queue.get(block)
+
+
+def read_logging_options(config_file):
+    """
+    Read the logging options from config.ini.
+
+    Returns:
+        dict: verbose, max_bytes, backup_count and rotate_when, for `setup_logging`.
+    """
+    config = configparser.ConfigParser()
+    config.read(config_file)
+    section = config['DEFAULT']
+    return {
+        "verbose": section.getboolean('VerboseLogging', False),
+        "max_bytes": section.getint('LogMaxBytes', LOG_MAX_BYTES),
+        "backup_count": section.getint('LogBackupCount', LOG_BACKUP_COUNT),
+        "rotate_when": section.get('LogRotateWhen', '').strip() or None,
+    }
+
+
+def setup_logging(log_file, verbose=False, max_bytes=LOG_MAX_BYTES, backup_count=LOG_BACKUP_COUNT, rotate_when=None):
+    """
+    Send log records to a rotating log file through a background writer.
+
+    Threads that log only put the record on a queue; a QueueListener thread formats and
+    writes them, flushing once per batch. By default one summary line is logged per job;
+    with `verbose`, every file operation is logged as well (at DEBUG level).
+
+    Calling it again replaces the earlier setup.
+
+    Args:
+        log_file (str): The log file.
+        verbose (bool): Log every file operation, not just job summaries.
+        max_bytes (int): Rotate the log once it reaches this size (size-based rotation).
+        backup_count (int): Rotated logs to keep.
+        rotate_when (str): Rotate by time instead, e.g. "midnight" or "H"; see
+            TimedRotatingFileHandler.
+    """
+    global _listener
+    stop_logging()
+
+    if rotate_when:
+        file_handler = BatchedTimedRotatingFileHandler(log_file, when=rotate_when, backupCount=backup_count, encoding='utf-8')
+    else:
+        file_handler = BatchedRotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    root_logger = logging.getLogger()
+    root_logger.setLevel(logging.DEBUG if verbose else logging.INFO)
+    for handler in list(root_logger.handlers):
+        if isinstance(handler, QueueHandler) or isinstance(handler, logging.FileHandler):
+            root_logger.removeHandler(handler)
+            handler.close()
+
+    log_queue = queue.SimpleQueue()
+    root_logger.addHandler(QueueHandler(log_queue))
+    _listener = BatchingQueueListener(log_queue, file_handler, respect_handler_level=True)
+    _listener.start()
+
+
+def stop_logging():
+    """Write out the queued records and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(stop_logging)
@@ -2,6 +2,7 @@ import os
 import logging
 import configparser
 from gui import App
+from log_setup import setup_logging, read_logging_options
 
 # Set directory paths at the top of the file so they are accessible globally
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -20,13 +21,8 @@ AUTHOR_FILE = os.path.join(CONFIG_DIR, "authors.txt")
 DATA_FILE = os.path.join(DATA_DIR, "data.json")
 LOG_FILE = os.path.join(LOGS_DIR, "app.log")
 
-# Configure logging
-logging.basicConfig(
-    filename=LOG_FILE,
-    filemode='a',
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    level=logging.DEBUG
-)
+# Configure logging: a background writer to a rotating log file
+setup_logging(LOG_FILE, **read_logging_options(CONFIG_FILE))
 
 logging.info("Logging is set up.")
 
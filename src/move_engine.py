@@ -0,0 +1,170 @@
+# move_engine.py
+
+import os
+import errno
+import shutil
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+COPY_CHUNK_SIZE = 8 * 1024 * 1024
+MOVE_BATCH_SIZE = 256  # Files copied and synced before their sources are unlinked
+PART_SUFFIX = ".autoname-part"
+
+_FALLBACK_ERRNOS = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EBADF}
+
+
+def is_same_device(source_folder, destination_folder):
+    """
+    Check whether two folders live on the same device, so a move can be a plain rename.
+
+    Args:
+        source_folder (str): The folder files are moved from.
+        destination_folder (str): The folder files are moved to.
+
+    Returns:
+        bool: True if both folders share `st_dev`.
+    """
+    try:
+        return os.stat(source_folder).st_dev == os.stat(destination_folder).st_dev
+    except OSError:
+        return False
+
+
+def stream_copy(old_file, new_file):
+    """
+    Copy a file's contents in the kernel and flush them to disk.
+
+    Uses `copy_file_range`, then `sendfile`, then a buffered copy, depending on what
+    the platform and filesystems support. The new file must not exist yet.
+    """
+    with open(old_file, 'rb') as src, open(new_file, 'xb') as dst:
+        src_fd, dst_fd = src.fileno(), dst.fileno()
+        size = os.fstat(src_fd).st_size
+        copied = 0
+
+        if hasattr(os, "copy_file_range"):
+            try:
+                while copied < size:
+                    sent = os.copy_file_range(src_fd, dst_fd, min(COPY_CHUNK_SIZE, size - copied))
+                    if sent == 0:
+                        break
+                    copied += sent
+            except OSError as e:
+                if e.errno not in _FALLBACK_ERRNOS or copied:
+                    raise
+
+        if copied == 0 and hasattr(os, "sendfile"):
+            try:
+                while copied < size:
+                    sent = os.sendfile(dst_fd, src_fd, copied, min(COPY_CHUNK_SIZE, size - copied))
+                    if sent == 0:
+                        break
+                    copied += sent
+            except OSError as e:
+                if e.errno not in _FALLBACK_ERRNOS or copied:
+                    raise
+
+        if copied < size:
+            src.seek(copied)
+            dst.seek(copied)
+            shutil.copyfileobj(src, dst, COPY_CHUNK_SIZE)
+
+        dst.flush()
+        os.fsync(dst_fd)
+    shutil.copystat(old_file, new_file)
+
+
+def fsync_directory(folder_path):
+    """Flush a folder's entries to disk (a no-op where directories cannot be opened)."""
+    try:
+        fd = os.open(folder_path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _copy_into_place(old_file, new_file):
+    """Stream a file to a temporary name next to its target, then rename it into place."""
+    if os.path.lexists(new_file):
+        raise FileExistsError(f"'{new_file}' already exists")
+    part_file = new_file + PART_SUFFIX
+    try:
+        stream_copy(old_file, part_file)
+        os.rename(part_file, new_file)
+    except BaseException:
+        if os.path.lexists(part_file):
+            os.remove(part_file)
+        raise
+
+
+def move_across_devices(old_file, new_file):
+    """Move a single file to another device without ever having zero durable copies."""
+    _copy_into_place(old_file, new_file)
+    fsync_directory(os.path.dirname(new_file))
+    os.remove(old_file)
+
+
+def execute_cross_device_moves(planned, progress_callback=None, max_workers=1, batch_size=MOVE_BATCH_SIZE):
+    """
+    Move files to another device in durable batches.
+
+    Each batch is streamed to the destination (concurrently when `max_workers` is above 1),
+    every destination folder of the batch is fsynced once, and only then are the batch's
+    sources unlinked. A crash at any point leaves every file in at least one place.
+
+    Args:
+        planned (list): (old_file, new_file) pairs in planned order.
+        progress_callback (callable): Receives "update" and "error" notifications.
+        max_workers (int): Maximum number of concurrent copies.
+        batch_size (int): Number of files to copy before syncing and unlinking.
+
+    Returns:
+        list: Undo entries of the successful moves, in planned order. A file whose
+            source could not be removed was only copied; its entry is (new_file, None).
+    """
+    def copy_entry(entry):
+        old_file, new_file = entry
+        try:
+            _copy_into_place(old_file, new_file)
+            return True
+        except Exception as e:
+            logging.error(f"Error during move '{old_file}' to '{new_file}': {e}")
+            if progress_callback:
+                progress_callback("error", f"Error renaming '{os.path.basename(old_file)}': {e}")
+            return False
+
+    operations = []
+    pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="move") if max_workers > 1 else None
+    try:
+        for batch_start in range(0, len(planned), batch_size):
+            batch = planned[batch_start:batch_start + batch_size]
+            copied = list(pool.map(copy_entry, batch)) if pool else [copy_entry(entry) for entry in batch]
+
+            # One directory sync per batch makes every copied name durable before any source goes away
+            for folder in {os.path.dirname(new_file) for (_, new_file), ok in zip(batch, copied) if ok}:
+                fsync_directory(folder)
+
+            for (old_file, new_file), ok in zip(batch, copied):
+                if not ok:
+                    continue
+                try:
+                    os.remove(old_file)
+                except Exception as e:
+                    logging.error(f"Copied '{old_file}' to '{new_file}' but could not remove the source: {e}")
+                    if progress_callback:
+                        progress_callback("error", f"Error removing '{os.path.basename(old_file)}' after copying: {e}")
+                    operations.append((new_file, None))  # Only a copy was made; undo removes it
+                    continue
+                logging.debug(f"Moved '{old_file}' to '{new_file}'")
+                operations.append((new_file, old_file))
+                if progress_callback:
+                    progress_callback("update", 1)
+    finally:
+        if pool:
+            pool.shutdown()
+    return operations
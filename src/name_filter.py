@@ -0,0 +1,123 @@
+# name_filter.py
+
+import re
+from bisect import bisect_left, insort
+from name_keys import match_key
+
+MAX_RESULTS = 200  # Matches shown in a dropdown at once
+
+_WORD_START = re.compile(r"(?:^|(?<=[\s\-_.,&/()]))\S")
+_END = "\U0010ffff"
+
+
+class NameFilter:
+    """
+    Type-ahead index over a list of names, matching what has been typed against the
+    start of the name or the start of any word in it, ignoring case and Unicode
+    normalization (see name_keys.match_key).
+
+    The folded names are kept in one sorted array and every later word start of every
+    name in another, which works like a flattened trie: the names matching a typed
+    prefix are one contiguous run of each array, found with two binary searches. A
+    search reads at most `limit` matches of each run, so it costs O(log n + limit)
+    however common the text is, and adding or removing a name only touches its own
+    keys, so a 100k-name list stays responsive.
+    """
+
+    def __init__(self, names=()):
+        self._keys = []   # Sorted (folded suffix from a later word start, name id)
+        self._names = {}  # Name id -> name
+        self._folded = {}  # Name id -> folded name
+        self._ids = {}    # Name -> name id
+        self._next_id = 0
+        entries = []
+        for name in dict.fromkeys(names):
+            name_id = self._register(name)
+            entries.extend((key, name_id) for key in self._word_keys(name))
+        self._keys = sorted(entries)
+        self._order = sorted((folded, name) for name, folded in zip(self._names.values(), self._folded.values()))
+
+    def _register(self, name):
+        name_id = self._next_id
+        self._next_id += 1
+        self._names[name_id] = name
+        self._folded[name_id] = match_key(name)
+        self._ids[name] = name_id
+        return name_id
+
+    @staticmethod
+    def _word_keys(name):
+        """The folded suffixes starting at the second and later words of a name."""
+        folded = match_key(name)
+        return {folded[match.start():] for match in _WORD_START.finditer(folded) if match.start()}
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, name):
+        return name in self._ids
+
+    def add(self, name):
+        """Add a name; returns False if it is already there."""
+        if name in self._ids:
+            return False
+        name_id = self._register(name)
+        for key in self._word_keys(name):
+            insort(self._keys, (key, name_id))
+        insort(self._order, (self._folded[name_id], name))
+        return True
+
+    def remove(self, name):
+        """Remove a name; returns False if it was not there."""
+        name_id = self._ids.pop(name, None)
+        if name_id is None:
+            return False
+        del self._names[name_id]
+        folded = self._folded.pop(name_id)
+        for key in self._word_keys(name):
+            position = bisect_left(self._keys, (key, name_id))
+            if position < len(self._keys) and self._keys[position] == (key, name_id):
+                del self._keys[position]
+        del self._order[bisect_left(self._order, (folded, name))]
+        return True
+
+    def names(self, limit=None):
+        """Return every name (or the first `limit`), sorted case-insensitively."""
+        return [name for _, name in self._order[:limit]]
+
+    def search(self, text, limit=MAX_RESULTS):
+        """
+        Return the names matching `text`, best first.
+
+        Names starting with the text come first, sorted case-insensitively, then names
+        with a later word starting with it, sorted by that word. Empty text returns
+        every name.
+
+        Args:
+            text (str): What the user has typed.
+            limit (int): Maximum number of names returned.
+        """
+        folded = match_key(text)
+        if not folded:
+            return self.names(limit)
+
+        order = self._order
+        start = bisect_left(order, (folded,))
+        end = min(bisect_left(order, (folded + _END,), start), start + limit)
+        matches = [name for _, name in order[start:end]]  # Match at the start of the name
+        if len(matches) >= limit:
+            return matches
+
+        seen = set(matches)
+        keys, names = self._keys, self._names
+        position = bisect_left(keys, (folded,))
+        while position < len(keys) and len(matches) < limit:
+            key, name_id = keys[position]
+            if not key.startswith(folded):
+                break
+            name = names[name_id]
+            if name not in seen:
+                seen.add(name)
+                matches.append(name)
+            position += 1
+        return matches
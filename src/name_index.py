@@ -0,0 +1,152 @@
+# name_index.py
+
+import os
+from collections import OrderedDict
+
+
+class NameIndex:
+    """
+    In-memory index of the filenames taken in a target folder.
+
+    The folder is listed once when the index is created. Name clashes are then settled
+    in memory: for each (prefix, suffix) pattern the index remembers the next counter
+    worth trying, so numbering the N-th file of a character costs O(1) instead of N
+    `os.path.exists` calls. The filesystem is only checked once to confirm the final name.
+    """
+
+    def __init__(self, folder_path):
+        """
+        List the target folder and record the names already taken.
+
+        Args:
+            folder_path (str): The folder the new files will be written to.
+        """
+        self.folder_path = folder_path
+        try:
+            self._taken = {os.path.normcase(name) for name in os.listdir(folder_path)}
+        except FileNotFoundError:
+            self._taken = set()
+        self._counters = {}  # (prefix, suffix) -> lowest counter that may still be free
+        self._slots = {}     # Numbered name -> (pattern key, counter) it belongs to
+
+    def __contains__(self, name):
+        return os.path.normcase(name) in self._taken
+
+    def claim(self, name):
+        """Mark a name as taken."""
+        self._taken.add(os.path.normcase(name))
+
+    def release(self, name):
+        """
+        Mark a name as free again, e.g. after the file holding it was renamed away.
+
+        If the name belongs to a counter pattern seen earlier, the pattern rewinds to it so
+        the freed slot is reused, just like counting up from 1 again would.
+        """
+        key = os.path.normcase(name)
+        self._taken.discard(key)
+        slot = self._slots.pop(key, None)
+        if slot:
+            pattern, counter = slot
+            if counter < self._counters.get(pattern, counter + 1):
+                self._counters[pattern] = counter
+
+    def _next_name(self, first_name, prefix, suffix, start):
+        if first_name is not None and os.path.normcase(first_name) not in self._taken:
+            return first_name
+
+        pattern = (os.path.normcase(prefix), os.path.normcase(suffix))
+        counter = self._counters.get(pattern, start)
+        while True:
+            name = f"{prefix}{counter}{suffix}"
+            key = os.path.normcase(name)
+            self._slots.setdefault(key, (pattern, counter))
+            if key not in self._taken:
+                self._counters[pattern] = counter + 1
+                return name
+            counter += 1
+
+    def allocate(self, prefix, suffix, first_name=None, start=1, confirm=True):
+        """
+        Reserve the first free name in a numbered sequence and return its full path.
+
+        Tries `first_name` (if given), then `f"{prefix}{counter}{suffix}"` for
+        counter = start, start + 1, ... The chosen name is claimed and, with `confirm`,
+        checked once against the filesystem in case the folder changed since it was listed.
+
+        Args:
+            prefix (str): Text before the counter.
+            suffix (str): Text after the counter, usually the extension.
+            first_name (str): Optional name to use before any numbered name.
+            start (int): First counter value.
+            confirm (bool): Check the chosen name on disk. Planners that run the
+                operations later pass False and leave the check to the executor.
+
+        Returns:
+            str: The full path of the reserved name in the target folder.
+        """
+        while True:
+            name = self._next_name(first_name, prefix, suffix, start)
+            self.claim(name)
+            new_file = os.path.join(self.folder_path, name)
+            if not confirm or not os.path.lexists(new_file):
+                return new_file
+
+
+class ProbingNameIndex:
+    """
+    Bounded-memory counterpart of NameIndex for streaming jobs.
+
+    The folder is not listed up front; candidate names are checked on disk instead.
+    Only the names claimed by the chunk being planned and a bounded cache of counters
+    are kept in memory, so memory use does not grow with the size of the folder.
+    """
+
+    def __init__(self, folder_path, max_patterns=4096):
+        """
+        Args:
+            folder_path (str): The folder the new files will be written to.
+            max_patterns (int): Maximum number of counter patterns to remember.
+        """
+        self.folder_path = folder_path
+        self.max_patterns = max_patterns
+        self._pending = set()  # Names claimed but not yet written to disk
+        self._counters = OrderedDict()
+
+    def __contains__(self, name):
+        return (os.path.normcase(name) in self._pending
+                or os.path.lexists(os.path.join(self.folder_path, name)))
+
+    def claim(self, name):
+        """Mark a name as taken until the current chunk has been executed."""
+        self._pending.add(os.path.normcase(name))
+
+    def release(self, name):
+        """Forget a pending claim; names on disk stay taken until they are gone."""
+        self._pending.discard(os.path.normcase(name))
+
+    def flush(self):
+        """Forget all pending claims once their operations have run."""
+        self._pending.clear()
+
+    def allocate(self, prefix, suffix, first_name=None, start=1, confirm=True):
+        """
+        Reserve the first free name in a numbered sequence and return its full path.
+
+        Same contract as NameIndex.allocate; names are always checked on disk.
+        """
+        if first_name is not None and first_name not in self:
+            self.claim(first_name)
+            return os.path.join(self.folder_path, first_name)
+
+        pattern = (os.path.normcase(prefix), os.path.normcase(suffix))
+        counter = self._counters.pop(pattern, start)
+        while f"{prefix}{counter}{suffix}" in self:
+            counter += 1
+        name = f"{prefix}{counter}{suffix}"
+        self.claim(name)
+
+        self._counters[pattern] = counter + 1
+        if len(self._counters) > self.max_patterns:
+            self._counters.popitem(last=False)
+        return os.path.join(self.folder_path, name)
@@ -0,0 +1,85 @@
+# name_keys.py
+
+import unicodedata
+
+
+def fold_text(text):
+    """
+    Fold text into the form names are matched in: NFKC-normalized and case-folded.
+
+    NFKC composes decomposed (NFD) accents, as macOS writes them into filenames, and
+    maps compatibility forms such as fullwidth letters to their plain equivalents, so
+    "Zoe\\u0308", "Zoë" and "ＺＯË" all fold to "zoë". ASCII text only needs lowering.
+    """
+    if text.isascii():
+        return text.lower()
+    return unicodedata.normalize("NFKC", unicodedata.normalize("NFKC", text).casefold())
+
+
+def match_key(name):
+    """The key a name is compared and deduplicated by: its folded form, trimmed."""
+    return fold_text(name.strip())
+
+
+class NameEntry:
+    """
+    One registry name with its aliases and their match keys, computed once.
+
+    Attributes:
+        name (str): The canonical spelling, used in new filenames.
+        key (str): match_key of the name.
+        aliases (list): Other spellings that resolve to the name.
+        alias_keys (list): match_key of each alias.
+    """
+
+    __slots__ = ("name", "key", "aliases", "alias_keys")
+
+    def __init__(self, name, key=None):
+        self.name = name
+        self.key = match_key(name) if key is None else key
+        self.aliases = []
+        self.alias_keys = []
+
+    @property
+    def keys(self):
+        """The name's key followed by its aliases' keys."""
+        return [self.key] + self.alias_keys
+
+    def __repr__(self):
+        return f"NameEntry({self.name!r}, aliases={self.aliases!r})"
+
+
+def build_entries(names, aliases=None):
+    """
+    Build the registry entries for a list of names and their aliases.
+
+    Names whose keys are equal (e.g. "Aerith" and "AERITH", or an NFD and an NFC
+    spelling) are one entry; the first spelling wins. A name that is also listed as an
+    alias of another name becomes an alias of that name, so "Aeris" resolves to
+    "Aerith" once the alias is recorded. Aliases of names not in the list are ignored.
+
+    Args:
+        names (iterable): Canonical names.
+        aliases (dict): Alias -> canonical name.
+
+    Returns:
+        list: NameEntry objects, in the order of `names`.
+    """
+    entries = {}  # Key -> NameEntry
+    for name in names:
+        key = match_key(name)
+        if key and key not in entries:
+            entries[key] = NameEntry(name, key)
+
+    for alias, canonical in (aliases or {}).items():
+        entry = entries.get(match_key(canonical))
+        alias_key = match_key(alias)
+        if entry is None or not alias_key or alias_key == entry.key or alias_key in entry.alias_keys:
+            continue
+        other = entries.get(alias_key)
+        if other is not None and other is not entry:
+            del entries[alias_key]  # The alias replaces the separate name
+        entry.aliases.append(alias)
+        entry.alias_keys.append(alias_key)
+
+    return list(entries.values())
@@ -0,0 +1,168 @@
+# rename_mask.py
+
+import re
+import threading
+
+# Field names a mask may use, with their accepted aliases
+FIELDS = {
+    "char": "char",
+    "character": "char",
+    "author": "author",
+    "folder": "folder",
+    "name": "name",
+    "num": "num",
+    "counter": "num",
+    "date": "date",
+    "width": "width",
+    "height": "height",
+}
+
+DEFAULT_DATE_FORMAT = "%Y-%m-%d"
+DEFAULT_RENAME_MASK = "[char]{ by [author]} [num]"
+
+# Characters that are not allowed in filenames on at least one supported platform
+_INVALID_CHARACTERS = str.maketrans("", "", '<>:"/\\|?*')
+
+_TOKEN = re.compile(r"\[\[|\]\]|\{\{|\}\}|\[([^\[\]]*)\]|\{|\}|[^\[\]{}]+|[\[\]]")
+
+
+class MaskError(ValueError):
+    """Raised when a rename mask cannot be parsed."""
+
+
+class CompiledMask:
+    """
+    A rename mask parsed once and compiled into a Python function.
+
+    Mask syntax:
+        [field] or [field:format]  Insert a field; only `date` takes a format (strftime).
+        { ... }                    Optional section, left out if any field inside is empty.
+        [[ ]] {{ }}                Literal brackets.
+
+    Fields: char (or character), author, folder, name (the original file name without
+    its extension), num (or counter; the number that keeps names unique), date (the
+    file's modification time), width and height (image dimensions).
+
+    For example, `[char]{ & [author]} [num]` renders "Alice & Bob 3" or, without an
+    author, "Alice 3".
+
+    `render(values)` takes a dict of field values (missing or empty values count as empty)
+    and returns (text before the counter, text after the counter), or None if a field
+    outside an optional section is empty.
+    """
+
+    def __init__(self, mask):
+        """
+        Args:
+            mask (str): The mask to compile.
+
+        Raises:
+            MaskError: If the mask is malformed or uses an unknown field.
+        """
+        self.mask = mask
+        self.fields = set()
+        self.has_counter = False
+        self.render = self._compile(*self._parse(mask))
+
+    def _parse(self, mask):
+        """Split a mask into expression terms before and after the counter, and its required fields."""
+        parts = [[]]  # Expression terms before and after the counter
+        required = set()
+        section = None  # (terms, fields) while inside { ... }
+
+        for match in _TOKEN.finditer(mask):
+            token = match.group(0)
+            terms = section[0] if section is not None else parts[-1]
+
+            if token in ("[[", "]]", "{{", "}}"):
+                terms.append(repr(token[0]))
+            elif match.group(1) is not None:
+                name, _, spec = match.group(1).strip().partition(":")
+                field = FIELDS.get(name.strip().lower())
+                if field is None:
+                    raise MaskError(f"Unknown field '[{match.group(1)}]' at position {match.start()}")
+                if spec and field != "date":
+                    raise MaskError(f"Field '{name}' does not take a format")
+                self.fields.add(field)
+
+                if field == "num":
+                    if section is not None:
+                        raise MaskError("The counter cannot be inside an optional section")
+                    if self.has_counter:
+                        raise MaskError("A mask can only have one counter")
+                    self.has_counter = True
+                    parts.append([])
+                    continue
+
+                if field == "date":
+                    terms.append(f"format(date, {spec or DEFAULT_DATE_FORMAT!r})")
+                else:
+                    terms.append(f"str({field})")
+                (section[1] if section is not None else required).add(field)
+            elif token == "{":
+                if section is not None:
+                    raise MaskError(f"Nested optional section at position {match.start()}")
+                section = ([], set())
+            elif token == "}":
+                if section is None:
+                    raise MaskError(f"Unmatched '}}' at position {match.start()}")
+                terms, fields = section
+                if terms:
+                    condition = " and ".join(sorted(fields)) or "True"
+                    parts[-1].append(f"({' + '.join(terms)} if {condition} else '')")
+                section = None
+            elif token in ("[", "]"):
+                raise MaskError(f"Unmatched '{token}' at position {match.start()}")
+            else:
+                terms.append(repr(token))
+
+        if section is not None:
+            raise MaskError("Optional section is not closed")
+        return parts[0], parts[1] if len(parts) > 1 else [], required
+
+    def _compile(self, prefix_terms, suffix_terms, required):
+        """Generate the render function; field names are fixed identifiers, literals are reprs."""
+        lines = ["def render(values):"]
+        lines += [f"    {field} = values.get({field!r})" for field in sorted(self.fields - {"num"})]
+        if required:
+            lines.append(f"    if not ({' and '.join(sorted(required))}):")
+            lines.append("        return None")
+        prefix = " + ".join(prefix_terms) or "''"
+        suffix = " + ".join(suffix_terms) or "''"
+        lines.append(f"    return ({prefix}).translate(_invalid), ({suffix}).translate(_invalid)")
+
+        namespace = {"_invalid": _INVALID_CHARACTERS}
+        exec(compile("\n".join(lines), f"<rename mask {self.mask!r}>", "exec"), namespace)
+        return namespace["render"]
+
+    def render_all(self, rows):
+        """
+        Render the mask for a whole planned file list at once.
+
+        Args:
+            rows (iterable): Field value dicts, one per file.
+
+        Returns:
+            list: The result of `render` for each row, in order.
+        """
+        return list(map(self.render, rows))
+
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def compile_mask(mask):
+    """
+    Return the compiled form of a mask, compiling it only the first time it is seen.
+
+    Raises:
+        MaskError: If the mask is malformed or uses an unknown field.
+    """
+    with _cache_lock:
+        compiled = _cache.get(mask)
+    if compiled is None:
+        compiled = CompiledMask(mask)
+        with _cache_lock:
+            _cache[mask] = compiled
+    return compiled
@@ -0,0 +1,200 @@
+# rename_plan.py
+
+import os
+import json
+from undo_journal import JobJournal, run_journaled_plan
+from job_profile import profiled_job
+
+PLAN_FILE_VERSION = 1
+
+
+class StalePlanError(RuntimeError):
+    """Raised when the folders a plan was computed for have changed since."""
+
+
+class RenamePlan:
+    """
+    A fully computed job: every (old_file, new_file) pair, planned without touching the disk.
+
+    A plan is produced by a dry run, shown to the user, and then applied as is, so
+    the matching and collision resolution done for the preview are not repeated.
+
+    Attributes:
+        operation_mode (str): The operation mode (Rename, Copy, Move, Hardlink, Clone).
+        folder_path (str): The folder the job was planned for.
+        destination_folder (str): The destination folder for the destination modes.
+        entries (list): (old_file, new_file) pairs in the order they will run.
+        review_queue (ReviewQueue): Files left for the user to review once the plan is applied.
+        folder_stats (dict): Source folder -> (inode, mtime in ns) when it was listed, used
+            to check cheaply that the plan is still valid before applying it.
+        same_host (bool): Whether inodes can be compared, i.e. the plan was made on this
+            machine for the same folder.
+    """
+
+    def __init__(self, operation_mode, folder_path, destination_folder=None, entries=None):
+        self.operation_mode = operation_mode
+        self.folder_path = folder_path
+        self.destination_folder = destination_folder
+        self.entries = entries if entries is not None else []
+        self.review_queue = None
+        self.folder_stats = {}
+        self.same_host = True
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __getitem__(self, index):
+        return self.entries[index]
+
+    def extend(self, planned):
+        self.entries.extend(planned)
+
+    def record_folder(self, folder):
+        """Remember a source folder's inode and mtime as it was when planned."""
+        stat = os.stat(folder)
+        self.folder_stats[folder] = (stat.st_ino, stat.st_mtime_ns)
+
+    def check_sources(self):
+        """
+        Check with one `stat` per folder that no source folder changed since it was planned.
+
+        Raises:
+            StalePlanError: If a folder is gone, was replaced, or had entries added,
+                removed or renamed.
+        """
+        changed = []
+        for folder, (inode, mtime_ns) in self.folder_stats.items():
+            try:
+                stat = os.stat(folder)
+            except OSError:
+                changed.append(folder)
+                continue
+            if stat.st_mtime_ns != mtime_ns or (self.same_host and stat.st_ino != inode):
+                changed.append(folder)
+        if changed:
+            raise StalePlanError(
+                "These folders changed since the plan was made; plan them again:\n" + "\n".join(changed)
+            )
+
+
+def save_plan(plan, path):
+    """
+    Export a plan to a JSON Lines file that can be applied later, here or on another machine.
+
+    The first line is a header with the job settings and the inode and mtime of every
+    source folder; each further line is one [old, new] pair, with paths relative to the
+    source and target folders so the plan can be applied to a copy of the tree elsewhere.
+    The file is written to a temporary name and renamed into place.
+
+    Args:
+        plan (RenamePlan): The plan to export.
+        path (str): The file to write.
+    """
+    import socket  # Only needed for plan files; kept off the startup path of the CLI
+
+    target_root = plan.destination_folder or plan.folder_path
+    header = {
+        "type": "autoname-plan",
+        "version": PLAN_FILE_VERSION,
+        "mode": plan.operation_mode,
+        "folder": plan.folder_path,
+        "destination": plan.destination_folder,
+        "host": socket.gethostname(),
+        "count": len(plan),
+        "folders": {
+            os.path.relpath(folder, plan.folder_path): list(stat)
+            for folder, stat in plan.folder_stats.items()
+        },
+    }
+    temp_path = path + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8', errors='surrogateescape') as f:
+        f.write(json.dumps(header, ensure_ascii=False) + "\n")
+        for old_file, new_file in plan.entries:
+            entry = [os.path.relpath(old_file, plan.folder_path), os.path.relpath(new_file, target_root)]
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    os.replace(temp_path, path)
+
+
+def load_plan(path, folder_path=None, destination_folder=None):
+    """
+    Load a plan exported with `save_plan`.
+
+    Args:
+        path (str): The plan file.
+        folder_path (str): Apply the plan to this folder instead of the one it was made for.
+        destination_folder (str): Write into this destination folder instead of the recorded one.
+
+    Returns:
+        RenamePlan: The plan, with absolute paths under the chosen folders.
+
+    Raises:
+        ValueError: If the file is not a plan file or is from a newer version.
+    """
+    import socket
+
+    with open(path, 'r', encoding='utf-8', errors='surrogateescape') as f:
+        try:
+            header = json.loads(f.readline())
+        except json.JSONDecodeError:
+            header = None
+        if not isinstance(header, dict) or header.get("type") != "autoname-plan":
+            raise ValueError(f"'{path}' is not an AutoName plan file")
+        if header.get("version", 0) > PLAN_FILE_VERSION:
+            raise ValueError(f"'{path}' was written by a newer version of AutoName")
+
+        source_root = os.path.abspath(folder_path or header["folder"])
+        destination = destination_folder or header.get("destination")
+        target_root = os.path.abspath(destination) if destination else source_root
+        entries = []
+        for line in f:
+            old_name, new_name = json.loads(line)
+            entries.append((os.path.normpath(os.path.join(source_root, old_name)),
+                            os.path.normpath(os.path.join(target_root, new_name))))
+
+    plan = RenamePlan(header["mode"], source_root, target_root if destination else None, entries)
+    plan.same_host = header.get("host") == socket.gethostname() and source_root == os.path.abspath(header["folder"])
+    plan.folder_stats = {
+        os.path.normpath(os.path.join(source_root, folder)): tuple(stat)
+        for folder, stat in header.get("folders", {}).items()
+    }
+    return plan
+
+
+def apply_plan(plan, progress_callback=None, max_workers=1, control=None):
+    """
+    Execute a previously computed plan without planning it again.
+
+    The source folders are checked first, with one `stat` each, so a plan made before
+    the folders changed is refused instead of half applied. The plan is then written to
+    a job journal and run in checkpointed chunks, just like a destination-mode job, so
+    it can be undone and resumed after a crash.
+
+    Args:
+        plan (RenamePlan): The plan to apply.
+        progress_callback (callable): Receives progress notifications.
+        max_workers (int): Maximum number of concurrent file operations.
+        control (JobControl): Lets the job be paused or stopped between chunks.
+
+    Returns:
+        JobJournal: The job's journal, which iterates over the undo entries.
+
+    Raises:
+        StalePlanError: If a source folder changed since the plan was made.
+    """
+    plan.check_sources()
+    journal = JobJournal.create(plan.operation_mode, plan.folder_path, plan.destination_folder, fixed_plan=True)
+    with profiled_job(f"apply-{os.path.basename(plan.folder_path)}") as timer:
+        try:
+            if progress_callback:
+                progress_callback("start", len(plan))
+            for target_folder in {os.path.dirname(new_file) for _, new_file in plan.entries}:
+                os.makedirs(target_folder, exist_ok=True)
+            with timer.phase("journal"):
+                journal.record_planned(plan.entries)
+                journal.record_plan_complete()
+            run_journaled_plan(journal, progress_callback, max_workers, control=control, timer=timer)
+        finally:
+            journal.finish(cancelled=control is not None and control.cancelled)
+    if progress_callback and timer.totals:
+        progress_callback("profile", timer.summary())
+    return journal
@@ -0,0 +1,298 @@
+# sqlite_store.py
+
+import os
+import json
+import sqlite3
+import logging
+import threading
+from name_keys import match_key
+
+SCHEMA_VERSION = 2  # 2: keys are NFKC-normalized as well as case-folded
+SQLITE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+KINDS = ("authors", "character_names")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS names (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    folded TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS names_by_folded ON names (kind, folded);
+CREATE TABLE IF NOT EXISTS aliases (
+    kind TEXT NOT NULL,
+    alias TEXT NOT NULL,
+    folded TEXT NOT NULL,
+    name_id INTEGER NOT NULL REFERENCES names (id) ON DELETE CASCADE,
+    PRIMARY KEY (kind, folded)
+);
+CREATE INDEX IF NOT EXISTS aliases_by_name ON aliases (name_id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def is_sqlite_file(filename):
+    """Check by its extension whether a data file is an SQLite registry."""
+    return filename.lower().endswith(SQLITE_EXTENSIONS)
+
+
+def fold(name):
+    """The form names are compared in; see name_keys.match_key."""
+    return match_key(name)
+
+
+def _prefix_range(prefix):
+    """Bounds of the folded names starting with `prefix`, for an index range scan."""
+    folded = fold(prefix)
+    return folded, folded + "\U0010ffff"
+
+
+class SqliteDataStore:
+    """
+    The authors and character names of an SQLite registry.
+
+    Each list is a kind of row in one `names` table with a unique index on the
+    folded name (case-folded and NFKC-normalized), so lookups and edits are index
+    operations instead of scans of a list, and nothing is loaded until it is asked for.
+    Names can also have aliases, which resolve to the name they belong to. The
+    database runs in WAL mode, so readers never wait for a writer.
+
+    It offers the same methods as data_storage.DataStore; edits are committed as they
+    are made, so `flush` has nothing left to write.
+    """
+
+    def __init__(self, filename):
+        """
+        Args:
+            filename (str): Path to the SQLite file; created if missing.
+        """
+        self.filename = filename
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(filename, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute("PRAGMA foreign_keys=ON")
+        self._connection.executescript(_SCHEMA)
+        with self._transaction() as cursor:
+            row = cursor.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+            if row is not None and int(row[0]) < 2:
+                self._refold(cursor)
+            cursor.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),))
+
+    def _refold(self, cursor):
+        """Recompute the keys of a version 1 registry, dropping names that now collide."""
+        dropped = []
+        for table, column in (("names", "name"), ("aliases", "alias")):
+            rows = cursor.execute(f"SELECT rowid, kind, {column}, folded FROM {table} ORDER BY rowid").fetchall()
+            for rowid, kind, name, folded in rows:
+                new_folded = fold(name)
+                if new_folded == folded:
+                    continue
+                taken = cursor.execute(
+                    f"SELECT 1 FROM {table} WHERE kind = ? AND folded = ? AND rowid != ?", (kind, new_folded, rowid)
+                ).fetchone()
+                if taken:
+                    cursor.execute(f"DELETE FROM {table} WHERE rowid = ?", (rowid,))
+                    dropped.append(name)
+                else:
+                    cursor.execute(f"UPDATE {table} SET folded = ? WHERE rowid = ?", (new_folded, rowid))
+        if dropped:
+            logging.info(f"Dropped {len(dropped)} duplicate name(s) from {self.filename}: {', '.join(dropped)}")
+
+    def _transaction(self):
+        return _Transaction(self)
+
+    def _names(self, key):
+        with self._lock:
+            rows = self._connection.execute("SELECT name FROM names WHERE kind = ? ORDER BY id", (key,))
+            return [name for name, in rows]
+
+    @property
+    def authors(self):
+        return self._names("authors")
+
+    @property
+    def character_names(self):
+        return self._names("character_names")
+
+    def snapshot(self):
+        """Return all names as the dict `load_data` returns."""
+        data = {key: self._names(key) for key in KINDS}
+        aliases = self.aliases()
+        if aliases:
+            data["aliases"] = aliases
+        return data
+
+    def contains(self, key, name):
+        """Check, ignoring case, whether a list has a name."""
+        return self.find(key, name) is not None
+
+    def find(self, key, text):
+        """
+        Look up a name or one of its aliases, ignoring case.
+
+        Returns:
+            str: The name as it is stored, or None if neither a name nor an alias matches.
+        """
+        folded = fold(text)
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT name FROM names WHERE kind = ? AND folded = ?", (key, folded)
+            ).fetchone()
+            if row is None:
+                row = self._connection.execute(
+                    "SELECT names.name FROM aliases JOIN names ON names.id = aliases.name_id "
+                    "WHERE aliases.kind = ? AND aliases.folded = ?", (key, folded)
+                ).fetchone()
+        return row[0] if row else None
+
+    def names_with_prefix(self, key, prefix, limit=50):
+        """
+        Return the names starting with `prefix`, ignoring case, in folded order.
+
+        Uses a range scan of the folded-name index, so it costs O(log n + limit).
+        """
+        low, high = _prefix_range(prefix)
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT name FROM names WHERE kind = ? AND folded >= ? AND folded < ? ORDER BY folded LIMIT ?",
+                (key, low, high, limit)
+            )
+            return [name for name, in rows]
+
+    def aliases(self, key=None):
+        """Return {kind: {alias: name}} for every alias, or {alias: name} for one kind."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT aliases.kind, aliases.alias, names.name FROM aliases JOIN names ON names.id = aliases.name_id"
+            ).fetchall()
+        result = {}
+        for kind, alias, name in rows:
+            result.setdefault(kind, {})[alias] = name
+        return result.get(key, {}) if key else result
+
+    def add(self, key, name):
+        """
+        Add a name to a list ('authors' or 'character_names').
+
+        Returns:
+            bool: True if added, False if it (or the same name in another case) was already there.
+        """
+        with self._transaction() as cursor:
+            cursor.execute("INSERT OR IGNORE INTO names (kind, name, folded) VALUES (?, ?, ?)", (key, name, fold(name)))
+            return cursor.rowcount > 0
+
+    def add_many(self, key, new_names):
+        """Add several names in one transaction; returns the names that were new."""
+        added = []
+        with self._transaction() as cursor:
+            for name in new_names:
+                cursor.execute("INSERT OR IGNORE INTO names (kind, name, folded) VALUES (?, ?, ?)", (key, name, fold(name)))
+                if cursor.rowcount > 0:
+                    added.append(name)
+        return added
+
+    def remove(self, key, name):
+        """
+        Remove a name, and its aliases, from a list.
+
+        Returns:
+            bool: True if removed, False if it was not there.
+        """
+        with self._transaction() as cursor:
+            cursor.execute("DELETE FROM names WHERE kind = ? AND folded = ?", (key, fold(name)))
+            return cursor.rowcount > 0
+
+    def add_alias(self, key, name, alias):
+        """
+        Make `alias` resolve to the existing name `name`.
+
+        Returns:
+            bool: True if added; False if `name` does not exist or the alias is taken.
+        """
+        with self._transaction() as cursor:
+            row = cursor.execute("SELECT id FROM names WHERE kind = ? AND folded = ?", (key, fold(name))).fetchone()
+            if row is None:
+                return False
+            cursor.execute(
+                "INSERT OR IGNORE INTO aliases (kind, alias, folded, name_id) VALUES (?, ?, ?, ?)",
+                (key, alias, fold(alias), row[0])
+            )
+            return cursor.rowcount > 0
+
+    def remove_alias(self, key, alias):
+        """Remove an alias; returns True if it existed."""
+        with self._transaction() as cursor:
+            cursor.execute("DELETE FROM aliases WHERE kind = ? AND folded = ?", (key, fold(alias)))
+            return cursor.rowcount > 0
+
+    def replace(self, data):
+        """Replace all the data, e.g. with what `save_data` was given."""
+        with self._transaction() as cursor:
+            cursor.execute("DELETE FROM aliases")
+            cursor.execute("DELETE FROM names")
+            self._insert(cursor, data)
+
+    def _insert(self, cursor, data):
+        for key in KINDS:
+            cursor.executemany(
+                "INSERT OR IGNORE INTO names (kind, name, folded) VALUES (?, ?, ?)",
+                ((key, name, fold(name)) for name in data.get(key, []))
+            )
+        for key, aliases in data.get("aliases", {}).items():
+            for alias, name in aliases.items():
+                cursor.execute(
+                    "INSERT OR IGNORE INTO aliases (kind, alias, folded, name_id) "
+                    "SELECT kind, ?, ?, id FROM names WHERE kind = ? AND folded = ?",
+                    (alias, fold(alias), key, fold(name))
+                )
+
+    def migrate_from_json(self, json_file):
+        """
+        Import a JSON data file once; later calls do nothing.
+
+        Returns:
+            bool: True if the file was imported by this call.
+        """
+        with self._transaction() as cursor:
+            if cursor.execute("SELECT 1 FROM meta WHERE key = 'migrated_from'").fetchone():
+                return False
+            with open(json_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._insert(cursor, data)
+            cursor.execute("INSERT INTO meta (key, value) VALUES ('migrated_from', ?)", (os.path.abspath(json_file),))
+        logging.info(
+            f"Migrated {len(data.get('authors', []))} author(s) and {len(data.get('character_names', []))} "
+            f"character name(s) from {json_file} to {self.filename}"
+        )
+        return True
+
+    def flush(self):
+        """Edits are committed as they are made; kept for the DataStore interface."""
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+class _Transaction:
+    """Holds the store's lock and runs the block in one transaction, rolled back on error."""
+
+    def __init__(self, store):
+        self.store = store
+
+    def __enter__(self):
+        self.store._lock.acquire()
+        self.cursor = self.store._connection.cursor()
+        self.cursor.execute("BEGIN IMMEDIATE")
+        return self.cursor
+
+    def __exit__(self, exc_type, exc, traceback):
+        try:
+            self.cursor.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self.store._lock.release()
+        return False
@@ -0,0 +1,127 @@
+# streaming.py
+
+import os
+import heapq
+import tempfile
+import threading
+
+SORT_RUN_SIZE = 100_000  # Names sorted in memory before spilling a run to disk
+STREAM_CHUNK_SIZE = 1_000  # Files planned and executed at a time in streaming jobs
+PROGRESS_BATCH_SIZE = 1_000  # Files per coalesced progress update
+_READ_BLOCK_SIZE = 16 * 1024
+
+
+def _write_run(names):
+    """Write a sorted run of names to a temporary file, NUL-separated."""
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8', errors='surrogateescape', newline='',
+                                     prefix='autoname-run-', delete=False) as run:
+        for name in names:
+            run.write(name)
+            run.write('\0')
+    return run.name
+
+
+def _read_run(path):
+    """Yield the names of a run file in order."""
+    with open(path, 'r', encoding='utf-8', errors='surrogateescape', newline='') as run:
+        remainder = ''
+        while True:
+            block = run.read(_READ_BLOCK_SIZE)
+            if not block:
+                break
+            names = (remainder + block).split('\0')
+            remainder = names.pop()
+            yield from names
+
+
+def _merge_runs(run_paths):
+    """Merge sorted run files into one sorted stream, deleting them afterwards."""
+    try:
+        yield from heapq.merge(*(_read_run(path) for path in run_paths))
+    finally:
+        for path in run_paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def scan_folder_sorted(folder_path, run_size=SORT_RUN_SIZE):
+    """
+    List a folder's files in sorted order without holding the whole listing in memory.
+
+    Names are read with `os.scandir`; every `run_size` names are sorted and spilled to a
+    temporary file, and the runs are merged lazily (an external merge sort).
+
+    Args:
+        folder_path (str): The folder to list.
+        run_size (int): Maximum number of names kept in memory while listing.
+
+    Returns:
+        tuple: (file count, sorted subfolder paths, iterator over sorted file names).
+    """
+    runs = []
+    buffer = []
+    subfolders = []
+    count = 0
+    try:
+        with os.scandir(folder_path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file():
+                        buffer.append(entry.name)
+                        count += 1
+                    elif entry.is_dir(follow_symlinks=False):
+                        subfolders.append(entry.path)
+                except OSError:
+                    continue
+                if len(buffer) >= run_size:
+                    buffer.sort()
+                    runs.append(_write_run(buffer))
+                    buffer = []
+    except BaseException:
+        for path in runs:
+            os.remove(path)
+        raise
+
+    buffer.sort()
+    if not runs:
+        return count, sorted(subfolders), iter(buffer)
+    runs.append(_write_run(buffer))
+    return count, sorted(subfolders), _merge_runs(runs)
+
+
+class CoalescedProgress:
+    """
+    Wrap a progress callback so per-file "update" notifications are sent in batches.
+
+    Other notifications pass through unchanged, after any pending updates.
+    """
+
+    def __init__(self, progress_callback, batch_size=PROGRESS_BATCH_SIZE):
+        self.progress_callback = progress_callback
+        self.batch_size = batch_size
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, status, data=None):
+        if status == "update":
+            with self._lock:
+                self._pending += data
+                if self._pending < self.batch_size:
+                    return
+                data, self._pending = self._pending, 0
+            self.progress_callback("update", data)
+            return
+        self.flush()
+        if data is None:
+            self.progress_callback(status)
+        else:
+            self.progress_callback(status, data)
+
+    def flush(self):
+        """Send any updates that have not been reported yet."""
+        with self._lock:
+            pending, self._pending = self._pending, 0
+        if pending:
+            self.progress_callback("update", pending)
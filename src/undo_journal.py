@@ -0,0 +1,745 @@
+# undo_journal.py
+
+import os
+import json
+import time
+import shutil
+import logging
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # Windows: journals of running jobs are not locked
+
+from executor import perform_operation, execute_operations, is_cross_device_move, NON_DESTRUCTIVE_MODES
+from move_engine import PART_SUFFIX, is_same_device
+from job_profile import NULL_TIMER
+
+# Set directory paths at the top of the file so they are accessible globally
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(BASE_DIR, "data")
+JOURNAL_DIR = os.path.join(DATA_DIR, "journals")
+
+JOURNAL_SUFFIX = ".jsonl"
+GROUP_COMMIT_RECORDS = 64  # Records written before the journal is fsynced
+GROUP_COMMIT_SECONDS = 0.5  # Longest time a record may stay unsynced
+MAX_KEPT_JOURNALS = 20  # Finished journals kept for undo across restarts
+CHECKPOINT_INTERVAL = 1_000  # Plan entries executed between two checkpoints
+_READ_BLOCK_SIZE = 16 * 1024
+
+
+class JournalInUseError(RuntimeError):
+    """Raised when a job journal is locked by a job that is still running."""
+
+
+def _read_lines_reversed(path):
+    """Yield the lines of a file from last to first, reading it backwards block by block."""
+    with open(path, 'rb') as f:
+        position = f.seek(0, os.SEEK_END)
+        remainder = b''
+        while position > 0:
+            size = min(_READ_BLOCK_SIZE, position)
+            position -= size
+            f.seek(position)
+            lines = (f.read(size) + remainder).split(b'\n')
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                if line:
+                    yield line
+        if remainder:
+            yield remainder
+
+
+class JobJournal:
+    """
+    Append-only, on-disk journal of one rename job.
+
+    Planned entries are written (and fsynced) before they run, so an interrupted job can
+    be finished or rolled back on the next start. Completed entries are appended in
+    batches and fsynced as a group every GROUP_COMMIT_RECORDS records or
+    GROUP_COMMIT_SECONDS, which keeps syncing off the per-file hot path.
+
+    Jobs with a fixed plan write the whole plan first, mark it complete, and then run it
+    in chunks, writing a checkpoint before each chunk; other jobs checkpoint each chunk
+    as they plan and run it. A restarted job skips completed
+    entries with a bitmap lookup and only checks the filesystem for the one chunk that
+    was in flight when the job stopped.
+
+    A Move across devices copies a file under its final name before it unlinks the
+    source, so for a while both exist; plan records of such moves carry "cross_device"
+    so recovery knows that both names existing can mean a finished copy.
+
+    A job that is cancelled, or stopped because the window closed, with work left
+    writes "cancelled" instead of "end"; it stays interrupted, so the next start offers
+    to finish or roll it back.
+
+    For undo, the journal behaves like the list of (new_file, original_file) tuples it
+    replaces, including `reversed()`, which reads the file backwards.
+
+    Records, one JSON object per line:
+        {"type": "job", "mode": ..., "folder": ..., "destination": ..., "fixed_plan": ..., "started": ...}
+        {"type": "plan", "start": <plan index>, "entries": [[old_file, new_file], ...], "cross_device": ...}
+        {"type": "planned", "total": <number of plan entries>}
+        {"type": "checkpoint", "position": <first entry of the chunk>, "next": <end of the chunk>}
+        {"type": "done", "entries": [[plan index, new_file, original_file], ...]}
+        {"type": "cancelled"}
+        {"type": "end"}
+    """
+
+    def __init__(self, path, operation_mode, folder_path=None, destination_folder=None, fixed_plan=False):
+        self.path = path
+        self.operation_mode = operation_mode
+        self.folder_path = folder_path
+        self.destination_folder = destination_folder
+        self.fixed_plan = fixed_plan
+        self.plan_complete = False
+        self.finished = False
+        self.cancelled = False  # Stopped by the user with work left, rather than by a crash
+        self.cross_device = False  # Some planned entries are Moves across devices
+        self._checkpoint = None  # (position, next) of the last chunk started
+        self._file = None
+        self._count = 0  # Completed entries
+        self._planned = 0
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    @classmethod
+    def create(cls, operation_mode, folder_path, destination_folder=None, fixed_plan=False, journal_dir=None):
+        """
+        Start a journal for a new job; nothing is written until the first entry is planned.
+
+        The journal goes to `journal_dir`, or to the module's JOURNAL_DIR as it is when
+        the job starts, so a caller such as the benchmark can redirect every job's journal.
+        """
+        journal_dir = journal_dir or JOURNAL_DIR
+        job_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.urandom(4).hex()}"
+        path = os.path.join(journal_dir, job_id + JOURNAL_SUFFIX)
+        return cls(path, operation_mode, folder_path, destination_folder, fixed_plan)
+
+    @classmethod
+    def load(cls, path):
+        """Open an existing journal, reading its header, entry counts and whether it finished."""
+        journal = None
+        with open(path, 'r', encoding='ascii') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # A line torn by a crash; the records around it are intact
+                if record["type"] == "job":
+                    journal = cls(path, record["mode"], record.get("folder"), record.get("destination"),
+                                  record.get("fixed_plan", False))
+                elif journal is None:
+                    break
+                elif record["type"] == "plan":
+                    journal._planned = record["start"] + len(record["entries"])
+                    journal.cross_device = journal.cross_device or record.get("cross_device", False)
+                elif record["type"] == "planned":
+                    journal.plan_complete = True
+                elif record["type"] == "checkpoint":
+                    journal._checkpoint = (record["position"], record["next"])
+                elif record["type"] == "done":
+                    journal._count += len(record["entries"])
+                elif record["type"] == "cancelled":
+                    journal.cancelled = True
+                elif record["type"] == "end":
+                    journal.finished = True
+        if journal is None:
+            raise ValueError(f"'{path}' is not a job journal")
+        return journal
+
+    @property
+    def job_id(self):
+        return os.path.basename(self.path)[:-len(JOURNAL_SUFFIX)]
+
+    def lock(self):
+        """
+        Open the journal for appending and lock it for as long as the job runs.
+
+        The lock is an exclusive `flock`, released when the journal is finished or
+        discarded, or when the process dies; recovery skips journals that are locked.
+
+        Raises:
+            JournalInUseError: If another job, in this or another process, holds the lock.
+        """
+        if self._file is not None:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._file = open(self.path, 'a', encoding='ascii')
+        if fcntl is not None:
+            try:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                self._file.close()
+                self._file = None
+                raise JournalInUseError(f"Job {self.job_id} is still running in another process")
+        torn = False
+        if os.path.getsize(self.path):
+            with open(self.path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                torn = f.read(1) != b'\n'
+        if torn:
+            self._file.write('\n')  # Seal a torn last line left by a crash
+        elif self._file.tell() == 0:
+            self._file.write(json.dumps({
+                "type": "job",
+                "mode": self.operation_mode,
+                "folder": self.folder_path,
+                "destination": self.destination_folder,
+                "fixed_plan": self.fixed_plan,
+                "started": time.strftime('%Y-%m-%dT%H:%M:%S'),
+            }) + '\n')
+
+    def release(self):
+        """Close the journal and give up its lock, leaving it on disk as it is."""
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+    def _write(self, record, sync=False):
+        if self._file is None:
+            self.lock()
+        self._file.write(json.dumps(record) + '\n')
+        self._unsynced += 1
+        if sync or self._unsynced >= GROUP_COMMIT_RECORDS or time.monotonic() - self._last_sync >= GROUP_COMMIT_SECONDS:
+            self.sync()
+
+    def sync(self):
+        """Flush and fsync everything written so far."""
+        if self._file is None or not self._unsynced:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def record_planned(self, planned):
+        """
+        Write ahead the entries about to run; synced immediately.
+
+        Args:
+            planned (list): (old_file, new_file) pairs in planned order.
+
+        Returns:
+            int: The plan index of the first entry.
+        """
+        start = self._planned
+        if planned:
+            record = {"type": "plan", "start": start, "entries": [list(entry) for entry in planned]}
+            if self.operation_mode == "Move" and is_cross_device_move(planned):
+                record["cross_device"] = True
+                self.cross_device = True
+            self._write(record, sync=True)
+            self._planned += len(planned)
+        return start
+
+    def record_plan_complete(self):
+        """Mark the plan as complete; from here on the job can be resumed from its checkpoints."""
+        self._write({"type": "planned", "total": self._planned}, sync=True)
+        self.plan_complete = True
+
+    def record_checkpoint(self, position, next_position):
+        """Record that the entries from `position` up to `next_position` are about to run."""
+        self._write({"type": "checkpoint", "position": position, "next": next_position}, sync=True)
+        self._checkpoint = (position, next_position)
+
+    def record_done(self, indexes, planned, operations):
+        """
+        Record the undo entries of a batch of executed plan entries.
+
+        Args:
+            indexes (iterable): Plan indexes of the batch's entries (from record_planned).
+            planned (list): The batch's (old_file, new_file) pairs.
+            operations (list): Undo entries returned by the executor for the batch.
+        """
+        if not operations:
+            return
+        plan_index = {new_file: index for index, (_, new_file) in zip(indexes, planned)}
+        entries = [[plan_index.get(new_file), new_file, original_file] for new_file, original_file in operations]
+        self._write({"type": "done", "entries": entries})
+        self._count += len(entries)
+
+    def finish(self, cancelled=False):
+        """
+        Mark the job as finished. A journal without completed entries is removed.
+
+        Args:
+            cancelled (bool): The job was stopped before it was done; unless its whole
+                plan had already run, it is marked cancelled and stays interrupted.
+        """
+        if self._count == 0:
+            self.discard()
+            return
+        if cancelled and not (self.plan_complete and self._count >= self._planned):
+            self._write({"type": "cancelled"}, sync=True)
+            self.release()
+            self.cancelled = True
+            return
+        self._write({"type": "end"}, sync=True)
+        self.release()
+        self.finished = True
+
+    def discard(self):
+        """Delete the journal, e.g. after the job has been undone or rolled back."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    # Behave like the undo list of (new_file, original_file) tuples
+    def __len__(self):
+        return self._count
+
+    def __bool__(self):
+        return self._count > 0
+
+    def __iter__(self):
+        for record in self.records():
+            if record["type"] == "done":
+                for _, new_file, original_file in record["entries"]:
+                    yield (new_file, original_file)
+
+    def __reversed__(self):
+        self.sync()
+        for line in _read_lines_reversed(self.path):
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record["type"] == "done":
+                for _, new_file, original_file in reversed(record["entries"]):
+                    yield (new_file, original_file)
+
+    def close(self):
+        """The job has been undone; its journal is no longer needed."""
+        self.discard()
+
+    def records(self):
+        """Yield the journal's records in order, skipping lines torn by a crash."""
+        if self._file is not None:
+            self._file.flush()
+        with open(self.path, 'r', encoding='ascii') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+    @property
+    def planned_count(self):
+        return self._planned
+
+    def iter_plan(self):
+        """Yield (plan index, old_file, new_file) for every planned entry, reading the journal sequentially."""
+        for record in self.records():
+            if record["type"] == "plan":
+                for offset, (old_file, new_file) in enumerate(record["entries"]):
+                    yield record["start"] + offset, old_file, new_file
+
+    def resume_state(self):
+        """
+        Work out where an interrupted job stands.
+
+        Returns:
+            tuple: (bitmap of completed plan indexes, start of the chunk that was in flight,
+                end of the chunk that was in flight). Entries in the in-flight chunk without a
+                completion record may or may not have run; entries past it never ran.
+        """
+        completed = bytearray(self._planned)
+        for record in self.records():
+            if record["type"] == "done":
+                for index, _, _ in record["entries"]:
+                    if index is not None and index < self._planned:
+                        completed[index] = 1
+        if self._checkpoint:
+            position, next_position = self._checkpoint
+        elif self.fixed_plan:
+            # A checkpoint is synced before the first chunk runs, so nothing has run yet
+            position, next_position = 0, 0
+        else:
+            # Journals written before jobs checkpointed every chunk: any planned entry may
+            # have run, so all of them are worked out in plan order
+            position, next_position = 0, self._planned
+        return completed, position, next_position
+
+    def pending_entries(self):
+        """
+        Return the planned entries that have no completion record.
+
+        Returns:
+            list: (plan index, old_file, new_file) tuples in planned order.
+        """
+        completed, _, _ = self.resume_state()
+        return [entry for entry in self.iter_plan() if not completed[entry[0]]]
+
+    def in_flight_states(self, completed, in_flight_start, in_flight_end):
+        """
+        Work out from the filesystem which entries of the in-flight chunk ran.
+
+        Args:
+            completed (bytearray): Completed plan indexes, from `resume_state`.
+            in_flight_start (int): First plan index of the chunk that was in flight.
+            in_flight_end (int): End of that chunk.
+
+        Returns:
+            dict: Plan index -> "done", "pending", "copied" or "lost" for every in-flight
+                entry without a completion record; see `_InFlightEntries`.
+        """
+        states = {}
+        if in_flight_start >= in_flight_end:
+            return states
+        entries = _InFlightEntries(self.operation_mode, self.cross_device)
+        in_flight = []
+        for index, old_file, new_file in self.iter_plan():
+            if index >= in_flight_end:
+                break
+            if completed[index]:
+                continue
+            if index < in_flight_start:
+                entries.did_not_run(old_file)  # Failed in an earlier chunk; its file is still there
+            else:
+                in_flight.append((index, old_file, new_file))
+        entries.targets = {new_file for _, _, new_file in in_flight}
+        for index, old_file, new_file in in_flight:
+            states[index] = entries.state(old_file, new_file)
+        return states
+
+
+class _InFlightEntries:
+    """
+    Decides, in plan order, whether the entries of an interrupted chunk ran.
+
+    A new name is either one no file had when the job was planned or one freed by an
+    earlier entry of the same plan (the name index reuses those on purpose), and only
+    its own entry ever creates it. So an entry ran exactly when its new name exists and
+    does not still hold the file of an earlier entry that did not run. Its old name
+    existing as well proves nothing: a later entry may have taken it. Only for a Move
+    across devices, whose copy appears under the new name once it is complete and
+    synced, does "both exist" mean the copy finished but the source was not unlinked.
+    """
+
+    def __init__(self, operation_mode, cross_device=False):
+        self.operation_mode = operation_mode
+        self.cross_device = cross_device and operation_mode == "Move"
+        self.targets = set()  # New names of the in-flight entries
+        self._unrun_sources = set()  # Old names of earlier entries that did not run
+        self._devices = {}  # (source folder, target folder) -> same device
+
+    def did_not_run(self, old_file):
+        self._unrun_sources.add(old_file)
+
+    def _crosses_devices(self, old_file, new_file):
+        folders = (os.path.dirname(old_file), os.path.dirname(new_file))
+        same = self._devices.get(folders)
+        if same is None:
+            same = self._devices[folders] = is_same_device(*folders)
+        return not same
+
+    def state(self, old_file, new_file):
+        """
+        Return "done", "pending", "copied" (a cross-device Move still to unlink its
+        source) or "lost" for the next entry in plan order.
+        """
+        try:
+            state = self._state(old_file, new_file)
+        except OSError as e:
+            logging.error(f"Error checking '{new_file}': {e}")
+            state = "pending"  # Running it again fails safely if the new name is taken
+        if state not in ("done", "copied"):
+            self.did_not_run(old_file)
+        return state
+
+    def _state(self, old_file, new_file):
+        part_file = new_file + PART_SUFFIX
+        if os.path.lexists(part_file):
+            os.remove(part_file)  # An unfinished cross-device copy; the source is still intact
+        old_exists = os.path.lexists(old_file)
+        if new_file in self._unrun_sources:
+            # Still the file of an earlier entry that did not run, so this one did not either
+            return "pending" if old_exists else "lost"
+        new_exists = os.path.lexists(new_file)
+        if self.operation_mode in NON_DESTRUCTIVE_MODES:
+            if new_exists and old_exists and os.path.getsize(new_file) != os.path.getsize(old_file):
+                os.remove(new_file)  # A torn copy; the name was free when planned, so it is ours
+                return "pending"
+            return "done" if new_exists else "pending"
+        if new_exists:
+            if (old_exists and self.cross_device and old_file not in self.targets
+                    and self._crosses_devices(old_file, new_file)):
+                return "copied"
+            return "done"
+        return "pending" if old_exists else "lost"
+
+
+def journal_in_use(path):
+    """Check whether a running job, in this or another process, holds a journal's lock."""
+    if fcntl is None:
+        return False
+    try:
+        with open(path, 'rb') as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_SH | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return True
+    except OSError:
+        pass
+    return False
+
+
+def find_journals(journal_dir=JOURNAL_DIR):
+    """Return the paths of all job journals, oldest first."""
+    try:
+        names = sorted(name for name in os.listdir(journal_dir) if name.endswith(JOURNAL_SUFFIX))
+    except FileNotFoundError:
+        return []
+    return [os.path.join(journal_dir, name) for name in names]
+
+
+def load_undo_history(journal_dir=JOURNAL_DIR, keep=MAX_KEPT_JOURNALS):
+    """
+    Load finished jobs for the undo stack, pruning all but the most recent `keep`.
+
+    Journals locked by a job still running, e.g. a CLI or cron job, are neither
+    offered for recovery nor pruned.
+
+    Returns:
+        tuple: (list of (operation_mode, JobJournal) undo entries oldest first,
+            list of interrupted JobJournals).
+    """
+    finished = []
+    interrupted = []
+    for path in find_journals(journal_dir):
+        if journal_in_use(path):
+            logging.info(f"Skipping job journal '{path}': its job is still running.")
+            continue
+        try:
+            journal = JobJournal.load(path)
+        except (OSError, ValueError, KeyError) as e:
+            logging.error(f"Unreadable job journal '{path}': {e}")
+            continue
+        (finished if journal.finished else interrupted).append(journal)
+
+    for journal in finished[:-keep] if keep else finished:
+        journal.discard()
+    finished = finished[-keep:] if keep else []
+    return [(journal.operation_mode, journal) for journal in finished], interrupted
+
+
+def run_journaled_plan(journal, progress_callback=None, max_workers=1, chunk_size=CHECKPOINT_INTERVAL, control=None, timer=NULL_TIMER):
+    """
+    Execute a journal's plan, or what is left of it, checkpointing before each chunk.
+
+    Completed entries are skipped in O(1) with a bitmap, without touching the
+    filesystem. Entries of the chunk that was in flight when the job stopped are checked
+    on disk once, in plan order and before anything runs (see `_InFlightEntries`); every
+    other entry simply runs. No file is deleted just because both of an entry's names
+    exist.
+
+    Args:
+        journal (JobJournal): A journal whose plan has been recorded.
+        progress_callback (callable): Receives "update" and "error" notifications.
+        max_workers (int): Maximum number of concurrent file operations.
+        chunk_size (int): Number of plan entries between checkpoints.
+        control (JobControl): Checked before each chunk, to pause or stop the job.
+        timer (PhaseTimer): Times journaling and the file operations.
+    """
+    operation_mode = journal.operation_mode
+    completed, in_flight_start, in_flight_end = journal.resume_state()
+    with timer.phase("journal"):
+        in_flight = journal.in_flight_states(completed, in_flight_start, in_flight_end)
+
+    def run_chunk(chunk):
+        with timer.phase("journal"):
+            journal.record_checkpoint(chunk[0][0], chunk[-1][0] + 1)
+        indexes, planned, recovered = [], [], []
+        for index, old_file, new_file in chunk:
+            state = in_flight.get(index)  # May have run before the job stopped, without its completion record
+            if state is not None:
+                original_file = None if operation_mode in NON_DESTRUCTIVE_MODES else old_file
+                if state == "copied":
+                    try:
+                        os.remove(old_file)  # A cross-device Move whose copy was complete and synced
+                    except OSError as e:
+                        logging.error(f"Moved '{old_file}' to '{new_file}' but could not remove the source: {e}")
+                        original_file = None  # Only a copy was made; undo removes it
+                    state = "done"
+                if state == "done":
+                    recovered.append((index, old_file, new_file, original_file))
+                    continue
+                if state == "lost":
+                    message = f"Neither '{old_file}' nor '{new_file}' exists"
+                    logging.error(message)
+                    if progress_callback:
+                        progress_callback("error", message)
+                    continue
+            indexes.append(index)
+            planned.append((old_file, new_file))
+
+        for index, old_file, new_file, original_file in recovered:
+            journal.record_done([index], [(old_file, new_file)], [(new_file, original_file)])
+        if recovered and progress_callback:
+            progress_callback("update", len(recovered))
+        operations = execute_operations(planned, operation_mode, progress_callback, max_workers, timer)
+        with timer.phase("journal"):
+            journal.record_done(indexes, planned, operations)
+
+    chunk = []
+    skipped = 0
+    for entry in timer.timed_iter("journal", journal.iter_plan()):
+        if completed[entry[0]]:
+            skipped += 1
+            continue
+        chunk.append(entry)
+        if len(chunk) >= chunk_size:
+            if control and control.should_stop():
+                return
+            run_chunk(chunk)
+            chunk = []
+    if chunk and not (control and control.should_stop()):
+        run_chunk(chunk)
+    if skipped and progress_callback:
+        progress_callback("update", skipped)
+
+
+def replay_interrupted_job(journal, progress_callback=None, max_workers=1, control=None):
+    """
+    Resume an interrupted job from its last checkpoint.
+
+    A fixed-plan job that stopped while it was still planning has not touched any file,
+    so its journal is simply dropped. If the resumed job is cancelled in turn, its
+    journal stays interrupted.
+
+    Args:
+        journal (JobJournal): The interrupted job.
+        progress_callback (callable): Receives progress notifications.
+        max_workers (int): Maximum number of concurrent file operations.
+        control (JobControl): Lets the job be paused or stopped between chunks.
+
+    Returns:
+        list: Error messages for entries that could not be completed.
+
+    Raises:
+        JournalInUseError: If another process is running the job.
+    """
+    journal.lock()  # Before anything is touched, in case another process took the job
+    errors = []
+
+    def collect(status, data=None):
+        if status == "error":
+            errors.append(data)
+        if progress_callback:
+            progress_callback(status, data)
+
+    if journal.fixed_plan and not journal.plan_complete:
+        logging.info(f"Job {journal.job_id} stopped while planning; nothing to resume.")
+        journal.discard()
+        return errors
+
+    if progress_callback:
+        progress_callback("start", journal.planned_count)
+    try:
+        run_journaled_plan(journal, collect, max_workers, control=control)
+    finally:
+        journal.finish(cancelled=control is not None and control.cancelled)
+    return errors
+
+
+def undo_operations(operation_mode, operations):
+    """
+    Undo a finished job, newest entry first.
+
+    Args:
+        operation_mode (str): The operation mode the job ran in.
+        operations (iterable): Its (new_file, original_file) undo entries, e.g. a JobJournal;
+            a journal is discarded once the job is undone.
+
+    Returns:
+        list: Error messages for entries that could not be undone.
+    """
+    errors = []
+    count = 0
+    for new_file, original_file in reversed(operations):
+        count += 1
+        try:
+            if operation_mode == "Rename":
+                if original_file and os.path.exists(new_file):
+                    os.rename(new_file, original_file)
+                    logging.debug(f"Reverted '{new_file}' to '{original_file}'")
+            elif operation_mode in NON_DESTRUCTIVE_MODES:
+                # Only the new name is removed; for links the source keeps its data
+                if os.path.lexists(new_file):
+                    os.remove(new_file)
+                    logging.debug(f"Removed {operation_mode.lower()} '{new_file}'")
+            elif operation_mode == "Move":
+                if original_file is None:
+                    # Copied across devices, but the source could not be removed
+                    if os.path.lexists(new_file):
+                        os.remove(new_file)
+                        logging.debug(f"Removed copy '{new_file}'")
+                elif os.path.exists(new_file):
+                    shutil.move(new_file, original_file)
+                    logging.debug(f"Moved '{new_file}' back to '{original_file}'")
+            else:
+                logging.error(f"Unknown operation mode: {operation_mode}")
+        except Exception as e:
+            errors.append(f"Error undoing '{new_file}': {e}")
+            logging.error(f"Error undoing '{new_file}': {e}")
+
+    logging.info(f"Undid {operation_mode.lower()} of {count} file(s), {len(errors)} error(s)")
+    if hasattr(operations, 'close'):
+        operations.close()  # The job is undone, so its journal can go
+    return errors
+
+
+def roll_back_interrupted_job(journal):
+    """
+    Roll back an interrupted job: undo every entry that ran, newest first.
+
+    Which in-flight entries ran is worked out as for a resume; an entry that did not
+    run is left alone even if both of its names exist.
+
+    Returns:
+        list: Error messages for entries that could not be rolled back.
+
+    Raises:
+        JournalInUseError: If another process is running the job.
+    """
+    journal.lock()
+    errors = []
+    completed = []  # (plan index, new_file, original_file) of every entry that ran
+    for record in journal.records():
+        if record["type"] == "done":
+            completed.extend(record["entries"])
+    in_flight = journal.in_flight_states(*journal.resume_state())
+    plan = {}
+    if in_flight:
+        plan = {index: (old_file, new_file) for index, old_file, new_file in journal.iter_plan() if index in in_flight}
+    for index, state in in_flight.items():
+        old_file, new_file = plan[index]
+        if state == "done":
+            completed.append([index, new_file, None if journal.operation_mode in NON_DESTRUCTIVE_MODES else old_file])
+        elif state == "copied":
+            completed.append([index, new_file, None])  # The source is still there; only the copy goes
+    # Newest first by plan order, so a name freed by an earlier entry is given back last
+    completed.sort(key=lambda entry: -1 if entry[0] is None else entry[0])
+
+    for _, new_file, original_file in reversed(completed):
+        try:
+            if original_file is None:
+                if os.path.lexists(new_file):
+                    os.remove(new_file)
+            elif os.path.lexists(new_file) and not os.path.lexists(original_file):
+                perform_operation("Move" if journal.operation_mode == "Move" else "Rename", new_file, original_file)
+            logging.debug(f"Rolled back '{new_file}'")
+        except Exception as e:
+            errors.append(f"Error rolling back '{new_file}': {e}")
+            logging.error(f"Error rolling back '{new_file}': {e}")
+
+    if errors:
+        journal.release()
+    else:
+        journal.discard()
+    return errors
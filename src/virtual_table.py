@@ -0,0 +1,82 @@
+# virtual_table.py
+
+import tkinter as tk
+from tkinter import ttk
+
+
+class VirtualTable(tk.Frame):
+    """
+    A read-only table that only creates widgets for the rows on screen.
+
+    The Treeview holds a fixed pool of items, one per visible row. Scrolling moves an
+    offset into `rows` and rewrites the pool's values, so a table of 100k rows costs no
+    more to build or scroll than one of 30. Rows are formatted lazily, when they scroll
+    into view.
+    """
+
+    def __init__(self, master, columns, rows, format_row=None, visible_rows=25, **kwargs):
+        """
+        Args:
+            master: The parent widget.
+            columns (list): (heading, width) pairs.
+            rows (sequence): The rows to show; only needs `len()` and indexing.
+            format_row (callable): Turns a row into a tuple of cell values; rows are shown
+                as they are if omitted.
+            visible_rows (int): Number of rows drawn at a time.
+        """
+        super().__init__(master, **kwargs)
+        self.rows = rows
+        self.format_row = format_row or (lambda row: row)
+        self.visible_rows = visible_rows
+        self.offset = 0
+
+        column_ids = [f"c{index}" for index in range(len(columns))]
+        self.tree = ttk.Treeview(self, columns=column_ids, show="headings", height=visible_rows, selectmode="none")
+        for column_id, (heading, width) in zip(column_ids, columns):
+            self.tree.heading(column_id, text=heading)
+            self.tree.column(column_id, width=width, stretch=True)
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.on_scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self._items = [self.tree.insert("", tk.END, values=()) for _ in range(visible_rows)]
+
+        self.tree.bind("<MouseWheel>", self.on_mousewheel)
+        self.tree.bind("<Button-4>", lambda event: self.scroll_to(self.offset - 3))  # Linux scroll up
+        self.tree.bind("<Button-5>", lambda event: self.scroll_to(self.offset + 3))  # Linux scroll down
+        self.tree.bind("<Prior>", lambda event: self.scroll_to(self.offset - self.visible_rows))
+        self.tree.bind("<Next>", lambda event: self.scroll_to(self.offset + self.visible_rows))
+        self.redraw()
+
+    def set_rows(self, rows):
+        """Replace the rows shown and go back to the top."""
+        self.rows = rows
+        self.offset = 0
+        self.redraw()
+
+    def scroll_to(self, offset):
+        """Show the rows starting at `offset`, clamped to the table."""
+        self.offset = max(0, min(offset, len(self.rows) - self.visible_rows))
+        self.redraw()
+
+    def redraw(self):
+        """Rewrite the pool of visible items for the current offset."""
+        total = len(self.rows)
+        for position, item in enumerate(self._items):
+            index = self.offset + position
+            self.tree.item(item, values=self.format_row(self.rows[index]) if index < total else ())
+        if total > self.visible_rows:
+            self.scrollbar.set(self.offset / total, (self.offset + self.visible_rows) / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def on_scroll(self, action, value, unit=None):
+        """Handle the scrollbar's `moveto` and `scroll` commands."""
+        if action == "moveto":
+            self.scroll_to(int(float(value) * len(self.rows)))
+        elif action == "scroll":
+            step = self.visible_rows if unit == "pages" else 1
+            self.scroll_to(self.offset + int(value) * step)
+
+    def on_mousewheel(self, event):
+        self.scroll_to(self.offset - 3 if event.delta > 0 else self.offset + 3)
@@ -0,0 +1,68 @@
+# test_character_matcher.py
+"""
+The Aho-Corasick matcher picks the longest character name on token boundaries, and
+compares names by their folded keys, so case, Unicode forms and aliases do not matter.
+"""
+
+import os
+import sys
+
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+sys.path.insert(0, SRC_DIR)
+
+from character_matcher import CharacterMatcher, get_character_matcher  # noqa: E402
+
+NAMES = ["Ann", "Anna", "Ada", "Tifa", "Tifa Lockhart", "Zoë", "Aerith"]
+
+
+@pytest.mark.parametrize("filename, expected", [
+    ("Anna_01", "Anna"),  # Longest name wins
+    ("tifa lockhart 2", "Tifa Lockhart"),
+    ("Canada Ann", "Ann"),  # "Ada" inside "Canada" is not on token boundaries
+    ("xAdax", "Ada"),  # No bounded match: the longest plain substring is used
+    ("Tifa01", "Tifa"),  # Letter/digit transitions are boundaries
+    ("TifaLockhart", "Tifa"),  # So are lower-to-upper transitions
+    ("nothing here", None),
+])
+def test_match_prefers_longest_bounded_name(filename, expected):
+    assert CharacterMatcher(NAMES).match(filename) == expected
+
+
+def test_find_all_reports_every_occurrence():
+    matcher = CharacterMatcher(NAMES)
+
+    found = {(start, end, matcher.names[pattern_id]) for start, end, pattern_id in matcher.find_all("Anna and Ada")}
+
+    assert found == {(0, 3, "Ann"), (0, 4, "Anna"), (9, 12, "Ada")}
+
+
+@pytest.mark.parametrize("filename", ["ZOË at the beach", "Zoë at the beach", "ＺＯË"])
+def test_matches_ignoring_case_and_unicode_form(filename):
+    assert CharacterMatcher(NAMES).match(filename) == "Zoë"
+
+
+def test_fullwidth_filename_matches():
+    assert CharacterMatcher(NAMES).match("ＴＩＦＡ_01") == "Tifa"
+
+
+def test_alias_matches_as_its_name():
+    matcher = CharacterMatcher(NAMES, {"Aeris": "Aerith", "Tifa-chan": "Tifa"})
+
+    assert matcher.match("aeris_pic") == "Aerith"
+    assert matcher.match("Tifa-chan 3") == "Tifa"
+
+
+def test_names_differing_only_by_case_are_one_pattern():
+    matcher = CharacterMatcher(["Tifa", "TIFA", "tifa"])
+
+    assert len(matcher) == 1
+    assert matcher.match("tifa 1") == "Tifa"
+
+
+def test_cached_matcher_is_rebuilt_only_when_names_change():
+    first = get_character_matcher(["Tifa", "Aerith"])
+
+    assert get_character_matcher(["Tifa", "Aerith"]) is first
+    assert get_character_matcher(["Tifa", "Aerith"], {"Aeris": "Aerith"}) is not first
@@ -0,0 +1,79 @@
+# test_data_storage.py
+"""
+The DataStore writes a burst of changes once, after it goes quiet, and never lets a
+change wait longer than the cap while changes keep coming.
+"""
+
+import os
+import sys
+import json
+import time
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+sys.path.insert(0, SRC_DIR)
+
+import data_storage  # noqa: E402
+from data_storage import DataStore  # noqa: E402
+
+
+def counting_writes(monkeypatch):
+    writes = []
+    write = data_storage._write_atomically
+
+    def counting_write(filename, data):
+        writes.append(json.loads(json.dumps(data)))
+        write(filename, data)
+
+    monkeypatch.setattr(data_storage, "_write_atomically", counting_write)
+    return writes
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_burst_longer_than_the_delay_is_written_once(tmp_path, monkeypatch):
+    filename = str(tmp_path / "data.json")
+    store = DataStore(filename, flush_delay=0.2, max_flush_delay=5.0)
+    writes = counting_writes(monkeypatch)
+
+    for i in range(8):
+        store.add('authors', f"Author {i}")
+        time.sleep(0.05)  # The burst lasts twice the delay, but never pauses for it
+
+    assert writes == []
+    assert wait_for(lambda: writes)
+    time.sleep(0.3)
+    assert [data['authors'] for data in writes] == [[f"Author {i}" for i in range(8)]]
+    with open(filename, encoding='utf-8') as f:
+        assert json.load(f)['authors'] == [f"Author {i}" for i in range(8)]
+
+
+def test_changes_that_never_pause_are_written_by_the_cap(tmp_path, monkeypatch):
+    store = DataStore(str(tmp_path / "data.json"), flush_delay=0.2, max_flush_delay=0.4)
+    writes = counting_writes(monkeypatch)
+
+    started = time.monotonic()
+    i = 0
+    while not writes and time.monotonic() - started < 2.0:
+        store.add('authors', f"Author {i}")
+        i += 1
+        time.sleep(0.05)
+
+    assert writes
+    assert time.monotonic() - started < 1.0
+    store.flush()
+
+
+def test_flush_writes_at_once_and_cancels_the_timer(tmp_path, monkeypatch):
+    store = DataStore(str(tmp_path / "data.json"), flush_delay=0.2)
+    writes = counting_writes(monkeypatch)
+
+    store.add('character_names', "Tifa")
+    store.flush()
+    time.sleep(0.3)
+
+    assert [data['character_names'] for data in writes] == [["Tifa"]]
@@ -0,0 +1,55 @@
+# test_fuzzy_index.py
+"""
+The fuzzy index suggests character names for filenames with typos or partial names,
+and leaves names too short to compare approximately alone.
+"""
+
+import os
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+sys.path.insert(0, SRC_DIR)
+
+import fuzzy_index  # noqa: E402
+from fuzzy_index import FuzzyIndex, get_fuzzy_index  # noqa: E402
+
+NAMES = ["Tifa Lockhart", "Aerith Gainsborough", "Cloud Strife", "2B", "Tifa"]
+
+
+def test_typos_and_partial_names_are_suggested():
+    index = FuzzyIndex(NAMES)
+
+    assert index.suggest("tifaa_fanart") == ["Tifa"]
+    assert index.suggest("aerith_gains") == ["Aerith Gainsborough"]
+    assert index.suggest("cloud strif 01") == ["Cloud Strife"]
+
+
+def test_suggestions_are_best_first_and_limited():
+    index = FuzzyIndex(NAMES)
+
+    assert index.suggest("Tifa Lokhart") == ["Tifa", "Tifa Lockhart"]
+    assert index.suggest("Tifa Lokhart", limit=1) == ["Tifa"]
+
+
+def test_alias_suggests_its_character():
+    index = FuzzyIndex(NAMES, {"Tiffy": "Tifa"})
+
+    assert index.suggest("tiffy_beach") == ["Tifa"]
+
+
+def test_short_names_and_unrelated_files_get_no_suggestions():
+    index = FuzzyIndex(NAMES)
+
+    assert len(index) == 4
+    assert index.suggest("2b_nier") == []
+    assert index.suggest("zzzz qqqq") == []
+    assert index.suggest("") == []
+
+
+def test_index_is_rebuilt_only_when_the_names_change():
+    fuzzy_index._cached_index = None
+    index = get_fuzzy_index(NAMES, {"Tiffy": "Tifa"})
+
+    assert get_fuzzy_index(list(NAMES), {"Tiffy": "Tifa"}) is index
+    assert get_fuzzy_index(NAMES) is not index
+    assert get_fuzzy_index(NAMES + ["Barret Wallace"]).suggest("barret") == ["Barret Wallace"]
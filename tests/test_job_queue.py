@@ -0,0 +1,91 @@
+# test_job_queue.py
+"""
+The job queue must not hold its lock while it logs or reports progress: the GUI's
+handlers may wait for the main thread, which may be waiting for the lock to list jobs.
+"""
+
+import os
+import sys
+import logging
+import threading
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+sys.path.insert(0, SRC_DIR)
+
+from job_queue import JobQueue, DONE, CANCELLED  # noqa: E402
+
+
+def lists_jobs_from_another_thread(job_queue):
+    """Stand in for the main thread refreshing the job list; True if it got the lock."""
+    reader = threading.Thread(target=job_queue.jobs)
+    reader.start()
+    reader.join(2)
+    return not reader.is_alive()
+
+
+def recording_queue(reported, idle, **kwargs):
+    """A queue whose callback checks the lock is free and sets `idle` on "done"."""
+    def progress(status, data=None):
+        reported.append((status, lists_jobs_from_another_thread(job_queue)))
+        if status == "done":
+            idle.set()
+
+    job_queue = JobQueue(progress, **kwargs)
+    return job_queue
+
+
+def test_done_is_reported_without_the_lock():
+    reported, idle = [], threading.Event()
+    job_queue = recording_queue(reported, idle)
+
+    job = job_queue.submit("job", None, lambda control, progress: progress("start", 1), devices=set())
+    assert idle.wait(5)
+    job_queue.shutdown()
+
+    assert job.state == DONE
+    assert reported == [("start", True), ("done", True)]
+
+
+def test_cancelled_queue_reports_done_without_the_lock():
+    reported, idle = [], threading.Event()
+    job_queue = recording_queue(reported, idle, max_running=1)
+    started, release = threading.Event(), threading.Event()
+
+    def blocking(control, progress):
+        progress("start", 1)
+        started.set()
+        release.wait(2)
+
+    first = job_queue.submit("first", None, blocking, devices=set())
+    started.wait(2)
+    second = job_queue.submit("second", None, lambda control, progress: None, devices=set())
+    job_queue.cancel(second.job_id)
+    release.set()
+    assert idle.wait(5)
+    job_queue.shutdown()
+
+    assert (first.state, second.state) == (DONE, CANCELLED)
+    assert reported == [("start", True), ("done", True)]
+
+
+def test_job_state_is_logged_without_the_lock():
+    job_queue = JobQueue()
+    results = []
+
+    class ListingHandler(logging.Handler):
+        def emit(self, record):
+            results.append(lists_jobs_from_another_thread(job_queue))
+
+    handler = ListingHandler()
+    root_logger = logging.getLogger()
+    root_logger.addHandler(handler)
+    level = root_logger.level
+    root_logger.setLevel(logging.INFO)
+    try:
+        job_queue.submit("job", None, lambda control, progress: None, devices=set())
+        job_queue.shutdown()
+    finally:
+        root_logger.removeHandler(handler)
+        root_logger.setLevel(level)
+
+    assert results and all(results)
@@ -0,0 +1,207 @@
+# test_journal_recovery.py
+"""
+Kill a job mid-run and check that resuming or rolling it back loses no file.
+
+The plans reuse names freed by earlier entries, as the name index does: "Tifa 2.png"
+makes room for "Tifa 1.png", which makes room for "tifa_a.png". The job runs in a
+child process that is killed with SIGKILL after a given number of file operations,
+before their completion is journaled.
+"""
+
+import os
+import sys
+import json
+import signal
+import subprocess
+
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+sys.path.insert(0, SRC_DIR)
+
+from undo_journal import JobJournal, find_journals, replay_interrupted_job, roll_back_interrupted_job  # noqa: E402
+
+pytestmark = pytest.mark.skipif(not hasattr(signal, "SIGKILL"), reason="needs SIGKILL")
+
+ORIGINAL = {"Tifa 1.png": b"first", "Tifa 2.png": b"second", "tifa_a.png": b"third"}
+PLAN = [("Tifa 2.png", "Tifa 3.png"), ("Tifa 1.png", "Tifa 2.png"), ("tifa_a.png", "Tifa 1.png")]
+RENAMED = {"Tifa 3.png": b"second", "Tifa 2.png": b"first", "Tifa 1.png": b"third"}
+
+# Runs the plan and kills itself once `limit` operations have run. A "fixed" job runs
+# the recorded plan in chunks, like a destination-mode job or an applied plan; a
+# "streaming" job runs each chunk as it is planned.
+CHILD = """
+import os, sys, json, signal
+sys.path.insert(0, {src!r})
+import executor
+from undo_journal import JobJournal, run_journaled_plan
+from file_operations import run_folder_jobs
+
+mode, folder, journal_dir, limit, runner = sys.argv[1], sys.argv[2], sys.argv[3], int(sys.argv[4]), sys.argv[6]
+plan = [tuple(entry) for entry in json.loads(sys.argv[5])]
+count = 0
+perform_operation = executor.perform_operation
+record_done = JobJournal.record_done
+
+def killing_perform_operation(*args):
+    global count
+    if count == limit:
+        os.kill(os.getpid(), signal.SIGKILL)
+    count += 1
+    return perform_operation(*args)
+
+def killing_record_done(self, *args):
+    if count == limit:
+        os.kill(os.getpid(), signal.SIGKILL)
+    return record_done(self, *args)
+
+executor.perform_operation = killing_perform_operation
+JobJournal.record_done = killing_record_done
+destination = folder if mode == "Move" else None
+if runner == "fixed":
+    journal = JobJournal.create(mode, folder, destination, fixed_plan=True, journal_dir=journal_dir)
+    journal.record_planned(plan)
+    journal.record_plan_complete()
+    run_journaled_plan(journal)
+else:
+    journal = JobJournal.create(mode, folder, destination, journal_dir=journal_dir)
+    run_folder_jobs(folder, lambda folder, files, name_index: plan, mode, destination, streaming=True, journal=journal)
+"""
+
+
+def folder_contents(folder):
+    contents = {}
+    for name in os.listdir(folder):
+        with open(os.path.join(folder, name), 'rb') as f:
+            contents[name] = f.read()
+    return contents
+
+
+def kill_job(tmp_path, mode, limit, runner="fixed"):
+    """Run PLAN in a child process killed after `limit` operations; return the folder and journal."""
+    folder = tmp_path / "folder"
+    folder.mkdir()
+    for name, data in ORIGINAL.items():
+        (folder / name).write_bytes(data)
+    journal_dir = tmp_path / "journals"
+    plan = [(str(folder / old), str(folder / new)) for old, new in PLAN]
+    child = subprocess.run(
+        [sys.executable, "-c", CHILD.format(src=SRC_DIR), mode, str(folder), str(journal_dir), str(limit), json.dumps(plan), runner],
+        capture_output=True
+    )
+    assert child.returncode == -signal.SIGKILL, child.stderr.decode()
+    journals = find_journals(str(journal_dir))
+    assert len(journals) == 1
+    return str(folder), JobJournal.load(journals[0])
+
+
+@pytest.mark.parametrize("mode", ["Rename", "Move"])
+@pytest.mark.parametrize("limit", range(len(PLAN) + 1))
+def test_resume_after_kill(tmp_path, mode, limit):
+    folder, journal = kill_job(tmp_path, mode, limit)
+    assert not journal.finished
+
+    errors = replay_interrupted_job(journal)
+
+    assert errors == []
+    assert folder_contents(folder) == RENAMED
+
+
+@pytest.mark.parametrize("mode", ["Rename", "Move"])
+@pytest.mark.parametrize("limit", range(len(PLAN) + 1))
+def test_roll_back_after_kill(tmp_path, mode, limit):
+    folder, journal = kill_job(tmp_path, mode, limit)
+
+    errors = roll_back_interrupted_job(journal)
+
+    assert errors == []
+    assert folder_contents(folder) == ORIGINAL
+
+
+@pytest.mark.parametrize("mode", ["Rename", "Move"])
+@pytest.mark.parametrize("limit", range(len(PLAN) + 1))
+def test_undo_after_resume(tmp_path, mode, limit):
+    from undo_journal import undo_operations
+
+    folder, journal = kill_job(tmp_path, mode, limit)
+    replay_interrupted_job(journal)
+
+    errors = undo_operations(mode, JobJournal.load(journal.path))
+
+    assert errors == []
+    assert folder_contents(folder) == ORIGINAL
+
+
+@pytest.mark.parametrize("limit", range(len(PLAN) + 1))
+def test_resume_streaming_job_after_kill(tmp_path, limit):
+    folder, journal = kill_job(tmp_path, "Rename", limit, runner="streaming")
+    checkpoints = [record for record in journal.records() if record["type"] == "checkpoint"]
+    assert checkpoints == [{"type": "checkpoint", "position": 0, "next": len(PLAN)}]
+
+    errors = replay_interrupted_job(journal)
+
+    assert errors == []
+    assert folder_contents(folder) == RENAMED
+
+
+@pytest.mark.parametrize("limit", range(len(PLAN) + 1))
+def test_roll_back_streaming_job_after_kill(tmp_path, limit):
+    folder, journal = kill_job(tmp_path, "Rename", limit, runner="streaming")
+
+    errors = roll_back_interrupted_job(journal)
+
+    assert errors == []
+    assert folder_contents(folder) == ORIGINAL
+
+
+def test_cancelled_job_is_offered_for_resume(tmp_path):
+    from job_queue import JobControl
+    from undo_journal import load_undo_history, run_journaled_plan
+
+    folder = tmp_path / "folder"
+    folder.mkdir()
+    for name, data in ORIGINAL.items():
+        (folder / name).write_bytes(data)
+    journal_dir = tmp_path / "journals"
+    journal = JobJournal.create("Rename", str(folder), fixed_plan=True, journal_dir=str(journal_dir))
+    journal.record_planned([(str(folder / old), str(folder / new)) for old, new in PLAN])
+    journal.record_plan_complete()
+    control = JobControl()
+
+    def cancel_after_first_chunk(status, data=None):
+        if status == "update":
+            control.cancel()
+
+    run_journaled_plan(journal, cancel_after_first_chunk, chunk_size=1, control=control)
+    journal.finish(cancelled=control.cancelled)
+
+    undo_entries, interrupted = load_undo_history(str(journal_dir))
+    assert undo_entries == []
+    assert [(len(job), job.cancelled) for job in interrupted] == [(1, True)]
+    assert replay_interrupted_job(interrupted[0]) == []
+    assert interrupted[0].finished
+    assert folder_contents(str(folder)) == RENAMED
+
+
+def test_running_job_is_not_recovered(tmp_path):
+    from undo_journal import JournalInUseError, load_undo_history
+
+    folder = tmp_path / "folder"
+    folder.mkdir()
+    for name, data in ORIGINAL.items():
+        (folder / name).write_bytes(data)
+    journal_dir = tmp_path / "journals"
+    running = JobJournal.create("Rename", str(folder), fixed_plan=True, journal_dir=str(journal_dir))
+    running.record_planned([(str(folder / old), str(folder / new)) for old, new in PLAN])
+
+    assert load_undo_history(str(journal_dir)) == ([], [])
+    with pytest.raises(JournalInUseError):
+        replay_interrupted_job(JobJournal.load(running.path))
+    with pytest.raises(JournalInUseError):
+        roll_back_interrupted_job(JobJournal.load(running.path))
+    assert os.path.exists(running.path)
+
+    running.release()  # As if the job's process had died
+    undo_entries, interrupted = load_undo_history(str(journal_dir))
+    assert [job.path for job in interrupted] == [running.path]
+    assert folder_contents(str(folder)) == ORIGINAL
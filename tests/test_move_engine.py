@@ -0,0 +1,86 @@
+# test_move_engine.py
+"""
+Cross-device moves keep every file in at least one place, and a source that cannot be
+removed after its copy is undone as a copy, not moved back onto itself.
+"""
+
+import os
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+sys.path.insert(0, SRC_DIR)
+
+import move_engine  # noqa: E402
+from move_engine import execute_cross_device_moves, PART_SUFFIX  # noqa: E402
+from undo_journal import undo_operations  # noqa: E402
+
+
+def make_files(folder, contents):
+    folder.mkdir()
+    for name, data in contents.items():
+        (folder / name).write_bytes(data)
+
+
+def folder_contents(folder):
+    return {path.name: path.read_bytes() for path in folder.iterdir()}
+
+
+def test_moves_and_undoes(tmp_path):
+    source, destination = tmp_path / "source", tmp_path / "destination"
+    make_files(source, {"a.png": b"a", "b.png": b"b"})
+    destination.mkdir()
+    planned = [(str(source / "a.png"), str(destination / "Tifa 1.png")), (str(source / "b.png"), str(destination / "Tifa 2.png"))]
+    progress = []
+
+    operations = execute_cross_device_moves(planned, lambda status, data=None: progress.append(status), batch_size=1)
+
+    assert operations == [(new_file, old_file) for old_file, new_file in planned]
+    assert progress == ["update", "update"]
+    assert folder_contents(source) == {}
+    assert folder_contents(destination) == {"Tifa 1.png": b"a", "Tifa 2.png": b"b"}
+
+    assert undo_operations("Move", operations) == []
+    assert folder_contents(source) == {"a.png": b"a", "b.png": b"b"}
+    assert folder_contents(destination) == {}
+
+
+def test_source_that_cannot_be_removed_is_undone_as_a_copy(tmp_path, monkeypatch):
+    source, destination = tmp_path / "source", tmp_path / "destination"
+    make_files(source, {"a.png": b"a", "b.png": b"b"})
+    destination.mkdir()
+    locked = str(source / "a.png")
+    remove = os.remove
+
+    def failing_remove(path):
+        if path == locked:
+            raise PermissionError(f"'{path}' is locked")
+        remove(path)
+
+    monkeypatch.setattr(move_engine.os, "remove", failing_remove)
+    planned = [(locked, str(destination / "Tifa 1.png")), (str(source / "b.png"), str(destination / "Tifa 2.png"))]
+    progress = []
+
+    operations = execute_cross_device_moves(planned, lambda status, data=None: progress.append(status))
+    monkeypatch.undo()
+
+    assert operations == [(str(destination / "Tifa 1.png"), None), (str(destination / "Tifa 2.png"), str(source / "b.png"))]
+    assert progress == ["error", "update"]
+    assert folder_contents(source) == {"a.png": b"a"}
+
+    assert undo_operations("Move", operations) == []
+    assert folder_contents(source) == {"a.png": b"a", "b.png": b"b"}
+    assert folder_contents(destination) == {}
+
+
+def test_failed_copy_leaves_the_source_and_no_part_file(tmp_path):
+    source, destination = tmp_path / "source", tmp_path / "destination"
+    make_files(source, {"a.png": b"a"})
+    planned = [(str(source / "a.png"), str(destination / "missing" / "Tifa 1.png"))]
+    progress = []
+
+    operations = execute_cross_device_moves(planned, lambda status, data=None: progress.append(status))
+
+    assert operations == []
+    assert progress == ["error"]
+    assert folder_contents(source) == {"a.png": b"a"}
+    assert not os.path.exists(planned[0][1] + PART_SUFFIX)
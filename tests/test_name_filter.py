@@ -0,0 +1,71 @@
+# test_name_filter.py
+"""
+Type-ahead search over names: name starts first, then later words, case- and
+normalization-insensitive, and bounded by `limit` however many names match.
+"""
+
+import os
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+sys.path.insert(0, SRC_DIR)
+
+from name_filter import NameFilter  # noqa: E402
+
+NAMES = ["Tifa Lockhart", "Aerith Gainsborough", "Lockhart Tifa", "Cloud Strife", "Cloud of Darkness", "tifa"]
+
+
+def test_name_starts_come_before_later_words():
+    name_filter = NameFilter(NAMES)
+
+    assert name_filter.search("tifa") == ["tifa", "Tifa Lockhart", "Lockhart Tifa"]
+    assert name_filter.search("LOCK") == ["Lockhart Tifa", "Tifa Lockhart"]
+
+
+def test_matches_word_starts_only():
+    name_filter = NameFilter(NAMES)
+
+    assert name_filter.search("of") == ["Cloud of Darkness"]
+    assert name_filter.search("ife") == []
+    assert name_filter.search("strife") == ["Cloud Strife"]
+
+
+def test_ignores_unicode_normalization():
+    name_filter = NameFilter(["Zoë Nakamura"])
+
+    assert name_filter.search("ZOË") == ["Zoë Nakamura"]
+    assert name_filter.search("ｎａｋａ") == ["Zoë Nakamura"]
+
+
+def test_name_matching_at_start_and_later_word_is_listed_once():
+    name_filter = NameFilter(["Sur Sura", "Anna Sur"])
+
+    assert name_filter.search("sur") == ["Sur Sura", "Anna Sur"]
+
+
+def test_empty_text_lists_every_name_sorted():
+    name_filter = NameFilter(["beta", "Alpha", "gamma"])
+
+    assert name_filter.search("") == ["Alpha", "beta", "gamma"]
+    assert name_filter.search("  ", limit=2) == ["Alpha", "beta"]
+
+
+def test_add_and_remove():
+    name_filter = NameFilter(NAMES)
+
+    assert name_filter.remove("Lockhart Tifa")
+    assert not name_filter.remove("Lockhart Tifa")
+    assert name_filter.add("Tifa's Bar")
+    assert not name_filter.add("Tifa's Bar")
+
+    assert name_filter.search("tifa") == ["tifa", "Tifa Lockhart", "Tifa's Bar"]
+    assert name_filter.search("lock") == ["Tifa Lockhart"]
+    assert "Tifa's Bar" in name_filter and len(name_filter) == len(NAMES)
+
+
+def test_limit_bounds_starts_and_words():
+    names = [f"Name {i:05d} Sur" for i in range(1000)] + [f"Sur {i:05d}" for i in range(10)]
+    name_filter = NameFilter(names)
+
+    assert name_filter.search("sur", limit=5) == [f"Sur {i:05d}" for i in range(5)]
+    assert name_filter.search("sur", limit=12) == [f"Sur {i:05d}" for i in range(10)] + ["Name 00000 Sur", "Name 00001 Sur"]
@@ -0,0 +1,104 @@
+# test_name_index.py
+"""
+The name indexes hand out the first free numbered name without asking the disk for
+every candidate, and give back names freed by files renamed away.
+"""
+
+import os
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+sys.path.insert(0, SRC_DIR)
+
+from name_index import NameIndex, ProbingNameIndex  # noqa: E402
+
+
+def make_folder(tmp_path, names):
+    folder = tmp_path / "folder"
+    folder.mkdir()
+    for name in names:
+        (folder / name).write_bytes(b"")
+    return str(folder)
+
+
+def allocate(index, count, prefix="Tifa ", suffix=".png", **kwargs):
+    return [os.path.basename(index.allocate(prefix, suffix, **kwargs)) for _ in range(count)]
+
+
+def test_skips_names_taken_on_disk(tmp_path):
+    index = NameIndex(make_folder(tmp_path, ["Tifa 1.png", "Tifa 2.png", "Tifa 4.png"]))
+
+    assert allocate(index, 3) == ["Tifa 3.png", "Tifa 5.png", "Tifa 6.png"]
+    assert "Tifa 5.png" in index and "Tifa 7.png" not in index
+
+
+def test_first_name_is_used_while_free(tmp_path):
+    index = NameIndex(make_folder(tmp_path, []))
+
+    assert allocate(index, 3, prefix="Tifa by Jangunn ", first_name="Tifa by Jangunn.png") == [
+        "Tifa by Jangunn.png", "Tifa by Jangunn 1.png", "Tifa by Jangunn 2.png"
+    ]
+
+
+def test_patterns_count_separately(tmp_path):
+    index = NameIndex(make_folder(tmp_path, ["Tifa 1.png"]))
+
+    assert allocate(index, 1) == ["Tifa 2.png"]
+    assert allocate(index, 1, suffix=".jpg") == ["Tifa 1.jpg"]
+    assert allocate(index, 1, prefix="Aerith ") == ["Aerith 1.png"]
+
+
+def test_released_name_rewinds_its_pattern(tmp_path):
+    index = NameIndex(make_folder(tmp_path, ["Tifa 1.png", "Tifa 2.png", "Tifa 3.png"]))
+    assert allocate(index, 1, confirm=False) == ["Tifa 4.png"]
+
+    index.release("Tifa 2.png")  # Its file is planned to be renamed away
+
+    assert "Tifa 2.png" not in index
+    assert allocate(index, 2, confirm=False) == ["Tifa 2.png", "Tifa 5.png"]
+
+
+def test_confirm_checks_the_disk_again(tmp_path):
+    folder = make_folder(tmp_path, [])
+    index = NameIndex(folder)
+    open(os.path.join(folder, "Tifa 1.png"), 'w').close()  # Appeared after the listing
+
+    assert allocate(index, 1, confirm=False) == ["Tifa 1.png"]
+    assert allocate(NameIndex(folder), 1) == ["Tifa 2.png"]
+
+
+def test_missing_folder_is_empty(tmp_path):
+    index = NameIndex(str(tmp_path / "not yet created"))
+
+    assert allocate(index, 2, confirm=False) == ["Tifa 1.png", "Tifa 2.png"]
+
+
+def test_probing_index_checks_disk_and_pending_claims(tmp_path):
+    index = ProbingNameIndex(make_folder(tmp_path, ["Tifa 1.png", "Tifa 3.png"]))
+
+    assert allocate(index, 3) == ["Tifa 2.png", "Tifa 4.png", "Tifa 5.png"]
+    assert "Tifa 4.png" in index
+
+
+def test_probing_index_release_and_flush(tmp_path):
+    folder = make_folder(tmp_path, [])
+    index = ProbingNameIndex(folder)
+    assert allocate(index, 2) == ["Tifa 1.png", "Tifa 2.png"]
+
+    index.release("Tifa 1.png")
+    assert "Tifa 1.png" not in index
+    open(os.path.join(folder, "Tifa 2.png"), 'w').close()  # The chunk ran
+    index.flush()
+
+    assert "Tifa 2.png" in index  # Still taken on disk
+    assert allocate(ProbingNameIndex(folder), 2) == ["Tifa 1.png", "Tifa 3.png"]
+
+
+def test_probing_index_bounds_its_counter_cache(tmp_path):
+    index = ProbingNameIndex(make_folder(tmp_path, []), max_patterns=2)
+
+    for prefix in ["A ", "B ", "C "]:
+        allocate(index, 1, prefix=prefix)
+
+    assert len(index._counters) == 2
+    assert allocate(index, 1, prefix="A ") == ["A 2.png"]  # Still found by probing
@@ -0,0 +1,78 @@
+# test_rename_mask.py
+"""
+Rename masks compile once into a render function, and malformed masks are refused
+with a MaskError naming the problem.
+"""
+
+import os
+import sys
+import datetime
+
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+sys.path.insert(0, SRC_DIR)
+
+from rename_mask import compile_mask, MaskError, DEFAULT_RENAME_MASK  # noqa: E402
+
+
+def test_default_mask_renders_around_the_counter():
+    mask = compile_mask(DEFAULT_RENAME_MASK)
+
+    assert mask.has_counter
+    assert mask.fields == {"char", "author", "num"}
+    assert mask.render({"char": "Tifa", "author": "Jangunn"}) == ("Tifa by Jangunn ", "")
+
+
+def test_optional_section_is_left_out_when_a_field_is_empty():
+    mask = compile_mask("[char]{ by [author]} [num]")
+
+    assert mask.render({"char": "Tifa", "author": ""}) == ("Tifa ", "")
+    assert mask.render({"char": "Tifa"}) == ("Tifa ", "")
+
+
+def test_required_field_missing_renders_nothing():
+    assert compile_mask("[char] [num]").render({"author": "Jangunn"}) is None
+
+
+def test_text_after_the_counter_is_the_suffix():
+    mask = compile_mask("[character] ([num]) [folder]")
+
+    assert mask.render({"char": "Tifa", "folder": "Fanart"}) == ("Tifa (", ") Fanart")
+
+
+def test_date_format_literal_brackets_and_invalid_characters():
+    mask = compile_mask("[[x]] {{[date:%Y]}} [name]")
+
+    assert not mask.has_counter
+    assert mask.render({"date": datetime.date(2020, 1, 2), "name": 'a/b?c:"d"'}) == ("[x] {2020} abcd", "")
+    assert compile_mask("[date]").render({"date": datetime.date(2020, 1, 2)}) == ("2020-01-02", "")
+
+
+def test_render_all_renders_each_row():
+    mask = compile_mask("[width]x[height]")
+
+    assert mask.render_all([{"width": 640, "height": 480}, {"width": 0, "height": 1}]) == [("640x480", ""), None]
+
+
+def test_masks_are_compiled_once():
+    assert compile_mask("[char] [num]") is compile_mask("[char] [num]")
+
+
+@pytest.mark.parametrize("mask, message", [
+    ("[foo]", "Unknown field '[foo]' at position 0"),
+    ("[char:%Y]", "Field 'char' does not take a format"),
+    ("{[num]}", "The counter cannot be inside an optional section"),
+    ("[num] [counter]", "A mask can only have one counter"),
+    ("{a{b}}", "Nested optional section at position 2"),
+    ("a}", "Unmatched '}' at position 1"),
+    ("[char", "Unmatched '[' at position 0"),
+    ("[char]]", "Unmatched ']' at position 6"),
+    ("{[char]", "Optional section is not closed"),
+])
+def test_malformed_masks_are_refused(mask, message):
+    with pytest.raises(MaskError) as error:
+        compile_mask(mask)
+
+    assert str(error.value) == message
+    assert isinstance(error.value, ValueError)
@@ -0,0 +1,132 @@
+# test_rename_plan.py
+"""
+Exported plans round-trip through their JSON Lines file, can be pointed at another copy
+of the tree, and refuse to apply once a planned source folder has changed.
+"""
+
+import os
+import sys
+import json
+
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+sys.path.insert(0, SRC_DIR)
+
+from rename_plan import RenamePlan, StalePlanError, save_plan, load_plan, PLAN_FILE_VERSION  # noqa: E402
+
+
+def make_plan(folder, destination=None):
+    sub = os.path.join(folder, "sub")
+    os.makedirs(sub, exist_ok=True)
+    target = destination or folder
+    plan = RenamePlan("Copy" if destination else "Rename", folder, destination, [
+        (os.path.join(folder, "a.png"), os.path.join(target, "Tifa 1.png")),
+        (os.path.join(sub, "b.png"), os.path.join(target, "sub", "Tifa 2.png")),
+    ])
+    plan.record_folder(folder)
+    plan.record_folder(sub)
+    return plan
+
+
+def touch_folder(folder):
+    stat = os.stat(folder)
+    with open(os.path.join(folder, "new.png"), 'w') as f:
+        f.write("new")
+    # Coarse filesystem timestamps may not move on within the test
+    os.utime(folder, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_plan_round_trips(tmp_path):
+    folder = str(tmp_path / "images")
+    plan = make_plan(folder)
+    path = str(tmp_path / "job.plan")
+
+    save_plan(plan, path)
+    loaded = load_plan(path)
+
+    assert loaded.operation_mode == "Rename"
+    assert loaded.folder_path == folder
+    assert loaded.destination_folder is None
+    assert loaded.entries == plan.entries
+    assert loaded.folder_stats == plan.folder_stats
+    assert loaded.same_host
+    assert not os.path.exists(path + ".tmp")
+
+
+def test_plan_file_stores_relative_paths(tmp_path):
+    folder = str(tmp_path / "images")
+    destination = str(tmp_path / "out")
+    path = str(tmp_path / "job.plan")
+    save_plan(make_plan(folder, destination), path)
+
+    with open(path, encoding='utf-8') as f:
+        header = json.loads(f.readline())
+        entries = [json.loads(line) for line in f]
+
+    assert header["type"] == "autoname-plan"
+    assert header["version"] == PLAN_FILE_VERSION
+    assert header["count"] == 2
+    assert sorted(header["folders"]) == [".", "sub"]
+    assert entries == [["a.png", "Tifa 1.png"], [os.path.join("sub", "b.png"), os.path.join("sub", "Tifa 2.png")]]
+
+
+def test_plan_can_be_applied_to_another_copy_of_the_tree(tmp_path):
+    path = str(tmp_path / "job.plan")
+    save_plan(make_plan(str(tmp_path / "images"), str(tmp_path / "out")), path)
+    other = str(tmp_path / "copy")
+    other_out = str(tmp_path / "copy_out")
+
+    loaded = load_plan(path, folder_path=other, destination_folder=other_out)
+
+    assert loaded.folder_path == other
+    assert loaded.destination_folder == other_out
+    assert loaded.entries[1] == (os.path.join(other, "sub", "b.png"), os.path.join(other_out, "sub", "Tifa 2.png"))
+    assert set(loaded.folder_stats) == {other, os.path.join(other, "sub")}
+    assert not loaded.same_host
+
+
+def test_unchanged_plan_passes_the_check(tmp_path):
+    plan = make_plan(str(tmp_path / "images"))
+
+    plan.check_sources()
+
+
+def test_changed_folder_makes_the_plan_stale(tmp_path):
+    folder = str(tmp_path / "images")
+    plan = make_plan(folder)
+    touch_folder(os.path.join(folder, "sub"))
+
+    with pytest.raises(StalePlanError) as error:
+        plan.check_sources()
+
+    assert os.path.join(folder, "sub") in str(error.value)
+    assert str(error.value).count("\n") == 1
+
+
+def test_removed_folder_makes_a_loaded_plan_stale(tmp_path):
+    folder = str(tmp_path / "images")
+    path = str(tmp_path / "job.plan")
+    save_plan(make_plan(folder), path)
+    os.rmdir(os.path.join(folder, "sub"))
+
+    with pytest.raises(StalePlanError):
+        load_plan(path).check_sources()
+
+
+def test_other_files_are_not_plans(tmp_path):
+    path = str(tmp_path / "notes.txt")
+    with open(path, 'w') as f:
+        f.write("not a plan\n")
+
+    with pytest.raises(ValueError, match="not an AutoName plan file"):
+        load_plan(path)
+
+
+def test_plans_from_newer_versions_are_refused(tmp_path):
+    path = str(tmp_path / "job.plan")
+    with open(path, 'w') as f:
+        f.write(json.dumps({"type": "autoname-plan", "version": PLAN_FILE_VERSION + 1}) + "\n")
+
+    with pytest.raises(ValueError, match="newer version"):
+        load_plan(path)